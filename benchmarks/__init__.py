@@ -0,0 +1,25 @@
+"""Micro-benchmarks, run them from the repository root, e.g.: python -m benchmarks.xml_iter_parse
+The whole benchmark suite, over all test corpora, is run with: python -m benchmarks
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+DATA = Path(__file__).parent.parent / "tests" / "data"
+
+
+def timeit(func: Callable[[], object], *, rounds: int = int(os.getenv("ROUNDS", "5"))) -> float:
+    """Return the best duration, in seconds, of *rounds* calls to *func*."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = perf_counter()
+        func()
+        best = min(best, perf_counter() - start)
+    return best
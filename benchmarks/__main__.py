@@ -0,0 +1,176 @@
+"""
+Benchmark suite: render, and convert, pages of the test corpora (tests/data/LOCALE/*.wiki).
+Run it from the repository root: python -m benchmarks [OPTIONS] [LOCALE...]
+
+Usage:
+    benchmarks [--rounds=N] [--output=FILE] [--baseline=FILE] [--tolerance=PERCENT] [LOCALE...]
+
+Options:
+  --rounds=N            Number of repetitions of each benchmark, the best one is kept [default: 5].
+  --output=FILE         Save results into FILE (JSON), it can be used later as a baseline.
+  --baseline=FILE       Compare results against FILE, and exit with an error when there are regressions.
+  --tolerance=PERCENT   Slowdown allowed before a result is flagged as a regression [default: 10].
+
+All locales of the test corpora are benchmarked when none is given.
+The Mobi formatter is not benchmarked as it depends on kindlegen, its DictFile is the same as the DictFile formatter one.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import platform
+import sys
+import tracemalloc
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import TYPE_CHECKING
+
+from docopt import docopt
+
+from wikidict import convert, render, utils
+
+from . import DATA, timeit
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from wikidict.stubs import Words
+
+    # Benchmark name -> locale -> measure -> value
+    Results = dict[str, dict[str, dict[str, float]]]
+
+SNAPSHOT = "20201217"
+
+
+def get_pages(locale: str) -> list[tuple[str, str]]:
+    return [(file.stem, file.read_text(encoding="utf-8")) for file in sorted((DATA / locale).glob("*.wiki"))]
+
+
+def get_definitions(pages: list[tuple[str, str]]) -> list[tuple[str, str]]:
+    """All definition lines (and sub-definitions, examples, ...) of *pages*."""
+    return [
+        (word, line.lstrip("#*:"))
+        for word, code in pages
+        for line in code.splitlines()
+        if line.startswith(("#", "*", ":"))
+    ]
+
+
+def get_words(pages: list[tuple[str, str]], locale: str) -> Words:
+    words: Words = {}
+    for page in pages:
+        render.render_word(page, words, locale)
+    return words
+
+
+def get_benchmarks(locale: str, output_dir: Path) -> dict[str, tuple[int, Callable[[], object]]]:
+    """Return benchmarks as name -> (operations count, function doing all operations at once)."""
+    pages = get_pages(locale)
+    definitions = get_definitions(pages)
+    words = get_words(pages, locale)
+    variants = convert.make_variants(words)
+    fragments = {word: convert.render_fragments(details) for word, details in words.items() if details.definitions}
+
+    def parse_word() -> object:
+        # Pure templates rendered by a previous round would make the next ones faster
+        utils.TEMPLATES_CACHE.data.clear()
+        return [render.parse_word(word, code, locale) for word, code in pages]
+
+    def process_templates() -> object:
+        utils.TEMPLATES_CACHE.data.clear()
+        return [utils.process_templates(word, text, locale) for word, text in definitions]
+
+    def clean() -> object:
+        return [utils.clean(text) for _, text in definitions]
+
+    def render_fragments() -> object:
+        return [convert.render_fragments(details) for details in words.values() if details.definitions]
+
+    def formatter(cls: type[convert.BaseFormat]) -> Callable[[], object]:
+        return lambda: convert.run_formatter(cls, locale, output_dir, words, variants, SNAPSHOT, fragments=fragments)
+
+    benchmarks = {
+        "render.parse_word": (len(pages), parse_word),
+        "utils.process_templates": (len(definitions), process_templates),
+        "utils.clean": (len(definitions), clean),
+        "convert.render_fragments": (len(fragments), render_fragments),
+    }
+    # Secondary formatters use files of primary ones
+    for cls in [*convert.get_primary_formatters(), *convert.get_secondary_formatters()]:
+        benchmarks[f"convert.{cls.__name__}"] = (len(words), formatter(cls))
+    return benchmarks
+
+
+def measure(count: int, func: Callable[[], object], rounds: int) -> dict[str, float]:
+    duration = timeit(func, rounds=rounds)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"ops": count, "seconds": duration, "ops_per_second": count / duration, "peak_memory": peak}
+
+
+def run(locales: list[str], rounds: int) -> Results:
+    results: Results = {}
+    for locale in locales:
+        with TemporaryDirectory() as tmp:
+            for name, (count, func) in get_benchmarks(locale, Path(tmp)).items():
+                result = results.setdefault(name, {})[locale] = measure(count, func, rounds)
+                print(
+                    f"{name:<32} {locale:<3}"
+                    f" {result['ops_per_second']:>12,.1f} ops/s"
+                    f" {result['peak_memory'] / 1024:>10,.0f} KiB peak",
+                    flush=True,
+                )
+    return results
+
+
+def compare(results: Results, baseline: Results, tolerance: float) -> list[str]:
+    """Return regressions of *results* against *baseline*, for benchmarks and locales found in both."""
+    regressions = []
+    for name, locales in results.items():
+        for locale, result in locales.items():
+            if not (reference := baseline.get(name, {}).get(locale)):
+                continue
+            ratio = result["ops_per_second"] / reference["ops_per_second"]
+            if ratio < 1 - tolerance / 100:
+                regressions.append(
+                    f"{name} [{locale}]: {result['ops_per_second']:,.1f} ops/s"
+                    f" instead of {reference['ops_per_second']:,.1f} ops/s ({(ratio - 1) * 100:+.1f}%)"
+                )
+    return regressions
+
+
+def main() -> int:
+    """Main entry point."""
+    # Formatters, and PyGlossary, are quite verbose
+    logging.basicConfig(level=logging.ERROR)
+
+    args = docopt(__doc__)
+    locales = args["LOCALE"] or sorted(folder.name for folder in DATA.iterdir() if folder.is_dir())
+    rounds = int(args["--rounds"])
+
+    results = run(locales, rounds)
+
+    if output := args["--output"]:
+        data = {"python": platform.python_version(), "rounds": rounds, "results": results}
+        Path(output).write_text(json.dumps(data, indent=2), encoding="utf-8")
+        print(f"Results saved into {output}")
+
+    if baseline := args["--baseline"]:
+        reference = json.loads(Path(baseline).read_text(encoding="utf-8"))["results"]
+        if regressions := compare(results, reference, float(args["--tolerance"])):
+            print(f"Regressions against {baseline}:", *regressions, sep="\n  ")
+            return 1
+        print(f"No regressions against {baseline}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""Benchmark `utils.clean()` against the former implementation, applying all substitutions unconditionally."""
+
+from __future__ import annotations
+
+import re
+import sys
+
+import regex
+
+from wikidict import utils
+
+from . import DATA, timeit
+
+
+def legacy_clean(text: str) -> str:
+    """The implementation, as it was before guarded and precompiled substitutions."""
+    # Speed-up lookup
+    sub = re.sub
+    sub2 = regex.sub
+
+    # <math style="bla" foo=bar>formula</math> → <math>formula</math>
+    text = re.sub(r"<math\s+[^>]+>(.+?)</math>", r"<math>\1</math>", text)
+
+    # Save <math> formulas to prevent altering them
+    if formulas := re.findall(r"(<math>.+?</math>)", text):
+        for idx, formula in enumerate(formulas):
+            text = text.replace(formula, f"##math{idx}##")
+
+    # Remove line breaks
+    text = text.replace("\n", "")
+
+    # HTML
+    # Source: https://github.com/5j9/wikitextparser/blob/b24033b/wikitextparser/_wikitext.py#L83
+    text = sub2(r"'''(\0*+[^'\n]++.*?)(?:''')", "<b>\\1</b>", text)
+    # ''foo'' → <i>foo></i>
+    text = sub2(r"''(\0*+[^'\n]++.*?)(?:'')", "<i>\\1</i>", text)
+    # (outside of {{code|...}}) <br> / <br /> → ''
+    text = sub(r"(?<!code\|html\|)<br[^>]*/?>", "", text)
+
+    # <nowiki/> → ''
+    text = text.replace("<nowiki/>", "")
+    # <nowiki>»</nowiki> → '»'
+    text = sub("<nowiki>([^<]+)</nowiki>", r"\1", text)
+
+    # <gallery>
+    text = sub(r"<gallery>[\s\S]*?</gallery>", "", text)
+
+    # Local links
+    text = sub(r"\[\[([^||:\]]+)\]\]", "\\1", text)  # [[a]] → a
+
+    # Links
+    # Internal: [[{{a|b}}]] → {{a|b}}
+    text = sub(r"\[\[({{[^}]+}})\]\]", "\\1", text)
+    # Internal: [[a|b]] → b
+    text = sub(r"\[\[[^|]+\|(.+?(?=\]\]))\]\]", "\\1", text)
+    # External: [[http://example.com Some text]] → ''
+    text = sub(r"\[\[https?://[^\s]+\s[^\]]+\]\]", "", text)
+    # External: [http://example.com] → ''
+    text = sub(r"\[https?://[^\s\]]+\]", "", text)
+    # External: [http://example.com Some text] → 'Some text'
+    text = sub(r"\[https?://[^\s]+\s([^\]]+)\]", r"\1", text)
+    # External: [//example.com Some text] → 'Some text'
+    text = sub(r"\[//[^\s]+\s([^\]]+)\]", r"\1", text)
+    text = text.replace("[[", "").replace("]]", "")
+
+    # Tables
+    # {|foo..|}
+    text = sub(r"{\|[^}]+\|}", "", text)
+
+    # Headings
+    # == a == → a
+    text = sub(r"^=+\s?([^=]+)\s?=+", lambda matches: matches.group(1).strip(), text)
+
+    # Lists
+    text = sub(r"^\*+\s?", "", text)
+
+    # Magic words
+    text = sub(r"__[A-Z]+__", "", text)  # __TOC__
+
+    # Remove extra quotes left
+    text = text.replace("''", "")
+
+    # Remove extra brackets left
+    text = text.replace(" []", "")
+    text = text.replace(" ]", "")
+
+    # Remove empty HTML tags
+    # <sup></sup> → ''
+    text = sub(r"<([^>]+)></\1>", "", text)
+
+    # Remove extra spaces
+    text = sub(r"\s{2,}", " ", text)
+    text = sub(r"\s{1,}\.", ".", text)
+
+    # <<bar>> → foo
+    text = sub(r"<<([^/>]+)>>", "\\1", text)
+    # <<foo/bar>> → bar
+    # text = sub(r"<<(?:[^/>]+)/([^>]+)>>", "\\1", text)
+
+    # Convert single "< ", and " >" to HTML quotes
+    text = text.replace("< ", "&lt; ").replace(" >", " &gt;")
+
+    # Restore math formulas
+    for idx, formula in enumerate(formulas):
+        text = text.replace(f"##math{idx}##", formula)
+
+    return text.strip()
+
+
+def main(argv: list[str]) -> int:
+    """Usage: python -m benchmarks.clean"""
+    # All definition lines (and sub-definitions, examples, ...) from the test data
+    lines = [
+        line
+        for file in sorted(DATA.glob("*/*.wiki"))
+        for line in file.read_text(encoding="utf-8").splitlines()
+        if line.startswith(("#", "*", ":"))
+    ]
+    size = sum(len(line) for line in lines)
+
+    assert [utils.clean(line) for line in lines] == [legacy_clean(line) for line in lines], "Outputs differ!"
+
+    print(f"{len(lines):,} lines ({size / 1024:,.1f} KiB)")
+    for name, func in [("legacy", legacy_clean), ("current", utils.clean)]:
+        duration = timeit(lambda: [func(line) for line in lines])  # noqa: B023
+        print(f"{name:>8}: {duration:.3f} s ({duration / len(lines) * 1_000_000:.1f} µs/line)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,44 @@
+"""Benchmark formatters rendering words with list joins against the Jinja templates formerly used."""
+
+from __future__ import annotations
+
+import logging
+import sys
+from pathlib import Path
+
+from tests.formatters import JINJA_TPL_DICTFILE, JINJA_TPL_KOBO, jinja_formatter
+from wikidict import convert
+
+from . import timeit
+from .__main__ import get_pages, get_words
+
+
+def main(argv: list[str]) -> int:
+    """Usage: python -m benchmarks.emitter [LOCALE...]"""
+    logging.disable(logging.INFO)
+
+    for locale in argv or ["fr", "en"]:
+        words = get_words(get_pages(locale), locale)
+        variants = convert.make_variants(words)
+
+        for cls, template in [(convert.KoboFormat, JINJA_TPL_KOBO), (convert.DictFileFormat, JINJA_TPL_DICTFILE)]:
+            args = (locale, Path(), words, variants, "20201217")
+            current = cls(*args)
+            legacy = jinja_formatter(cls, template)(*args)
+
+            def run(formatter: convert.BaseFormat) -> list[str]:
+                return [html for word in words for html in formatter.handle_word(word, words)]  # noqa: B023
+
+            assert run(current) == run(legacy), "Outputs differ!"
+            durations = [("jinja", timeit(lambda: run(legacy))), ("emitter", timeit(lambda: run(current)))]  # noqa: B023
+
+            print(f"[{locale}] {cls.__name__}: {len(words)} words")
+            for name, duration in durations:
+                print(f"{name:>8}: {duration:.3f} s ({duration / len(words) * 1_000_000:.1f} µs/word)")
+            print(f"   saved: {(durations[0][1] - durations[1][1]) / len(words) * 1_000_000:.1f} µs/word")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,48 @@
+"""Benchmark the templates expansion of `utils.process_templates()` against the former iterative implementation."""
+
+from __future__ import annotations
+
+import sys
+from unittest.mock import patch
+
+from wikidict import utils
+
+from . import DATA, timeit
+
+
+def main(argv: list[str]) -> int:
+    """Usage: python -m benchmarks.process_templates [COUNT]"""
+    locale = "fr"
+    count = int(argv[0]) if argv else 2_000
+
+    texts = {
+        # All definitions of the test corpus
+        "definitions": [
+            line[1:]
+            for file in sorted((DATA / locale).glob("*.wiki"))
+            for line in file.read_text(encoding="utf-8").splitlines()
+            if line.startswith("#")
+        ],
+        # A single text holding a lot of (nested) templates
+        "many templates": [" ".join(f"{{{{lien|{{{{e|{idx}}}}}|fr}}}} {{{{term|{idx}}}}}" for idx in range(count))],
+    }
+
+    for name, values in texts.items():
+        timings = []
+        outputs = []
+        # Templates are expanded only using the former implementation, and then depending on their count
+        for min_count in (sys.maxsize, utils.TEMPLATES_TREE_MIN_COUNT):
+            with patch.object(utils, "TEMPLATES_TREE_MIN_COUNT", min_count):
+                outputs.append([utils.process_templates("word", text, locale) for text in values])
+                timings.append(timeit(lambda: [utils.process_templates("word", text, locale) for text in values]))  # noqa: B023
+        assert outputs[0] == outputs[1], "Outputs differ!"
+
+        print(f"[{locale}] {name} ({sum(len(text) for text in values):,} chars)")
+        for label, duration in zip(("legacy", "current"), timings, strict=True):
+            print(f"{label:>8}: {duration:.3f} s")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,40 @@
+"""Benchmark `render.parse_word()` with the per-process render context against a per-word computed one."""
+
+from __future__ import annotations
+
+import sys
+from unittest.mock import patch
+
+from wikidict import render, utils
+
+from . import DATA, timeit
+
+
+def main(argv: list[str]) -> int:
+    """Usage: python -m benchmarks.render_context [LOCALE...]"""
+    for locale in argv or ["fr", "en"]:
+        lang_src, lang_dst = utils.guess_locales(locale, use_log=False)
+        words = [(file.stem, file.read_text(encoding="utf-8")) for file in sorted((DATA / lang_dst).glob("*.wiki"))]
+
+        def run() -> list[render.Word]:
+            # Pure templates rendered by a previous round would make the next ones faster
+            utils.TEMPLATES_CACHE.data.clear()
+            return [render.parse_word(word, code, locale) for word, code in words]  # noqa: B023
+
+        # The legacy code recomputed everything for each word, and even for each section
+        with patch.object(render, "get_render_context", render.get_render_context.__wrapped__):
+            legacy = timeit(run)
+            expected = run()
+        assert run() == expected, "Outputs differ!"
+        current = timeit(run)
+
+        print(f"[{locale}] {len(words)} words")
+        for name, duration in [("legacy", legacy), ("current", current)]:
+            print(f"{name:>8}: {duration:.3f} s ({duration / len(words) * 1000:.3f} ms/word)")
+        print(f"   saved: {(legacy - current) / len(words) * 1000:.3f} ms/word")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
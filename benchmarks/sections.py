@@ -0,0 +1,44 @@
+"""Benchmark `render.find_all_sections()` parsing only the interesting top sections against parsing the whole page."""
+
+from __future__ import annotations
+
+import sys
+from unittest.mock import patch
+
+from wikidict import render, utils
+
+from . import DATA, timeit
+
+
+def main(argv: list[str]) -> int:
+    """Usage: python -m benchmarks.sections [LOCALE...]"""
+    for locale in argv or ["fr", "en"]:
+        lang_src, lang_dst = utils.guess_locales(locale, use_log=False)
+        pages = [
+            render.adjust_wikicode(file.read_text(encoding="utf-8"), lang_dst)
+            for file in sorted((DATA / lang_dst).glob("*.wiki"))
+        ]
+
+        def run() -> list[list[str]]:
+            return [
+                [str(section) for _, section in render.find_all_sections(code, lang_src, lang_dst)[1]]
+                for code in pages  # noqa: B023
+            ]
+
+        # The legacy code always parsed the whole page
+        with patch.object(render, "slice_top_sections", return_value=None):
+            legacy = timeit(run)
+            expected = run()
+        assert run() == expected, "Outputs differ!"
+        current = timeit(run)
+
+        print(f"[{locale}] {len(pages)} pages, {sum(map(len, pages)) // len(pages):,} chars on average")
+        for name, duration in [("legacy", legacy), ("current", current)]:
+            print(f"{name:>8}: {duration:.3f} s ({duration / len(pages) * 1000:.3f} ms/page)")
+        print(f"   saved: {(legacy - current) / len(pages) * 1000:.3f} ms/page")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
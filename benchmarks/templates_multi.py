@@ -0,0 +1,50 @@
+"""Benchmark `utils.transform()` with compiled *templates_multi* expressions against evaluating the source strings."""
+
+from __future__ import annotations
+
+import sys
+from unittest.mock import patch
+
+import wikitextparser as wtp
+
+from wikidict import utils
+from wikidict.lang import templates_multi
+
+from . import DATA, timeit
+
+
+def main(argv: list[str]) -> int:
+    """Usage: python -m benchmarks.templates_multi [LOCALE...] [REPEAT]"""
+    locales = [arg for arg in argv if not arg.isdigit()] or ["fr", "en"]
+    repeat = int(next((arg for arg in argv if arg.isdigit()), "20"))
+
+    for locale in locales:
+        # All *templates_multi* templates found in the test corpus, without nested templates
+        calls = [
+            (file.stem, template)
+            for file in sorted((DATA / locale).glob("*.wiki"))
+            for tpl in wtp.parse(file.read_text(encoding="utf-8")).templates
+            if tpl.name.strip() in templates_multi[locale] and "{{" not in (template := tpl.string[2:-2])
+        ] * repeat
+
+        def run() -> list[str]:
+            return [utils.transform(word, template, locale) for word, template in calls]  # noqa: B023
+
+        # Calls are repeated: without disabling the pure templates cache, most of them would not evaluate anything
+        with patch.object(utils, "TEMPLATES_CACHE", utils.TemplatesCache(0)):
+            # The legacy code evaluated the source string of the expression on every call
+            with patch.object(utils, "get_templates_multi", templates_multi.__getitem__):
+                legacy = timeit(run)
+                expected = run()
+            assert run() == expected, "Outputs differ!"
+            current = timeit(run)
+
+        print(f"[{locale}] {len(calls):,} templates ({len(calls) // repeat} x {repeat})")
+        for name, duration in [("legacy", legacy), ("current", current)]:
+            print(f"{name:>8}: {duration:.3f} s ({duration / len(calls) * 1_000_000:.1f} µs/template)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,58 @@
+"""Benchmark the XML pages splitter of `parse.xml_iter_parse()` against the former line-based implementation."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import TYPE_CHECKING
+
+from tests.helpers import craft_dump
+from wikidict import parse
+
+from . import timeit
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+
+def legacy_xml_iter_parse(file: Path) -> Generator[str]:
+    """The line-based implementation, as it was before the buffer-level splitter."""
+    element: list[str] = []
+    is_element = False
+
+    with file.open(encoding="utf-8") as fh:
+        for line in fh:
+            if is_element:
+                if "/page>" in line:
+                    yield "".join(element)
+                    element = []
+                    is_element = False
+                else:
+                    element.append(line)
+            elif "<page" in line:
+                is_element = True
+
+
+def main(argv: list[str]) -> int:
+    """Usage: python -m benchmarks.xml_iter_parse [LOCALE] [REPEAT]"""
+    locale = argv[0] if argv else "fr"
+    repeat = int(argv[1]) if len(argv) > 1 else 50
+
+    with TemporaryDirectory() as tmp:
+        file = Path(tmp) / "pages-20201217.xml"
+        file.write_bytes(craft_dump(locale, repeat=repeat))
+        size = file.stat().st_size / 1024**2
+
+        assert list(parse.xml_iter_parse(file)) == list(legacy_xml_iter_parse(file)), "Outputs differ!"
+
+        print(f"Dump of {size:,.1f} MiB ({locale=}, {repeat=})")
+        for name, func in [("legacy", legacy_xml_iter_parse), ("current", parse.xml_iter_parse)]:
+            duration = timeit(lambda: sum(1 for _ in func(file)))  # noqa: B023
+            print(f"{name:>8}: {duration:.3f} s ({size / duration:,.1f} MiB/s)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
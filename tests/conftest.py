@@ -3,34 +3,12 @@
 import sys
 from collections.abc import Callable, Generator
 from pathlib import Path
-from xml.sax.saxutils import escape
 
 import pytest
 
-os.environ["CWD"] = str(Path(__file__).parent)
-
+from tests.helpers import craft_dump
 
-XML = '<mediawiki xmlns="http://www.mediawiki.org/xml/export-0.11/" xml:lang="{locale}">'
-PAGE_XML = """
-<page>
-    <title>{word}</title>
-    <ns>0</ns>
-    <id>1</id>
-    <revision>
-        <id>{revision}</id>
-        <parentid>221</parentid>
-        <timestamp>2020-04-17T14:21:12Z</timestamp>
-        <contributor>
-            <username>Alice</username>
-            <id>42</id>
-        </contributor>
-        <comment>/**/</comment>
-        <model>wikitext</model>
-        <format>text/x-wiki</format>
-        <text xml:space="preserve">{text}</text>
-    </revision>
-</page>
-"""
+os.environ["CWD"] = str(Path(__file__).parent)
 
 
 @pytest.fixture(autouse=True)
@@ -52,18 +30,7 @@ def no_warnings(recwarn: pytest.WarningsRecorder) -> Generator[None]:
 @pytest.fixture(scope="session")
 def craft_data() -> Callable[[str], bytes]:
     def _craft_data(locale: str) -> bytes:
-        data_dir = Path(os.environ["CWD"]) / "data" / locale
-        content = XML.format(locale=locale)
-        for file in sorted(data_dir.glob("*.wiki")):
-            if file.stem == "vide":
-                continue
-
-            revision = 42
-            text = escape(file.read_text(encoding="utf-8"))
-            content += PAGE_XML.format(word=file.stem, revision=revision, text=text)
-
-        content += "</mediawiki>"
-        return bz2.compress(content.encode("utf-8"))
+        return bz2.compress(craft_dump(locale))
 
     return _craft_data
 
@@ -0,0 +1,133 @@
+"""Formatters rendering words with the Jinja templates formerly used, shared by tests, and benchmarks."""
+
+from typing import Any
+
+from jinja2 import Template
+
+from wikidict import convert
+from wikidict.stubs import Fragments, Word
+
+# Jinja templates formerly used to render words, formatters must output the same content
+JINJA_TPL_KOBO = Template(
+    """\
+<w><p><a name="{{ word }}" /><b>{{ current_word }}</b>{{ pronunciation }}{{ gender }}<br/><br/>
+{%- for pos, pos_definitions in definitions -%}
+    <b>{{ pos }}</b><ol>
+    {%- for definition in pos_definitions -%}
+        {%- if definition is string -%}
+            <li>{{ definition }}</li>
+        {%- else -%}
+            <ol style="list-style-type:lower-alpha">
+            {%- for sub_def in definition -%}
+                {%- if sub_def is string -%}
+                    <li>{{ sub_def }}</li>
+                {%- else -%}
+                    <ol style="list-style-type:lower-roman">
+                        {%- for sub_sub_def in sub_def -%}
+                            <li>{{ sub_sub_def }}</li>
+                        {%- endfor -%}
+                    </ol>
+                {%- endif -%}
+            {%- endfor -%}
+            </ol>
+        {%- endif -%}
+    {%- endfor -%}
+    </ol>
+{%- endfor -%}
+{%- if etymologies -%}
+    {%- for etymology in etymologies -%}
+        {%- if etymology is string -%}
+            <p>{{ etymology }}</p>
+        {%- else -%}
+            <ol>
+            {%- for sub_etymology in etymology -%}
+                <li>{{ sub_etymology }}</li>
+            {%- endfor -%}
+            </ol>
+        {%- endif -%}
+    {%- endfor -%}
+    <br/>
+{%- endif -%}
+</p>
+{%- if variants -%}
+    <var>
+    {%- for variant in variants -%}
+        <variant name="{{ variant }}"/>
+    {%- endfor -%}
+    </var>
+{%- endif -%}
+</w>
+""",
+    trim_blocks=True,
+    lstrip_blocks=True,
+    keep_trailing_newline=True,
+)
+JINJA_TPL_DICTFILE = Template(
+    """\
+@ {{ word }}
+{%- if current_word or pronunciation or gender %}
+: {%- if current_word %} <b>{{ current_word }}</b>{%- endif -%}{{ pronunciation }}{{ gender }}
+{%- endif %}
+{%- for variant in variants %}
+& {{ variant }}
+{%- endfor %}
+<html>
+{%- for pos, pos_definitions in definitions -%}
+    <p><b>{{ pos }}</b></p><ol>
+    {%- for definition in pos_definitions -%}
+        {%- if definition is string -%}
+            <li>{{ definition }}</li>
+        {%- else -%}
+            <ol style="list-style-type:lower-alpha">
+                {%- for sub_def in definition -%}
+                    {%- if sub_def is string -%}
+                        <li>{{ sub_def }}</li>
+                    {%- else -%}
+                        <ol style="list-style-type:lower-roman">
+                            {%- for sub_sub_def in sub_def -%}
+                                <li>{{ sub_sub_def }}</li>
+                            {%- endfor -%}
+                        </ol>
+                    {%- endif -%}
+                {%- endfor -%}
+            </ol>
+        {%- endif -%}
+    {%- endfor -%}
+    </ol>
+{%- endfor -%}
+{%- if etymologies -%}
+    {%- for etymology in etymologies -%}
+        {%- if etymology is string -%}
+            <p>{{ etymology }}</p>
+        {%- else -%}
+            <ol>
+                {%- for sub_etymology in etymology -%}
+                    <li>{{ sub_etymology }}</li>
+                {%- endfor -%}
+            </ol>
+        {%- endif -%}
+    {%- endfor -%}
+    <br/>
+{%- endif -%}</html>
+
+
+"""
+)
+
+
+def jinja_formatter(cls: type[convert.BaseFormat], template: Template) -> type[convert.BaseFormat]:
+    """A formatter rendering raw details of words with *template*."""
+
+    class JinjaFormat(cls):  # type: ignore[valid-type,misc]
+        def get_fragments(self, word: str, details: Word) -> Fragments:
+            # Definitions, and etymologies, are rendered by the template
+            fragments = convert.render_fragments(details)
+            return fragments._replace(
+                definitions=details.definitions.items(),  # type: ignore[arg-type]
+                etymology=details.etymology,  # type: ignore[arg-type]
+            )
+
+        def format_word(self, **kwargs: Any) -> str:
+            return template.render(**kwargs)
+
+    return JinjaFormat
@@ -0,0 +1,42 @@
+"""Helpers shared by tests, and benchmarks."""
+
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+DATA = Path(__file__).parent / "data"
+
+XML = '<mediawiki xmlns="http://www.mediawiki.org/xml/export-0.11/" xml:lang="{locale}">'
+PAGE_XML = """
+<page>
+    <title>{word}</title>
+    <ns>0</ns>
+    <id>1</id>
+    <revision>
+        <id>{revision}</id>
+        <parentid>221</parentid>
+        <timestamp>2020-04-17T14:21:12Z</timestamp>
+        <contributor>
+            <username>Alice</username>
+            <id>42</id>
+        </contributor>
+        <comment>/**/</comment>
+        <model>wikitext</model>
+        <format>text/x-wiki</format>
+        <text xml:space="preserve">{text}</text>
+    </revision>
+</page>
+"""
+
+
+def craft_dump(locale: str, *, repeat: int = 1) -> bytes:
+    """Craft an uncompressed XML dump of all pages of the *locale* test corpus (it is also used by benchmarks).
+    All pages are duplicated *repeat* times (with a different title) to get a bigger dump.
+    """
+    content = [XML.format(locale=locale)]
+    pages = [(file.stem, escape(file.read_text(encoding="utf-8"))) for file in sorted((DATA / locale).glob("*.wiki"))]
+    for idx in range(repeat):
+        content.extend(
+            PAGE_XML.format(word=f"{word}{idx or ''}", revision=42, text=text) for word, text in pages if word != "vide"
+        )
+    content.append("</mediawiki>")
+    return "".join(content).encode("utf-8")
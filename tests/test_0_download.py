@@ -1,9 +1,10 @@
+import bz2
 import logging
 import os
 import re
 from collections.abc import Callable
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import pytest
 import responses
@@ -66,6 +67,33 @@ def test_simple(craft_data: Callable[[str], bytes]) -> None:
     assert pages_bz2.is_file()
 
 
+@responses.activate
+def test_stream(craft_data: Callable[[str], bytes]) -> None:
+    """It should download the Wiktionary dump file, and keep it compressed."""
+
+    output_dir = Path(os.environ["CWD"]) / "data" / "fr"
+
+    dump = DUMPS[-1]
+    pages_xml = output_dir / f"pages-{dump}.xml"
+    pages_bz2 = output_dir / f"pages-{dump}.xml.bz2"
+
+    # Clean-up before we start
+    cleanup(output_dir)
+
+    # List of requests responses to falsify:
+    #   - fetch_snapshots()
+    #   - fetch_pages()
+    responses.add(responses.GET, BASE_URL.format("fr"), body=WIKTIONARY_INDEX)
+    responses.add(responses.GET, DUMP_URL.format("fr", dump), body=craft_data("fr"))
+
+    # Start the whole process
+    assert download.main("fr", stream=True) == 0
+
+    # Check that only the compressed file is created
+    assert not pages_xml.is_file()
+    assert pages_bz2.is_file()
+
+
 @responses.activate
 def test_download_already_done(craft_data: Callable[[str], bytes]) -> None:
     """It should not download again a processed Wiktionary dump."""
@@ -151,6 +179,68 @@ def test_no_dump_found(craft_data: Callable[[str], bytes]) -> None:
         assert not (output_dir / f"pages-{dump}.xml.bz2").is_file()
 
 
+def make_multiblock_bz2(file: Path) -> bytes:
+    """Craft a multistream BZ2 file where the first stream holds several blocks."""
+    text = "".join(
+        f"<page><title>word {idx}</title><text>{idx * 7919 % 104729}</text></page>\n" for idx in range(40_000)
+    )
+    data = text.encode()
+    file.write_bytes(bz2.compress(data, compresslevel=1) + bz2.compress(b"<last/>"))
+    return data + b"<last/>"
+
+
+def test_find_bz2_blocks(tmp_path: Path) -> None:
+    file = tmp_path / "pages.xml.bz2"
+    make_multiblock_bz2(file)
+    assert len(download.find_bz2_blocks(file)) > 2
+
+
+def test_find_bz2_blocks_invalid(tmp_path: Path) -> None:
+    file = tmp_path / "pages.xml.bz2"
+    file.write_bytes(b"")
+    assert download.find_bz2_blocks(file) == []
+
+    # Truncated file
+    file.write_bytes(bz2.compress(b"a" * 1024)[:-10])
+    assert download.find_bz2_blocks(file) == []
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_decompress(workers: int, tmp_path: Path) -> None:
+    file_in = tmp_path / "pages.xml.bz2"
+    file_out = tmp_path / "pages.xml"
+    expected = make_multiblock_bz2(file_in)
+    callback = Mock()
+
+    download.decompress(file_in, file_out, callback, workers=workers)
+
+    assert file_out.read_bytes() == expected
+    assert callback.call_args.args[1:] == (len(expected), True)
+    assert callback.call_args.args[0].endswith(" MiB/s)")
+
+
+def test_decompress_parallel_failure(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    file_in = tmp_path / "pages.xml.bz2"
+    expected = make_multiblock_bz2(file_in)
+    calls = 0
+    decompress_block = download.decompress_block
+
+    def faulty_decompress_block(file: Path, start: int, end: int) -> bytes:
+        nonlocal calls
+        calls += 1
+        if calls == 2:
+            raise OSError("Invalid data stream")
+        return decompress_block(file, start, end)
+
+    with patch.object(download, "iter_decompress_parallel") as mocked:
+        # Decompress blocks in the current process to be able to inject a failure
+        mocked.side_effect = lambda file, blocks, _: (faulty_decompress_block(file, *block) for block in blocks)
+        data = b"".join(download.iter_decompress(file_in, workers=2))
+
+    assert data == expected
+    assert "falling back to the sequential one" in caplog.text
+
+
 def test_progress_callback(caplog: pytest.LogCaptureFixture) -> None:
     with caplog.at_level(logging.DEBUG):
         download.callback_progress("Some text", 42 * 1024, False)
@@ -197,4 +287,6 @@ def test_sublang(locale: str, lang_src: str, lang_dst: str, tmp_path: Path) -> N
             mocked_gofc.assert_called_once_with(lang_src, snapshot)
             mocked_gofu.assert_called_once_with(pages_compressed)
             mocked_fp.assert_called_once_with(snapshot, lang_src, pages_compressed, callback=download.callback_progress)
-            mocked_d.assert_called_once_with(pages_compressed, pages_uncompressed, download.callback_progress)
+            mocked_d.assert_called_once_with(
+                pages_compressed, pages_uncompressed, download.callback_progress, workers=1
+            )
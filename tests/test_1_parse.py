@@ -1,19 +1,23 @@
 import bz2
+import logging
 import os
+from collections import Counter
 from collections.abc import Callable
+from io import BytesIO
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
 from wikidict import parse
+from wikidict.store import Store, StoreWriter
 
 
 def test_simple(craft_data: Callable[[str], bytes]) -> None:
     output_dir = Path(os.environ["CWD"]) / "data" / "fr"
 
     # Delete an previously created file to cover the save() part
-    for file in output_dir.glob("data_wikicode-*.json"):
+    for file in output_dir.glob("data_wikicode-*.bin"):
         file.unlink()
 
     # Ensure there is data to process.
@@ -24,6 +28,144 @@ def test_simple(craft_data: Callable[[str], bytes]) -> None:
     assert parse.main("fr") == 0
 
 
+def test_stream(craft_data: Callable[[str], bytes], tmp_path: Path) -> None:
+    compressed = tmp_path / "pages-20201217.xml.bz2"
+    compressed.write_bytes(craft_data("fr"))
+    uncompressed = tmp_path / "pages-20201217.xml"
+    uncompressed.write_bytes(bz2.decompress(compressed.read_bytes()))
+
+    words = parse.process(compressed, "fr").words
+    assert words
+    assert words == parse.process(uncompressed, "fr").words
+
+
+@pytest.mark.parametrize("workers", [2, 3, 16])
+def test_workers(workers: int, craft_data: Callable[[str], bytes], tmp_path: Path) -> None:
+    compressed = tmp_path / "pages-20201217.xml.bz2"
+    compressed.write_bytes(craft_data("fr"))
+    uncompressed = tmp_path / "pages-20201217.xml"
+    uncompressed.write_bytes(bz2.decompress(compressed.read_bytes()))
+
+    words = parse.process(uncompressed, "fr").words
+    assert words
+    assert parse.process(uncompressed, "fr", workers=workers).words == words
+    assert parse.process(compressed, "fr", workers=workers).words == words
+
+
+@pytest.mark.parametrize("chunk_size", [64, 4096])
+def test_xml_iter_pages_chunk_size(chunk_size: int, craft_data: Callable[[str], bytes]) -> None:
+    raw = bz2.decompress(craft_data("fr"))
+    pages = list(parse.xml_iter_pages(BytesIO(raw)))
+    assert len(pages) == raw.count(b"<page>")
+    assert list(parse.xml_iter_pages(BytesIO(raw), chunk_size=chunk_size)) == pages
+
+
+def test_get_page_ranges(craft_data: Callable[[str], bytes], tmp_path: Path) -> None:
+    file = tmp_path / "pages-20201217.xml"
+    file.write_bytes(raw := bz2.decompress(craft_data("fr")))
+
+    ranges = parse.get_page_ranges(file, 8)
+    assert 1 < len(ranges) <= 8
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == len(raw)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+        assert raw[start:].lstrip().startswith(b"<page>")
+
+    # There are more ranges than pages: one range per page, plus the XML header
+    assert len(parse.get_page_ranges(file, 10_000)) == raw.count(b"<page>") + 1
+
+
+def test_stream_main(craft_data: Callable[[str], bytes], tmp_path: Path) -> None:
+    source_dir = tmp_path / "data" / "fr"
+    source_dir.mkdir(parents=True)
+    (source_dir / "pages-20201217.xml.bz2").write_bytes(craft_data("fr"))
+
+    with patch.dict("os.environ", {"CWD": str(tmp_path)}):
+        assert parse.main("fr") == 1
+        assert parse.main("fr", stream=True) == 0
+
+    assert not (source_dir / "pages-20201217.xml").is_file()
+    assert (tmp_path / "data" / "fr" / "fr" / "data_wikicode-20201217.bin").is_file()
+
+
+PAGE_XML = """
+<page>
+    <title>{word}</title>
+    <ns>0</ns>
+    <id>1</id>
+    <revision>
+        <id>{revision}</id>
+        <text xml:space="preserve">{text}</text>
+    </revision>
+</page>
+"""
+
+
+def craft_pages(file: Path, pages: list[tuple[str, int, str]]) -> None:
+    content = "".join(PAGE_XML.format(word=word, revision=revision, text=text) for word, revision, text in pages)
+    file.write_text(f"<mediawiki>{content}</mediawiki>", encoding="utf-8")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_incremental(workers: int, tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    source_dir = tmp_path / "data" / "fr"
+    source_dir.mkdir(parents=True)
+    output_dir = tmp_path / "data" / "fr" / "fr"
+    fr = "== {{{{langue|fr}}}} ==\n# {}"
+    craft_pages(
+        source_dir / "pages-20250401.xml",
+        [("a", 1, fr.format("a")), ("b", 1, "== {{langue|en}} =="), ("c", 1, fr.format("c")), ("d", 1, fr.format("d"))],
+    )
+    craft_pages(
+        source_dir / "pages-20250420.xml",
+        [("a", 1, "STALE"), ("b", 1, "STALE"), ("c", 2, fr.format("c2")), ("e", 1, fr.format("e"))],
+    )
+
+    with patch.dict("os.environ", {"CWD": str(tmp_path)}):
+        # No previous snapshot
+        (source_dir / "pages-20250420.xml").rename(source_dir / "pages-20250420.xml.new")
+        assert parse.main("fr", workers=1, incremental=True) == 0
+        assert "No previous snapshot found" in caplog.text
+        (source_dir / "pages-20250420.xml.new").rename(source_dir / "pages-20250420.xml")
+
+        caplog.clear()
+        with caplog.at_level(logging.INFO):
+            assert parse.main("fr", workers=workers, incremental=True) == 0
+        assert "Pages: 2 unchanged, 1 changed, 1 added, 1 removed" in caplog.text
+
+    with Store(output_dir / "data_wikicode-20250420.bin") as words:
+        # Unchanged revisions are taken from the previous snapshot, even for rejected pages
+        assert dict(words) == {"a": fr.format("a"), "c": fr.format("c2"), "e": fr.format("e")}
+        assert words["a"] == "== {{langue|fr}} ==\n# a"
+    with Store(output_dir / "data_revisions-20250420.bin") as revisions:
+        assert dict(revisions) == {"": parse.get_parser_digest("fr", "fr"), "a": "1", "b": "1", "c": "2", "e": "1"}
+
+
+def test_incremental_settings_changed(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    output = tmp_path / "data_wikicode-20250420.bin"
+    StoreWriter(tmp_path / "data_wikicode-20250401.bin").close()
+    parse.save_revisions(tmp_path / "data_revisions-20250401.bin", {"a": "1"}, "old-digest")
+
+    assert (previous := parse.get_previous(output, "old-digest"))
+    previous.close()
+
+    with patch.object(Store, "close", autospec=True, side_effect=Store.close) as mocked:
+        assert not parse.get_previous(output, "new-digest")
+    mocked.assert_called_once()
+    assert "Parser, or its settings, changed" in caplog.text
+
+
+def test_parser_digest() -> None:
+    digest = parse.get_parser_digest("fr", "fr")
+    assert parse.get_parser_digest("fr", "fr") == digest
+    assert parse.get_parser_digest("fro", "fr") != digest
+
+    # The parser code changed
+    with patch.object(Path, "read_bytes", return_value=b"new code"):
+        assert parse.get_parser_digest("fr", "fr") != digest
+
+
 def test_no_xml_file() -> None:
     with patch.object(parse, "get_latest_xml_file", return_value=None):
         assert parse.main("fr") == 1
@@ -67,7 +209,7 @@ def test_parse_restricted_word(tmp_path: Path) -> None:
 """
     )
 
-    assert "cunnilingus" in parse.process(file, "fr")
+    assert "cunnilingus" in parse.process(file, "fr").words
 
 
 def test_parse_redirected_word(tmp_path: Path) -> None:
@@ -85,7 +227,7 @@ def test_parse_redirected_word(tmp_path: Path) -> None:
 """
     )
 
-    assert not parse.process(file, "fr")
+    assert not parse.process(file, "fr").words
 
 
 def test_parse_word_without_wikicode(tmp_path: Path) -> None:
@@ -115,7 +257,7 @@ def test_parse_word_without_wikicode(tmp_path: Path) -> None:
 """
     )
 
-    assert not parse.process(file, "fr")
+    assert not parse.process(file, "fr").words
 
 
 def test_parse_word_with_colons(tmp_path: Path) -> None:
@@ -153,7 +295,7 @@ def test_parse_word_with_colons(tmp_path: Path) -> None:
 """
     )
 
-    assert not parse.process(file, "fr")
+    assert not parse.process(file, "fr").words
 
 
 def test_parse_word_with_templates_lowercased(tmp_path: Path) -> None:
@@ -196,7 +338,7 @@ def test_parse_word_with_templates_lowercased(tmp_path: Path) -> None:
 """
     )
 
-    assert "restaurang" in parse.process(file, "sv")
+    assert "restaurang" in parse.process(file, "sv").words
 
 
 @pytest.mark.parametrize(
@@ -219,20 +361,24 @@ def test_sublang(locale: str, lang_src: str, lang_dst: str, tmp_path: Path) -> N
         assert source_dir == tmp_path / "data" / lang_src
 
         output_file = parse.get_output_file(source_dir, lang_src, lang_dst, snapshot)
-        assert output_file == source_dir.parent / lang_dst / lang_src / f"data_wikicode-{snapshot}.json"
+        assert output_file == source_dir.parent / lang_dst / lang_src / f"data_wikicode-{snapshot}.bin"
 
         with (
             patch.object(parse, "get_source_dir") as mocked_gsd,
             patch.object(parse, "get_latest_xml_file") as mocked_glxf,
             patch.object(parse, "process") as mocked_p,
             patch.object(parse, "save") as mocked_s,
+            patch.object(parse, "save_revisions") as mocked_sr,
         ):
             mocked_glxf.return_value = pages
             mocked_gsd.return_value = source_dir
-            mocked_p.return_value = words
+            mocked_p.return_value = parse.Pages(words, {}, Counter())
 
             parse.main(locale)
             mocked_gsd.assert_called_once_with(lang_src)
-            mocked_glxf.assert_called_once_with(source_dir)
-            mocked_p.assert_called_once_with(pages, locale)
+            mocked_glxf.assert_called_once_with(source_dir, compressed=False)
+            mocked_p.assert_called_once_with(pages, locale, workers=1, previous=None)
             mocked_s.assert_called_once_with(output_file, words)
+            mocked_sr.assert_called_once_with(
+                parse.get_revisions_file(output_file), {}, parse.get_parser_digest(lang_src, lang_dst)
+            )
@@ -0,0 +1,102 @@
+import json
+import pickle
+from pathlib import Path
+
+import pytest
+
+from wikidict.store import HEADER, RECORD, DecodedStore, Store, StoreWriter
+
+
+def test_store(tmp_path: Path) -> None:
+    file = tmp_path / "data.bin"
+    words = {"été": "{{S|nom|fr}}", "a": "", "Zèbre": "\n# ''Zèbre''", "ß": "ß" * 1024, "𝄞": "clef"}
+
+    with StoreWriter(file) as writer:
+        for word, code in words.items():
+            writer.add(word, "old")
+            writer.add(word, code)
+        assert len(writer) == len(words)
+
+    with Store(file) as store:
+        assert len(store) == len(words)
+        assert list(store) == sorted(words)
+        assert list(store.items()) == sorted(words.items())
+        assert dict(store) == words
+        assert dict(store.iter_sizes()) == {word: len(code.encode()) for word, code in words.items()}
+        for word, code in words.items():
+            assert store[word] == code
+            assert word in store
+        assert "b" not in store
+        with pytest.raises(KeyError):
+            store["b"]
+
+
+def test_store_empty(tmp_path: Path) -> None:
+    file = tmp_path / "data.bin"
+    StoreWriter(file).close()
+
+    with Store(file) as store:
+        assert not store
+        assert not list(store.items())
+        assert store.get("a") is None
+
+
+def test_store_pickle(tmp_path: Path) -> None:
+    file = tmp_path / "data.bin"
+    with StoreWriter(file) as writer:
+        writer.add("a", "b")
+
+    with Store(file) as store, pickle.loads(pickle.dumps(store)) as copy:
+        assert copy.file == file
+        assert copy == store
+
+
+@pytest.mark.parametrize("content", [b"", b"{}", b"{}" * 16])
+def test_store_invalid_file(content: bytes, tmp_path: Path) -> None:
+    file = tmp_path / "data.bin"
+    file.write_bytes(content)
+
+    with pytest.raises(ValueError, match="is not a store file"):
+        Store(file)
+
+
+@pytest.mark.parametrize("size", [-1, -RECORD.size, HEADER.size])
+def test_store_truncated_file(size: int, tmp_path: Path) -> None:
+    file = tmp_path / "data.bin"
+    with StoreWriter(file) as writer:
+        writer.add("a", "b")
+        writer.add("c", "d")
+    file.write_bytes(file.read_bytes()[:size])
+
+    with pytest.raises(ValueError, match="is a truncated, or corrupted, store file"):
+        Store(file)
+
+
+def test_store_writer_error(tmp_path: Path) -> None:
+    file = tmp_path / "data.bin"
+
+    with pytest.raises(ZeroDivisionError), StoreWriter(file) as writer:
+        writer.add("a", "b")
+        1 / 0  # noqa: B018
+
+    assert not list(tmp_path.iterdir())
+
+
+def test_decoded_store_pickle(tmp_path: Path) -> None:
+    file = tmp_path / "data.bin"
+    with StoreWriter(file) as writer:
+        writer.add("a", "[1, 2]")
+        writer.add("b", "[]")
+
+    with Store(file) as store:
+        decoded = DecodedStore(store, json.loads)
+        # Only the path, and the decoder, are pickled
+        data = pickle.dumps(decoded)
+        assert b"[1, 2]" not in data
+
+        copy = pickle.loads(data)
+        try:
+            assert isinstance(copy, DecodedStore)
+            assert dict(copy.items()) == dict(decoded.items()) == {"a": [1, 2], "b": []}
+        finally:
+            copy.store.close()
@@ -1,13 +1,16 @@
+import json
 import logging
-from collections.abc import Callable
+from collections.abc import Callable, Generator
 from pathlib import Path
+from typing import Any
 from unittest.mock import patch
 
 import pytest
 from wikitextparser import Section
 
-from wikidict import render
-from wikidict.stubs import Word
+from wikidict import profiler, render, utils
+from wikidict.store import Store, StoreWriter
+from wikidict.stubs import Definition, Word, Words
 
 
 def test_simple() -> None:
@@ -16,17 +19,216 @@ def test_simple() -> None:
     assert render.main("fr", workers=2) == 0
 
 
-def test_no_json_file() -> None:
-    with patch.object(render, "get_latest_json_file", return_value=None):
+def test_simple_profile(tmp_path: Path) -> None:
+    output = tmp_path / "render-profile.json"
+    with patch.object(render, "get_profile_file", return_value=output):
+        assert render.main("fr", workers=1, profile=True) == 0
+    assert json.loads(output.read_text(encoding="utf-8"))["words"]
+    assert output.with_suffix(".txt").is_file()
+
+
+def test_no_wikicode_file() -> None:
+    with patch.object(render, "get_latest_wikicode_file", return_value=None):
         assert render.main("fr") == 1
 
 
-def test_empty_json_file(tmp_path: Path) -> None:
-    file = tmp_path / "test.json"
-    file.write_text("{}")
-    with patch.object(render, "get_latest_json_file", return_value=file):
+def test_empty_wikicode_file(tmp_path: Path) -> None:
+    file = tmp_path / "test.bin"
+    StoreWriter(file).close()
+    with (
+        patch.object(render, "get_latest_wikicode_file", return_value=file),
+        patch.object(Store, "close", autospec=True, side_effect=Store.close) as mocked,
+    ):
         with pytest.raises(ValueError):
             render.main("fr")
+    # The store is closed, also on errors
+    mocked.assert_called_once()
+
+
+def test_render_incremental(page: Callable[[str, str], str], tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    cache_file = tmp_path / "render-cache.bin"
+    in_words = {"π": page("π", "fr"), "base": page("base", "fr"), "empty": "== {{langue|fr}} =="}
+
+    with caplog.at_level(logging.INFO):
+        words = render.render(in_words, "fr", 1, cache_file=cache_file)
+        assert "Render cache: 0 hits, 3 misses" in caplog.text
+        assert sorted(words) == ["base", "π"]
+
+        # Nothing changed
+        caplog.clear()
+        with patch.object(render, "render_word") as mocked:
+            cached = render.render(in_words, "fr", 1, cache_file=cache_file)
+        mocked.assert_not_called()
+        assert "Render cache: 3 hits, 0 misses" in caplog.text
+        assert json.dumps(cached, sort_keys=True) == json.dumps(words, sort_keys=True)
+
+        # One word changed, another one removed
+        caplog.clear()
+        in_words["π"] += "\n"
+        del in_words["base"]
+        assert sorted(render.render(in_words, "fr", 1, cache_file=cache_file)) == ["π"]
+        assert "Render cache: 1 hits, 1 misses" in caplog.text
+        with Store(cache_file) as store:
+            assert len(store) == 3  # The code version, "π", and "empty"
+
+        # The code changed
+        caplog.clear()
+        with patch.object(render, "get_code_version", return_value="new"):
+            render.render(in_words, "fr", 1, cache_file=cache_file)
+        assert "Code changed since the render cache was written" in caplog.text
+        assert "Render cache: 0 hits, 2 misses" in caplog.text
+
+
+def test_render_incremental_transclusion(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    cache_file = tmp_path / "render-cache.bin"
+    wikicode_file = tmp_path / "data" / "en" / "en" / "data_wikicode-20250101.bin"
+    wikicode_file.parent.mkdir(parents=True)
+    in_words = {"Macao": "==English==\n===Proper noun===\n# {{tcl|en|Macau|id=Q14773}}\n"}
+
+    def render_with_source(definition: str) -> list[Definition]:
+        with StoreWriter(wikicode_file) as writer:
+            writer.add("Macau", f"==English==\n===Proper noun===\n# {{{{senseid|en|Q14773}}}} {definition}.")
+        words = render.render(in_words, "en", 1, cache_file=cache_file)
+        return words["Macao"].definitions["Proper Noun"]
+
+    with patch.dict("os.environ", {"CWD": str(tmp_path)}), caplog.at_level(logging.INFO):
+        assert render_with_source("A special administrative region of China") == [
+            "A special administrative region of China"
+        ]
+
+        # The word did not change, but the transcluded one did
+        caplog.clear()
+        assert render_with_source("A city of China") == ["A city of China"]
+        assert "Render cache: 0 hits, 1 misses" in caplog.text
+        with Store(cache_file) as store:
+            assert len(store) == 1  # The code version only
+
+
+def test_render_incremental_errors(
+    page: Callable[[str, str], str], tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    cache_file = tmp_path / "render-cache.bin"
+    in_words = {"π": page("π", "fr"), "base": page("base", "fr"), "empty": "== {{langue|fr}} =="}
+    parse_word = render.parse_word
+
+    def failing_parse_word(word: str, *args: Any, **kwargs: Any) -> Word:
+        if word == "base":
+            raise ValueError(word)
+        return parse_word(word, *args, **kwargs)
+
+    def interrupted_render(*args: Any, **kwargs: Any) -> Generator[tuple[Words, list[str]]]:
+        yield {}, ["empty"]
+        raise KeyboardInterrupt
+
+    with caplog.at_level(logging.INFO):
+        # The word that failed is not cached
+        with patch.object(render, "parse_word", side_effect=failing_parse_word):
+            assert sorted(render.render(in_words, "fr", 1, cache_file=cache_file)) == ["π"]
+        with Store(cache_file) as store:
+            assert len(store) == 3  # The code version, "π", and "empty"
+
+        caplog.clear()
+        assert sorted(render.render(in_words, "fr", 1, cache_file=cache_file)) == ["base", "π"]
+        assert "Render cache: 2 hits, 1 misses" in caplog.text
+
+        # Interrupted: the cache is left untouched
+        in_words["π"] += "\n"
+        in_words["empty"] += "\n"
+        with patch.object(render, "iter_render_batches", side_effect=interrupted_render):
+            assert sorted(render.render(in_words, "fr", 1, cache_file=cache_file)) == ["base"]
+        assert not cache_file.with_name(f"{cache_file.name}.tmp").exists()
+
+        caplog.clear()
+        assert sorted(render.render(in_words, "fr", 1, cache_file=cache_file)) == ["base", "π"]
+        assert "Render cache: 1 hits, 2 misses" in caplog.text
+
+
+def test_render_batch(page: Callable[[str, str], str]) -> None:
+    code = "== {{langue|fr}} ==\n=== {{S|nom|fr}} ===\n# {{unknown}} {{unknown}}.\n# {{term|Zoologie}} Chat."
+    code += "\n# {{term|Zoologie}} Matou."
+    with patch.object(utils, "TEMPLATES_CACHE", utils.TemplatesCache(10)):
+        count, words, rendered, all_templates, cache_stats, timings, profile = render.render_batch(
+            [("π", page("π", "fr")), ("chat", code), ("empty", "")], "fr"
+        )
+    assert count == 3
+    assert sorted(words) == ["chat", "π"]
+    assert sorted(rendered) == ["chat", "empty", "π"]
+    assert sorted(word for _, word in timings) == ["chat", "empty", "π"]
+    # Templates statistics are deduplicated
+    assert all_templates[("unknown", "chat", "missed")] == 2
+    assert all_templates[("term", "chat", "check")] == 2
+    # Pure templates are rendered once
+    assert cache_stats[("fr", "hits")] == 1
+    # Not profiling
+    assert profile is None
+
+
+def test_render_profile(page: Callable[[str, str], str], tmp_path: Path) -> None:
+    code = "== {{langue|fr}} ==\n=== {{S|nom|fr}} ===\n# {{term|Zoologie}} Chat.\n# {{term|Zoologie}} Matou."
+    profile = profiler.Profile()
+    words = render.render({"π": page("π", "fr"), "chat": code}, "fr", 1, profile=profile)
+    assert sorted(words) == ["chat", "π"]
+    assert profiler.PROFILE is None
+
+    output = tmp_path / "render-profile.json"
+    profiler.save(profile, output)
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert [entry["locale"] for entry in report["locales"]] == ["fr"]
+    assert report["locales"][0]["calls"] == 2
+    assert sorted(entry["name"] for entry in report["words"]) == ["chat", "π"]
+    assert {"locale": "fr", "name": "term", "calls": 2} in [
+        {key: value for key, value in entry.items() if key != "seconds"} for entry in report["templates"]
+    ]
+    assert report["handlers"]
+    assert "Slowest templates:\n" in output.with_suffix(".txt").read_text(encoding="utf-8")
+
+
+def test_get_batches(tmp_path: Path) -> None:
+    in_words = {"small": "a", "huge": "a" * (render.RENDER_BATCH_BYTES + 1), "medium": "a" * 100}
+    in_words |= {f"word{idx}": "a" * 10 for idx in range(render.RENDER_BATCH_SIZE + 1)}
+    file = tmp_path / "data.bin"
+    with StoreWriter(file) as writer:
+        writer.update(in_words.items())
+
+    for words in (in_words, Store(file)):
+        batches = list(render.get_batches(words))
+        assert [len(batch) for batch in batches] == [1, render.RENDER_BATCH_SIZE, 3]
+        # The biggest Wikicode first
+        assert batches[0] == [("huge", in_words["huge"])]
+        assert batches[1][0] == ("medium", "a" * 100)
+        assert batches[-1][-1] == ("small", "a")
+        assert sorted(item for batch in batches for item in batch) == sorted(in_words.items())
+
+
+def test_render_progress(page: Callable[[str, str], str], caplog: pytest.LogCaptureFixture) -> None:
+    in_words = {"π": page("π", "fr"), "base": page("base", "fr")}
+    with (
+        caplog.at_level(logging.INFO),
+        patch.object(render, "PROGRESS_INTERVAL", 0.0),
+        patch.object(render, "RENDER_BATCH_SIZE", 1),
+    ):
+        assert sorted(render.render(in_words, "fr", 1)) == ["base", "π"]
+
+    assert "Rendered 1/2 words (" in caplog.text
+    assert "Rendered 2/2 words (" in caplog.text
+    assert "ETA 0:00:00)" in caplog.text
+    assert "Slowest words: 'base' (" in caplog.text or "Slowest words: 'π' (" in caplog.text
+
+
+def test_save(tmp_path: Path) -> None:
+    output = tmp_path / "data-20250401.bin"
+    words = {"a": Word(["a"], [], [], {"nom": ["b"]}, []), "b": Word([], [], [], {}, ["a"])}
+
+    assert render.save(output, [{"b": words["b"]}, {}, {"a": words["a"]}]) == 2
+    with Store(output) as store:
+        assert list(store) == ["a", "b"]
+        assert Word(*json.loads(store["a"])) == words["a"]
+
+    # Nothing is saved when there are no words
+    output.unlink()
+    with pytest.raises(ValueError):
+        render.save(output, [{}])
+    assert not list(tmp_path.iterdir())
 
 
 def test_render_word(page: Callable[[str, str], str]) -> None:
@@ -71,6 +273,19 @@ def test_find_section_definitions_and_es_replace_defs_list_with_numbered_lists()
     ]
 
 
+@pytest.mark.parametrize("locale", sorted(folder.name for folder in (Path(__file__).parent / "data").iterdir()))
+def test_find_all_sections_sliced(locale: str) -> None:
+    def sections(code: str) -> tuple[list[str], list[tuple[str, str]]]:
+        top_sections, all_sections = render.find_all_sections(code, locale, locale)
+        return [str(section) for section in top_sections], [(title, str(section)) for title, section in all_sections]
+
+    for file in sorted((Path(__file__).parent / "data" / locale).glob("*.wiki")):
+        code = render.adjust_wikicode(file.read_text(encoding="utf-8"), locale)
+        with patch.object(render, "slice_top_sections", return_value=None):
+            expected = sections(code)
+        assert sections(code) == expected, file.stem
+
+
 @pytest.mark.parametrize("workers", [1, 2, 3])
 @pytest.mark.parametrize("keep_unfinished", [True, False])
 def test_missing_templates(keep_unfinished: bool, workers: int, caplog: pytest.LogCaptureFixture) -> None:
@@ -173,7 +388,7 @@ def test_missing_templates(keep_unfinished: bool, workers: int, caplog: pytest.L
 )
 def test_sublang(locale: str, lang_src: str, lang_dst: str, tmp_path: Path) -> None:
     snapshot = "20250401"
-    pages = Path(f"data_wikicode-{snapshot}.json")
+    pages = Path(f"data_wikicode-{snapshot}.bin")
     words: dict[str, str] = {"a": "b"}
 
     with patch.dict("os.environ", {"CWD": str(tmp_path)}):
@@ -181,20 +396,20 @@ def test_sublang(locale: str, lang_src: str, lang_dst: str, tmp_path: Path) -> N
         assert source_dir == tmp_path / "data" / lang_dst / lang_src
 
         output_file = render.get_output_file(source_dir, snapshot)
-        assert output_file == source_dir / f"data-{snapshot}.json"
+        assert output_file == source_dir / f"data-{snapshot}.bin"
 
         with (
-            patch.object(render, "get_latest_json_file") as mocked_gljf,
+            patch.object(render, "get_latest_wikicode_file") as mocked_glwf,
             patch.object(render, "load") as mocked_l,
-            patch.object(render, "render") as mocked_r,
+            patch.object(render, "iter_render") as mocked_r,
             patch.object(render, "save") as mocked_s,
         ):
-            mocked_gljf.return_value = pages
-            mocked_l.return_value = words
+            mocked_glwf.return_value = pages
+            mocked_l.return_value.__enter__.return_value = words
             mocked_r.return_value = words
 
             render.main(locale, workers=1)
-            mocked_gljf.assert_called_once_with(source_dir)
+            mocked_glwf.assert_called_once_with(source_dir)
             mocked_l.assert_called_once_with(pages)
-            mocked_r.assert_called_once_with(words, locale, 1)
+            mocked_r.assert_called_once_with(words, locale, 1, profile=None)
             mocked_s.assert_called_once_with(output_file, words)
@@ -4,6 +4,7 @@
 import responses
 
 from wikidict import constants, utils
+from wikidict.lang import templates_multi
 
 
 @responses.activate
@@ -46,3 +47,73 @@ def test_convert_math_error(caplog: pytest.LogCaptureFixture) -> None:
     responses.add(responses.POST, constants.WIKIMEDIA_URL_MATH_CHECK.format(type="math"), status=404)
     utils.convert_math("bad formula", "word")
     assert caplog.records[0].getMessage() == "<math> ERROR with 'bad formula' in [word]"
+
+
+@pytest.mark.parametrize("locale", sorted(templates_multi))
+def test_get_templates_multi(locale: str) -> None:
+    compiled = utils.get_templates_multi(locale)
+    assert compiled.keys() == templates_multi[locale].keys()
+    assert utils.get_templates_multi(locale) is compiled
+
+
+def test_templates_cache() -> None:
+    cache = utils.TemplatesCache(2)
+    with patch.object(utils, "TEMPLATES_CACHE", cache):
+        all_templates: list[tuple[str, str, str]] = []
+        for word in ("chat", "chien"):
+            assert utils.transform(word, "lien|chat|fr", "fr", all_templates=all_templates) == "chat"
+        # The word is used by the template, it must not be cached
+        assert utils.transform("chat", "R:TLFi", "fr") != utils.transform("chien", "R:TLFi", "fr")
+        assert all_templates == [("lien", "chat", "check"), ("lien", "chien", "check")]
+        assert cache.pop_stats() == {("fr", "hits"): 1, ("fr", "misses"): 1}
+        assert list(cache.data) == [("fr", "lien|chat|fr")]
+
+        # Least recently used templates are evicted first
+        for template in ("lien|chien|fr", "lien|chat|fr", "lien|souris|fr"):
+            utils.transform("word", template, "fr")
+        assert list(cache.data) == [("fr", "lien|chat|fr"), ("fr", "lien|souris|fr")]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "no template",
+        "{{e}} et {{e}}",
+        "{{lien|{{e|s}}|fr}} {{term|{{lien|chat|fr}}}} {{fchim|OH|2|{{!}}OH|2}}",
+        "{{lien|{{e}}|fr}} {{lien|<sup>e</sup>|fr}}",
+        "{{{{}}}} {{}}",
+        "{{unknown|{{e}}}} {{e}}",
+        # Unbalanced braces
+        "{{lien|{chat}|fr}}",
+        "{{{lien|chat|fr}}}",
+        "{{e}}}} {{e",
+    ],
+)
+@pytest.mark.parametrize("variant_only", [False, True])
+def test_expand_templates(text: str, variant_only: bool) -> None:
+    expected_templates: list[tuple[str, str, str]] = []
+    expected = utils.expand_templates_iteratively(
+        "mot", text, "fr", all_templates=expected_templates, variant_only=variant_only
+    )
+    all_templates: list[tuple[str, str, str]] = []
+    assert utils.expand_templates("mot", text, "fr", all_templates=all_templates, variant_only=variant_only) == expected
+    assert all_templates == expected_templates
+
+
+def test_expand_templates_braces_in_output() -> None:
+    def transform(
+        word: str, template: str, locale: str, *, all_templates: list[tuple[str, str, str]], variant_only: bool
+    ) -> str:
+        all_templates.append((template, word, "check"))
+        return "{{e}}" if template == "a" else template.upper()
+
+    all_templates: list[tuple[str, str, str]] = []
+    with (
+        patch.object(utils, "transform", new=transform),
+        patch.object(utils, "expand_templates_iteratively", wraps=utils.expand_templates_iteratively) as fallback,
+    ):
+        assert utils.expand_templates("mot", "{{b|{{a}}}}", "fr", all_templates=all_templates) == "B|E"
+    # The expansion started over, templates are reported once
+    fallback.assert_called_once()
+    assert all_templates == [("a", "mot", "check"), ("e", "mot", "check"), ("b|E", "mot", "check")]
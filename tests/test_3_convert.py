@@ -1,14 +1,18 @@
 import os
+from copy import deepcopy
 from pathlib import Path
 from unittest.mock import patch
 from zipfile import ZipFile
 
 import pytest
+from jinja2 import Template
 from marisa_trie import Trie
 
+from tests.formatters import JINJA_TPL_DICTFILE, JINJA_TPL_KOBO, jinja_formatter
 from wikidict import constants, convert
 from wikidict.constants import ASSET_CHECKSUM_ALGO
-from wikidict.stubs import Variants, Word, Words
+from wikidict.store import DecodedStore, Store, StoreWriter
+from wikidict.stubs import ResolvedVariants, VariantIndex, Word
 
 EXPECTED_INSTALL_TXT_FR = """### 🌟 Afin d'être régulièrement mis à jour, ce projet a besoin de soutien ; [cliquez ici](https://github.com/BoboTiG/ebook-reader-dict/issues/2339) pour faire un don. 🌟
 
@@ -238,8 +242,8 @@ def test_simple() -> None:
         assert errors is None
 
 
-def test_no_json_file() -> None:
-    with patch.object(convert, "get_latest_json_file", return_value=None):
+def test_no_render_file() -> None:
+    with patch.object(convert, "get_latest_render_file", return_value=None):
         assert convert.main("fr") == 1
 
 
@@ -354,6 +358,26 @@ def test_word_rendering(
     assert content == expected
 
 
+@pytest.mark.parametrize("formatter", [convert.KoboFormat, convert.DictFileFormat])
+@pytest.mark.parametrize("include_etymology", [True, False])
+def test_word_rendering_shared_fragments(
+    formatter: type[convert.BaseFormat], include_etymology: bool, tmp_path: Path
+) -> None:
+    file = tmp_path / "fragments.bin"
+    convert.save_fragments(file, WORDS)
+    variants = convert.make_variants(WORDS)
+
+    with Store(file) as store:
+        fragments = DecodedStore(store, convert.decode_fragments)
+        assert sorted(fragments) == sorted(word for word, details in WORDS.items() if details.definitions)
+
+        args = ("fr", tmp_path, WORDS, variants, "20221212")
+        expected = formatter(*args, include_etymology=include_etymology)
+        cls = formatter(*args, include_etymology=include_etymology, fragments=fragments)
+        for word in WORDS:
+            assert list(cls.handle_word(word, WORDS)) == list(expected.handle_word(word, WORDS))
+
+
 WORDS_VARIANTS_FR = words = {
     "estre": Word(
         pronunciations=["\\ɛtʁ\\"],
@@ -413,6 +437,25 @@ def test_word_rendering(
 }
 
 
+@pytest.mark.parametrize(
+    "formatter, template",
+    [(convert.KoboFormat, JINJA_TPL_KOBO), (convert.DictFileFormat, JINJA_TPL_DICTFILE)],
+)
+@pytest.mark.parametrize("include_etymology", [True, False])
+def test_word_rendering_same_as_jinja(
+    formatter: type[convert.BaseFormat], template: Template, include_etymology: bool, tmp_path: Path
+) -> None:
+    with Store(Path(os.environ["CWD"]) / "data" / "fr" / "fr" / "data-20201217.bin") as store:
+        words_fr = dict(DecodedStore(store, convert.decode_word).items())
+
+    for words in [words_fr, WORDS, WORDS_VARIANTS_FR, WORDS_VARIANTS_ES, WORDS_VARIANTS_ES_2]:
+        args = ("fr", tmp_path, words, convert.make_variants(words), "20221212")
+        cls = formatter(*args, include_etymology=include_etymology)
+        expected = jinja_formatter(formatter, template)(*args, include_etymology=include_etymology)
+        for word in words:
+            assert "".join(cls.handle_word(word, words)) == "".join(expected.handle_word(word, words))
+
+
 def test_make_variants() -> None:
     assert convert.make_variants(WORDS_VARIANTS_FR) == {"suivre": ["suis"], "estre": ["suis"], "être": ["suis"]}
     assert convert.make_variants(WORDS_VARIANTS_ES) == {
@@ -422,15 +465,67 @@ def test_make_variants() -> None:
     }
 
 
+@pytest.mark.parametrize(
+    "words, expected",
+    [
+        # Variants with a different prefix are filtered out
+        (WORDS_VARIANTS_FR, {"suivre": ResolvedVariants(["suis"], ["suis"])}),
+        # Variants of empty variants, only 1 redirection
+        (WORDS_VARIANTS_ES, {"gastar": ResolvedVariants(["gastada", "gastado"], ["gastada", "gastado"])}),
+        # Duplicates
+        (WORDS_VARIANTS_ES_2, {"-fobo": ResolvedVariants(["-foba", "-fobas"], ["-foba", "-fobas"])}),
+    ],
+)
+def test_make_variant_index(words: dict[str, Word], expected: VariantIndex, tmp_path: Path) -> None:
+    variants = convert.make_variants(words)
+    assert convert.make_variant_index(words, variants) == expected
+
+    file = tmp_path / "variant-index.bin"
+    convert.save_variant_index(file, words, variants)
+    with Store(file) as store:
+        assert dict(DecodedStore(store, convert.decode_resolved_variants).items()) == expected
+
+
+def test_variant_index_resolved_on_first_use(tmp_path: Path) -> None:
+    words = WORDS_VARIANTS_FR
+    variants = convert.make_variants(words)
+    variant_index = convert.make_variant_index(words, variants)
+
+    with patch.object(convert, "make_variant_index", wraps=convert.make_variant_index) as mocked:
+        formatter = convert.KoboFormat("fr", tmp_path, words, variants, "20250322")
+        mocked.assert_not_called()
+        for word in words:
+            list(formatter.handle_word(word, words))
+        mocked.assert_called_once_with(words, variants)
+
+        # Mobi uses the shared index when words are not altered
+        mocked.reset_mock()
+        convert.run_mobi_formatter(
+            tmp_path, Path("data-20250322.bin"), "fr", words, variants, {}, variant_index=variant_index
+        )
+        mocked.assert_not_called()
+
+
+def test_resolve_variants_normalized() -> None:
+    words = {
+        "suivre": Word(pronunciations=[], genders=[], etymology=[], definitions={"Verbe": ["def"]}, variants=[]),
+        "suis": Word(pronunciations=[], genders=[], etymology=[], definitions={}, variants=["suivre"]),
+        "Suis ": Word(pronunciations=[], genders=[], etymology=[], definitions={}, variants=["suivre"]),
+    }
+    variants = convert.make_variants(words)
+    assert convert.resolve_variants("suivre", words, variants) == ResolvedVariants(["suis", "Suis "], ["suis"])
+    assert convert.resolve_variants("suis", words, variants) is None
+
+
 def test_kobo_format_variants_different_prefix(tmp_path: Path) -> None:
     words = WORDS_VARIANTS_FR
     variants = convert.make_variants(words)
     formatter = convert.KoboFormat("fr", tmp_path, words, variants, "20250322")
 
     assert formatter.make_groups(words) == {
-        "es": {"estre": words["estre"]},
-        "êt": {"être": words["être"]},
-        "su": {"suis": words["suis"], "suivre": words["suivre"]},
+        "es": ["estre"],
+        "êt": ["être"],
+        "su": ["suis", "suivre"],
     }
 
     estre = "".join(formatter.handle_word("estre", words))
@@ -452,14 +547,7 @@ def test_kobo_format_variants_empty_variant_level_1(tmp_path: Path) -> None:
     variants = convert.make_variants(words)
     formatter = convert.KoboFormat("es", tmp_path, words, variants, "20250322")
 
-    assert formatter.make_groups(words) == {
-        "ga": {
-            "gastada": words["gastada"],
-            "gastadan": words["gastadan"],
-            "gastado": words["gastado"],
-            "gastar": words["gastar"],
-        }
-    }
+    assert formatter.make_groups(words) == {"ga": ["gastadan", "gastada", "gastado", "gastar"]}
 
     gastadan = "".join(formatter.handle_word("gastadan", words))
     gastada = "".join(formatter.handle_word("gastada", words))
@@ -471,18 +559,54 @@ def test_kobo_format_variants_empty_variant_level_1(tmp_path: Path) -> None:
     assert '<var><variant name="gastada"/><variant name="gastado"/></var>' in gastar
 
 
+@pytest.mark.parametrize(
+    "formatter, words, expected",
+    [
+        (
+            convert.KoboFormat,
+            WORDS_VARIANTS_ES,
+            "<w><p><a name=\"gastar\" /><b>gastar</b><br/><br/><b>Verb</b><ol><li>Definition of 'gastar'.</li></ol></p>"
+            '<var><variant name="gastada"/><variant name="gastado"/></var></w>\n',
+        ),
+        (
+            convert.DictFileFormat,
+            WORDS_VARIANTS_ES,
+            "@ gastar\n& gastada\n& gastado\n<html><p><b>Verb</b></p><ol><li>Definition of 'gastar'.</li></ol></html>\n\n",
+        ),
+        (
+            convert.KoboFormat,
+            WORDS_VARIANTS_ES_2,
+            '<w><p><a name="-fobo" /><b>-fobo</b><br/><br/><b>Suffix</b><ol><li>-phobe</li><li>-phobic</li></ol></p>'
+            '<var><variant name="-foba"/><variant name="-fobas"/></var></w>\n',
+        ),
+        (
+            convert.DictFileFormat,
+            WORDS_VARIANTS_ES_2,
+            "@ -fobo\n& -foba\n& -fobas\n<html><p><b>Suffix</b></p><ol><li>-phobe</li><li>-phobic</li></ol></html>\n\n",
+        ),
+    ],
+)
+def test_handle_word_does_not_alter_words(
+    formatter: type[convert.BaseFormat], words: dict[str, Word], expected: str, tmp_path: Path
+) -> None:
+    variants = convert.make_variants(words)
+    expected_words, expected_variants = deepcopy(words), deepcopy(variants)
+    cls = formatter("es", tmp_path, words, variants, "20250322")
+
+    # Rendered twice: the output must not depend on previous calls
+    for _ in range(2):
+        assert "".join(html for word in words for html in cls.handle_word(word, words)) == expected
+
+    assert words == expected_words
+    assert variants == expected_variants
+
+
 def test_kobo_format_variants_duplicates(tmp_path: Path) -> None:
     words = WORDS_VARIANTS_ES_2
     variants = convert.make_variants(words)
     formatter = convert.KoboFormat("es", tmp_path, words, variants, "20250702")
 
-    assert formatter.make_groups(words) == {
-        "11": {
-            "-foba": words["-foba"],
-            "-fobas": words["-fobas"],
-            "-fobo": words["-fobo"],
-        }
-    }
+    assert formatter.make_groups(words) == {"11": ["-foba", "-fobas", "-fobo"]}
 
     foba = "".join(formatter.handle_word("-foba", words))
     fobas = "".join(formatter.handle_word("-fobas", words))
@@ -577,32 +701,62 @@ def test_df_format_variants_empty_variant_level_1(tmp_path: Path) -> None:
 )
 def test_sublang(locale: str, lang_src: str, lang_dst: str, tmp_path: Path) -> None:
     snapshot = "20250401"
-    pages = Path(f"data-{snapshot}.json")
-    words: Words = {}
-    variants: Variants = {}
+    pages = tmp_path / f"data-{snapshot}.bin"
+    StoreWriter(pages).close()
 
     with (
         patch.dict("os.environ", {"CWD": str(tmp_path)}),
-        patch.object(convert, "get_latest_json_file") as mocked_gljf,
-        patch.object(convert, "load") as mocked_l,
+        patch.object(convert, "get_latest_render_file") as mocked_gljf,
         patch.object(convert, "make_variants") as mocked_mv,
         patch.object(convert, "distribute_workload") as mocked_dw,
         patch.object(convert, "run_mobi_formatter") as mocked_rmf,
     ):
         mocked_gljf.return_value = pages
-        mocked_l.return_value = words
-        mocked_mv.return_value = variants
+        mocked_mv.return_value = {}
         source_dir = tmp_path / "data" / lang_dst / lang_src
 
         convert.main(locale)
         mocked_gljf.assert_called_once_with(source_dir)
-        mocked_l.assert_called_once_with(pages)
-        mocked_mv.assert_called_once_with(words)
-
-        args = (source_dir / "output", pages, locale, words, variants)
+        mocked_mv.assert_called_once()
+
+        # Words, variants, and fragments, are read from store files, only their paths are given to formatters
+        output_dir = source_dir / "output"
+        words = mocked_mv.call_args.args[0]
+        variants, fragments = mocked_rmf.call_args.args[4:6]
+        variant_index = mocked_dw.call_args.kwargs["variant_index"]
+        assert isinstance(words, DecodedStore)
+        assert words.store.file == pages
+        assert isinstance(variants, DecodedStore)
+        assert variants.store.file == output_dir / "variants.bin"
+        assert not variants.store.file.exists()
+        assert isinstance(fragments, DecodedStore)
+        assert fragments.store.file == output_dir / "fragments.bin"
+        assert not fragments.store.file.exists()
+        assert isinstance(variant_index, DecodedStore)
+        assert variant_index.store.file == output_dir / "variant-index.bin"
+        assert not variant_index.store.file.exists()
+
+        args = (output_dir, pages, locale, words, variants, fragments)
         for include_etymology in [False, True]:
-            mocked_dw.assert_any_call(convert.get_primary_formatters(), *args, include_etymology=include_etymology)
-            mocked_dw.assert_any_call(convert.get_secondary_formatters(), *args, include_etymology=False)
-            mocked_rmf.assert_any_call(*args, include_etymology=False)
+            for formatters in [convert.get_primary_formatters(), convert.get_secondary_formatters()]:
+                mocked_dw.assert_any_call(
+                    formatters, *args, include_etymology=include_etymology, variant_index=variant_index
+                )
+            mocked_rmf.assert_any_call(*args, include_etymology=include_etymology, variant_index=variant_index)
         assert mocked_dw.call_count == 4
         assert mocked_rmf.call_count == 2
+
+
+def test_intermediate_files_removed_on_error(tmp_path: Path) -> None:
+    pages = tmp_path / "data-20250401.bin"
+    StoreWriter(pages).close()
+
+    with (
+        patch.dict("os.environ", {"CWD": str(tmp_path)}),
+        patch.object(convert, "get_latest_render_file", return_value=pages),
+        patch.object(convert, "distribute_workload", side_effect=ValueError),
+        pytest.raises(ValueError),
+    ):
+        convert.main("fr")
+
+    assert not list((tmp_path / "data" / "fr" / "fr" / "output").iterdir())
@@ -2,6 +2,7 @@
 from unittest.mock import patch
 
 from wikidict import check_word, check_words, render
+from wikidict.store import StoreWriter
 
 
 def test_errors() -> None:
@@ -17,14 +18,15 @@ def test_simple() -> None:
 
 
 def test_get_words_to_tackle_no_json_file() -> None:
-    with patch.object(render, "get_latest_json_file", return_value=None):
+    with patch.object(render, "get_latest_wikicode_file", return_value=None):
         assert not check_words.get_words_to_tackle("fr", count=1, is_random=True)
 
 
 def test_get_words_to_tackle_all(tmp_path: Path) -> None:
-    file = tmp_path / "test.json"
-    file.write_text('{"base":""}')
-    with patch.object(render, "get_latest_json_file", return_value=file):
+    file = tmp_path / "test.bin"
+    with StoreWriter(file) as writer:
+        writer.add("base", "")
+    with patch.object(render, "get_latest_wikicode_file", return_value=file):
         assert check_words.get_words_to_tackle("fr", count=-1) == ["base"]
 
 
@@ -4,9 +4,9 @@
 Usage:
     wikidict LOCALE
     wikidict LOCALE -h, --help
-    wikidict LOCALE --download
-    wikidict LOCALE --parse
-    wikidict LOCALE --render [--workers=N]
+    wikidict LOCALE --download [--stream] [--workers=N]
+    wikidict LOCALE --parse [--stream] [--workers=N] [--incremental]
+    wikidict LOCALE --render [--workers=N] [--incremental] [--profile]
     wikidict LOCALE --convert
     wikidict LOCALE --check-words [--random] [--count=N] [--offset=M] [--input=FILENAME]
     wikidict LOCALE --check-word=WORD
@@ -17,10 +17,21 @@
 
 Options:
   --download                Retrieve the latest Wiktionary dump into "data/$LOCALE/pages-$DATE.xml".
-  --parse                   Parse and store raw Wiktionary data into "data/$LOCALE/data_wikicode-$DATE.json".
-  --render                  Render templates from raw data into "data/$LOCALE/data-$DATE.json".
+                            --stream            Keep the dump compressed into "data/$LOCALE/pages-$DATE.xml.bz2",
+                                                and do not write the uncompressed XML file.
+                            --workers=N         Decompress the dump in parallel with N multiprocessing workers,
+                                                defaults to 1 (no multiprocessing).
+  --parse                   Parse and store raw Wiktionary data into "data/$LOCALE/data_wikicode-$DATE.bin".
+                            --stream            Decompress the BZ2 dump on-the-fly instead of reading the XML file.
+                            --workers=N         Parse the dump in parallel with N multiprocessing workers,
+                                                defaults to 1 (no multiprocessing).
+                            --incremental       Reuse pages from the previous snapshot when their revision did not change.
+  --render                  Render templates from raw data into "data/$LOCALE/data-$DATE.bin".
                             --workers=N         Set the number of multiprocessing workers,
                                                 defaults to the number of CPU in the system.
+                            --incremental       Only render words whose Wikicode changed since the previous run.
+                            --profile           Report the slowest words, templates, and template handlers, into
+                                                "data/$LOCALE/render-profile-$DATE.json" (and ".txt").
   --convert                 Convert rendered data to working dictionaries into several files:
                                 - "data/$LOCALE/dict-$LOCALE-$LOCALE.df.bz2": DictFile format.
                                 - "data/$LOCALE/dict-$LOCALE-$LOCALE.mobi": Kindle format.
@@ -60,17 +71,27 @@ def main() -> int:
     if args["--download"]:
         from . import download
 
-        return download.main(args["LOCALE"])
+        return download.main(args["LOCALE"], stream=args["--stream"], workers=int(args.get("--workers") or 1))
 
     if args["--parse"]:
         from . import parse
 
-        return parse.main(args["LOCALE"])
+        return parse.main(
+            args["LOCALE"],
+            stream=args["--stream"],
+            workers=int(args.get("--workers") or 1),
+            incremental=args["--incremental"],
+        )
 
     if args["--render"]:
         from . import render
 
-        return render.main(args["LOCALE"], workers=int(args.get("--workers") or 0))
+        return render.main(
+            args["LOCALE"],
+            workers=int(args.get("--workers") or 0),
+            incremental=args["--incremental"],
+            profile=args["--profile"],
+        )
 
     if args["--convert"]:
         from . import convert
@@ -35,12 +35,13 @@ def get_words_to_tackle(
     else:
         lang_src, lang_dst = utils.guess_locales(locale)
         source_dir = render.get_source_dir(lang_src, lang_dst)
-        if not (file := render.get_latest_json_file(source_dir)):
+        if not (file := render.get_latest_wikicode_file(source_dir)):
             log.error("No dump found. Run with --parse first ... ")
             return []
 
         log.info("Loading %s ...", file)
-        words = list(render.load(file).keys())
+        with render.load(file) as all_words:
+            words = list(all_words)
 
     if count == -1:
         count = len(words)
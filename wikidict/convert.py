@@ -11,140 +11,37 @@
 import multiprocessing
 import os
 import shutil
-from collections import defaultdict
-from copy import deepcopy
+from collections import ChainMap, defaultdict
 from datetime import date, timedelta
-from functools import partial
+from functools import cached_property, partial
+from itertools import chain
 from pathlib import Path
 from time import monotonic
 from typing import TYPE_CHECKING
 from zipfile import ZIP_DEFLATED, ZipFile
 
-from jinja2 import Template
 from marisa_trie import Trie
 from pyglossary.glossary_v2 import ConvertArgs, Glossary
 
 from . import constants, lang, render, user_functions, utils
-from .stubs import Word
+from .store import DecodedStore, Store, StoreWriter
+from .stubs import Fragments, ResolvedVariants, Word
 
 if TYPE_CHECKING:
-    from collections.abc import Generator
+    from collections.abc import Generator, Iterable
     from typing import Any
 
-    from .stubs import Groups, Variants, Words
-
-# Kobo-related dictionaries
-# Note: We cannot remove the space before the slash in `<a name="{{ word }}" />` because
-#       the Kobo lookup regexp for Japanese words is `(<a name="WORD" />.*</w>)`.
-WORD_TPL_KOBO = Template(
-    """\
-<w><p><a name="{{ word }}" /><b>{{ current_word }}</b>{{ pronunciation }}{{ gender }}<br/><br/>
-{%- for pos, pos_definitions in definitions -%}
-    <b>{{ pos }}</b><ol>
-    {%- for definition in pos_definitions -%}
-        {%- if definition is string -%}
-            <li>{{ definition }}</li>
-        {%- else -%}
-            <ol style="list-style-type:lower-alpha">
-            {%- for sub_def in definition -%}
-                {%- if sub_def is string -%}
-                    <li>{{ sub_def }}</li>
-                {%- else -%}
-                    <ol style="list-style-type:lower-roman">
-                        {%- for sub_sub_def in sub_def -%}
-                            <li>{{ sub_sub_def }}</li>
-                        {%- endfor -%}
-                    </ol>
-                {%- endif -%}
-            {%- endfor -%}
-            </ol>
-        {%- endif -%}
-    {%- endfor -%}
-    </ol>
-{%- endfor -%}
-{%- if etymologies -%}
-    {%- for etymology in etymologies -%}
-        {%- if etymology is string -%}
-            <p>{{ etymology }}</p>
-        {%- else -%}
-            <ol>
-            {%- for sub_etymology in etymology -%}
-                <li>{{ sub_etymology }}</li>
-            {%- endfor -%}
-            </ol>
-        {%- endif -%}
-    {%- endfor -%}
-    <br/>
-{%- endif -%}
-</p>
-{%- if variants -%}
-    <var>
-    {%- for variant in variants -%}
-        <variant name="{{ variant }}"/>
-    {%- endfor -%}
-    </var>
-{%- endif -%}
-</w>
-""",
-    trim_blocks=True,
-    lstrip_blocks=True,
-    keep_trailing_newline=True,
-)
-
-# DictFile-related dictionaries
-# Source: https://pgaskin.net/dictutil/dictgen/#dictfile-format
-# Source: https://github.com/hunspell/hunspell/blob/ecc6dbb52025bdf3a766429988e64190d912765f/man/hunspell.1#L93-L139 (for later, in case of issues with other sub-formats)
-WORD_TPL_DICTFILE = Template(
-    """\
-@ {{ word }}
-{%- if current_word or pronunciation or gender %}
-: {%- if current_word %} <b>{{ current_word }}</b>{%- endif -%}{{ pronunciation }}{{ gender }}
-{%- endif %}
-{%- for variant in variants %}
-& {{ variant }}
-{%- endfor %}
-<html>
-{%- for pos, pos_definitions in definitions -%}
-    <p><b>{{ pos }}</b></p><ol>
-    {%- for definition in pos_definitions -%}
-        {%- if definition is string -%}
-            <li>{{ definition }}</li>
-        {%- else -%}
-            <ol style="list-style-type:lower-alpha">
-                {%- for sub_def in definition -%}
-                    {%- if sub_def is string -%}
-                        <li>{{ sub_def }}</li>
-                    {%- else -%}
-                        <ol style="list-style-type:lower-roman">
-                            {%- for sub_sub_def in sub_def -%}
-                                <li>{{ sub_sub_def }}</li>
-                            {%- endfor -%}
-                        </ol>
-                    {%- endif -%}
-                {%- endfor -%}
-            </ol>
-        {%- endif -%}
-    {%- endfor -%}
-    </ol>
-{%- endfor -%}
-{%- if etymologies -%}
-    {%- for etymology in etymologies -%}
-        {%- if etymology is string -%}
-            <p>{{ etymology }}</p>
-        {%- else -%}
-            <ol>
-                {%- for sub_etymology in etymology -%}
-                    <li>{{ sub_etymology }}</li>
-                {%- endfor -%}
-            </ol>
-        {%- endif -%}
-    {%- endfor -%}
-    <br/>
-{%- endif -%}</html>
-
-
-"""
-)
+    from .stubs import (
+        Definition,
+        FragmentsMapping,
+        Groups,
+        VariantIndex,
+        VariantIndexMapping,
+        Variants,
+        VariantsMapping,
+        Words,
+        WordsMapping,
+    )
 
 # Threshold before issuing a warning to catch potentially problematic variants
 MAX_VARIANTS = 128
@@ -155,22 +52,24 @@
 class BaseFormat:
     """Base class for all dictionaries."""
 
-    template = Template("")  # To be set by subclasses
-
     def __init__(
         self,
         locale: str,
         output_dir: Path,
-        words: Words,
-        variants: Variants,
+        words: WordsMapping,
+        variants: VariantsMapping,
         snapshot: str,
         *,
         include_etymology: bool = True,
+        fragments: FragmentsMapping | None = None,
+        variant_index: VariantIndexMapping | None = None,
     ) -> None:
         self.lang_src, self.lang_dst = utils.guess_locales(locale)
         self.output_dir = output_dir
         self.words = words
         self.variants = variants
+        self.fragments = fragments if fragments is not None else {}
+        self._variant_index = variant_index
         self.snapshot = snapshot
         self.include_etymology = include_etymology
         self.start = monotonic()
@@ -186,6 +85,13 @@ def __init__(
             f"{len(variants):,}",
         )
 
+    @cached_property
+    def variant_index(self) -> VariantIndexMapping:
+        """Variants resolved once for all formatters, or resolved on first use when they were not shared."""
+        if self._variant_index is not None:
+            return self._variant_index
+        return make_variant_index(self.words, self.variants)
+
     @property
     def description(self) -> str:
         return lang.wiktionary[self.lang_src].format(year=date.today().year)
@@ -205,8 +111,9 @@ def dictionary_file(self, output_file: str) -> Path:
             etym_suffix="" if self.include_etymology else constants.NO_ETYMOLOGY_SUFFIX,
         )
 
-    def handle_word(self, word: str, words: Words) -> Generator[str]:
-        details = deepcopy(words[word])
+    def handle_word(self, word: str, words: WordsMapping) -> Generator[str]:
+        # Details, and variants, are shared by all words: they must not be altered
+        details = words[word]
         current_words = {word: details}
         guess_prefix = utils.guess_prefix
         word_group_prefix = guess_prefix(word)
@@ -226,58 +133,52 @@ def handle_word(self, word: str, words: Words) -> Generator[str]:
             if not current_details.definitions:
                 continue
 
-            all_variants = self.variants
-            if variants := deepcopy(all_variants.get(current_word, [])):
-                # Add variants of empty* variant, only 1 redirection:
-                #   [ES] gastada* -> gastado* -> gastar --> (gastada, gastado) -> gastar
-                # Note: the process works backward: from gastar up to gastado up to gastada.
-                for variant in [*variants]:
-                    if (
-                        (wv := words.get(variant))
-                        and not wv.definitions
-                        and (new_variants := all_variants.get(variant))
-                    ):
-                        variants.extend(new_variants)
-
-                # Filter out variants:
-                #   - variants being identical to the word (it happens when altering `current_words`, cf [***])
-                #   - with a different prefix that their word
-                current_word_group_prefix = guess_prefix(current_word)
-                variants = [
-                    variant
-                    for variant in variants
-                    if variant != word
-                    and variant != current_word
-                    and guess_prefix(variant) == current_word_group_prefix
-                ]
-
-                if isinstance(self, KoboFormat):
-                    # Variant must be normalized by trimming whitespace and lowercasing it
-                    variants = [variant.lower().strip() for variant in variants]
-
-                if len(variants := list(set(variants))) > MAX_VARIANTS:
-                    log.warning("Word %r has too many variants (%d): %r", current_word, len(variants), variants)
+            variants: list[str] = []
+            normalized_variants: list[str] = []
+            if resolved := self.variant_index.get(current_word):
+                variants, normalized_variants = resolved
+                if word != current_word and word in variants:
+                    # Filter out the word itself, it happens when altering `current_words`, cf [***]
+                    variants = [variant for variant in variants if variant != word]
+                    normalized_variants = normalize_variants(variants)
 
+            fragments = self.get_fragments(current_word, current_details)
             yield self.render_word(
-                self.template,
                 word=word,
                 current_word=(current_word if isinstance(self, KoboFormat) or current_word != word else ""),
-                definitions=current_details.definitions.items(),
-                pronunciation=utils.convert_pronunciation(current_details.pronunciations)
-                if current_details.pronunciations
-                else "",
-                gender=utils.convert_gender(current_details.genders) if current_details.genders else "",
-                etymologies=current_details.etymology if self.include_etymology else [],
-                variants=sorted(variants, key=lambda s: (len(s), s)) if variants else [],
+                definitions=fragments.definitions,
+                pronunciation=fragments.pronunciation,
+                gender=fragments.gender,
+                etymologies=fragments.etymology if self.include_etymology else "",
+                variants=normalized_variants if isinstance(self, KoboFormat) else variants,
             )
 
+    def get_fragments(self, word: str, details: Word) -> Fragments:
+        """Return fragments of *word*, rendering them when they were not shared with the formatter."""
+        if (fragments := self.fragments.get(word)) is None:
+            fragments = render_fragments(details)
+        return fragments
+
     def process(self) -> None:
         raise NotImplementedError()
 
-    def render_word(self, template: Template, **kwargs: Any) -> str:
+    def format_word(
+        self,
+        *,
+        word: str,
+        current_word: str,
+        pronunciation: str,
+        gender: str,
+        definitions: list[tuple[str, str]],
+        etymologies: str,
+        variants: list[str],
+    ) -> str:
+        raise NotImplementedError()
+
+    def render_word(self, **kwargs: Any) -> str:
         self.variants_count += len(kwargs["variants"])
         self.words_count += 1
-        return template.render(**kwargs)
+        return self.format_word(**kwargs)
 
     def compute_checksum(self, file: Path) -> None:
         checksum = hashlib.new(constants.ASSET_CHECKSUM_ALGO, file.read_bytes()).hexdigest()
@@ -318,12 +219,34 @@ class KoboFormat(BaseFormat):
 
     add_install = True
     output_file = "dicthtml-{lang_src}-{lang_dst}{etym_suffix}.zip"
-    template = WORD_TPL_KOBO
 
     def process(self) -> None:
         self.groups = self.make_groups(self.words)
         self.save()
 
+    def format_word(
+        self,
+        *,
+        word: str,
+        current_word: str,
+        pronunciation: str,
+        gender: str,
+        definitions: list[tuple[str, str]],
+        etymologies: str,
+        variants: list[str],
+    ) -> str:
+        # Note: We cannot remove the space before the slash in `<a name="WORD" />` because
+        #       the Kobo lookup regexp for Japanese words is `(<a name="WORD" />.*</w>)`.
+        html = [f'<w><p><a name="{word}" /><b>{current_word}</b>{pronunciation}{gender}<br/><br/>']
+        html.extend(f"<b>{pos}</b>{pos_definitions}" for pos, pos_definitions in definitions)
+        html.append(f"{etymologies}</p>")
+        if variants:
+            html.append("<var>")
+            html.extend(f'<variant name="{variant}"/>' for variant in variants)
+            html.append("</var>")
+        html.append("</w>\n")
+        return "".join(html)
+
     def sanitize(self, content: str) -> str:
         """Sanitize the INSTALL.txt file content."""
         content = content.replace(":arrow_right:", "->")
@@ -349,11 +272,11 @@ def craft_index(wordlist: list[str], output_dir: Path) -> Path:
         return output
 
     @staticmethod
-    def make_groups(words: Words) -> Groups:
-        """Group word by prefix."""
-        groups: Groups = defaultdict(dict)
-        for word, details in words.items():
-            groups[utils.guess_prefix(word)][word] = details
+    def make_groups(words: WordsMapping) -> Groups:
+        """Group words by prefix, only words are kept: details are read when rendering words."""
+        groups: Groups = defaultdict(list)
+        for word in words:
+            groups[utils.guess_prefix(word)].append(word)
         return groups
 
     def save(self) -> None:  # sourcery skip: extract-method
@@ -381,7 +304,7 @@ def save(self) -> None:  # sourcery skip: extract-method
         for prefix, words in self.groups.items():
             if html := self.save_html(prefix, words, tmp_dir):
                 to_compress.append(html)
-            wordlist.extend(words.keys())
+            wordlist.extend(words)
 
         # Then create the special "words" file
         to_compress.append(self.craft_index(wordlist, tmp_dir))
@@ -412,7 +335,7 @@ def save(self) -> None:  # sourcery skip: extract-method
 
         self.summary(final_file)
 
-    def save_html(self, name: str, words: Words, output_dir: Path) -> Path | None:
+    def save_html(self, name: str, words: list[str], output_dir: Path) -> Path | None:
         """Generate individual HTML files.
 
         Content of the HTML file:
@@ -442,7 +365,30 @@ class DictFileFormat(BaseFormat):
     """Save the data into a *.df* DictFile."""
 
     output_file = "dict-{lang_src}-{lang_dst}{etym_suffix}.df"
-    template = WORD_TPL_DICTFILE
+
+    def format_word(
+        self,
+        *,
+        word: str,
+        current_word: str,
+        pronunciation: str,
+        gender: str,
+        definitions: list[tuple[str, str]],
+        etymologies: str,
+        variants: list[str],
+    ) -> str:
+        # Source: https://pgaskin.net/dictutil/dictgen/#dictfile-format
+        # Source: https://github.com/hunspell/hunspell/blob/ecc6dbb52025bdf3a766429988e64190d912765f/man/hunspell.1#L93-L139 (for later, in case of issues with other sub-formats)
+        html = [f"@ {word}"]
+        if current_word or pronunciation or gender:
+            html.append(
+                f"\n: <b>{current_word}</b>{pronunciation}{gender}" if current_word else f"\n:{pronunciation}{gender}"
+            )
+        html.extend(f"\n& {variant}" for variant in variants)
+        html.append("\n<html>")
+        html.extend(f"<p><b>{pos}</b></p>{pos_definitions}" for pos, pos_definitions in definitions)
+        html.append(f"{etymologies}</html>\n\n")
+        return "".join(html)
 
     def get_glossary_lang_dst(self) -> str:
         return self.lang_dst
@@ -654,10 +600,12 @@ def run_mobi_formatter(
     output_dir: Path,
     file: Path,
     locale: str,
-    words: Words,
-    variants: Variants,
+    words: WordsMapping,
+    variants: VariantsMapping,
+    fragments: FragmentsMapping,
     *,
     include_etymology: bool = True,
+    variant_index: VariantIndexMapping | None = None,
 ) -> None:
     """Mobi formatter.
 
@@ -679,18 +627,24 @@ def all_chars(word: str, details: Word) -> set[str]:
                 chars.update(user_functions.flatten(etymology))
         return chars
 
+    # Words are altered below, work on a copy
+    mobi_words: Words = dict(words.items())
+    # Fragments of truncated words
+    truncated_fragments: dict[str, Fragments] = {}
+
     stats = defaultdict(list)
-    for word, details in words.copy().items():
+    for word, details in mobi_words.copy().items():
         if len(word) > 127:
             log.info("[Mobi %s] Truncated word too long: %r", locale.upper(), word)
             truncated = word[:127]
-            words[truncated] = words.pop(word)
+            mobi_words[truncated] = mobi_words.pop(word)
+            truncated_fragments[truncated] = render_fragments(details)
             word = truncated
         for char in all_chars(word, details):
             stats[char].append(word)
 
     if utils.guess_lang_origin(locale) in {"en", "fr"} and len(stats) > 256:
-        new_words = words.copy()
+        new_words = mobi_words.copy()
         threshold = 1
         while len(stats) > 256:
             log.info(
@@ -711,22 +665,32 @@ def all_chars(word: str, details: Word) -> set[str]:
         log.info(
             "[Mobi %s] Removed %s words from .mobi (total words count is %s, unique characters count is %d)",
             locale.upper(),
-            f"{len(words) - len(new_words):,}",
+            f"{len(mobi_words) - len(new_words):,}",
             f"{len(new_words):,}",
             len(stats),
         )
-        words = new_words
-        variants = make_variants(words)
+        mobi_words = new_words
+        variants = make_variants(mobi_words)
+        # Variants will be resolved again, for remaining words
+        variant_index = None
     else:
         log.info(
             "[Mobi %s] Untouched words for .mobi (total words count is %s, unique characters count is %d)",
             locale.upper(),
-            f"{len(words):,}",
+            f"{len(mobi_words):,}",
             len(stats),
         )
 
-    args = (locale, output_dir, words, variants, file.stem.split("-")[-1])
-    run_formatter(DictFileFormatForMobi, *args, include_etymology=include_etymology)
+    args = (locale, output_dir, mobi_words, variants, file.stem.split("-")[-1])
+    # Only the first mapping is altered by a ChainMap, shared fragments are left untouched
+    mobi_fragments = ChainMap(truncated_fragments, fragments)  # type: ignore[arg-type]
+    run_formatter(
+        DictFileFormatForMobi,
+        *args,
+        include_etymology=include_etymology,
+        fragments=mobi_fragments,
+        variant_index=variant_index,
+    )
     try:
         run_formatter(MobiFormat, *args, include_etymology=include_etymology)
     except Exception:
@@ -737,11 +701,13 @@ def run_formatter(
     cls: type[BaseFormat],
     locale: str,
     output_dir: Path,
-    words: Words,
-    variants: Variants,
+    words: WordsMapping,
+    variants: VariantsMapping,
     snapshot: str,
     *,
     include_etymology: bool = True,
+    fragments: FragmentsMapping | None = None,
+    variant_index: VariantIndexMapping | None = None,
 ) -> None:
     formatter = cls(
         locale,
@@ -750,20 +716,31 @@ def run_formatter(
         variants,
         snapshot,
         include_etymology=include_etymology,
+        fragments=fragments,
+        variant_index=variant_index,
     )
     formatter.process()
 
 
+def decode_word(value: str) -> Word:
+    return Word(*json.loads(value))
+
+
 def load(file: Path) -> Words:
-    """Load the big JSON file containing all words and their details."""
+    """Load the store file containing all words and their details."""
     log.info("Loading %s ...", file)
-    with file.open(encoding="utf-8") as fh:
-        words: Words = {key: Word(*values) for key, values in json.load(fh).items()}
+    with Store(file) as store:
+        words: Words = dict(DecodedStore(store, decode_word).items())
     log.info("Loaded %s words from %s", f"{len(words):,}", file)
     return words
 
 
-def make_variants(words: Words) -> Variants:
+def save_variants(file: Path, variants: Variants) -> None:
+    with StoreWriter(file) as writer:
+        writer.update((variant, json.dumps(words, ensure_ascii=False)) for variant, words in variants.items())
+
+
+def make_variants(words: WordsMapping) -> Variants:
     """Group word by variant."""
     log.info("Creating variants ...")
     variants: Variants = defaultdict(list)
@@ -774,15 +751,162 @@ def make_variants(words: Words) -> Variants:
     return variants
 
 
+def sort_variants(variants: Iterable[str]) -> list[str]:
+    """Return unique *variants*, shortest first.
+
+    >>> sort_variants(["suivis", "suis", "suit", "suis"])
+    ['suis', 'suit', 'suivis']
+    """
+    return sorted(set(variants), key=lambda s: (len(s), s))
+
+
+def normalize_variants(variants: Iterable[str]) -> list[str]:
+    """Return unique *variants* normalized by trimming whitespace, and lowercasing them (Kobo), shortest first.
+
+    >>> normalize_variants(["Suis", "suis ", "suivis"])
+    ['suis', 'suivis']
+    """
+    return sort_variants(variant.lower().strip() for variant in variants)
+
+
+def resolve_variants(word: str, words: WordsMapping, variants: VariantsMapping) -> ResolvedVariants | None:
+    """Resolve variants of *word*, return None when it has none."""
+    if not (word_variants := variants.get(word)):
+        return None
+
+    # Add variants of empty* variant, only 1 redirection:
+    #   [ES] gastada* -> gastado* -> gastar --> (gastada, gastado) -> gastar
+    # Note: the process works backward: from gastar up to gastado up to gastada.
+    redirections = [
+        new_variants
+        for variant in word_variants
+        if (wv := words.get(variant)) and not wv.definitions and (new_variants := variants.get(variant))
+    ]
+
+    # Filter out variants:
+    #   - variants being identical to the word
+    #   - with a different prefix that their word
+    guess_prefix = utils.guess_prefix
+    word_group_prefix = guess_prefix(word)
+    resolved = sort_variants(
+        variant
+        for variant in chain(word_variants, *redirections)
+        if variant != word and guess_prefix(variant) == word_group_prefix
+    )
+    if not resolved:
+        return None
+
+    if len(resolved) > MAX_VARIANTS:
+        log.warning("Word %r has too many variants (%d): %r", word, len(resolved), resolved)
+    return ResolvedVariants(resolved, normalize_variants(resolved))
+
+
+def iter_variant_index(words: WordsMapping, variants: VariantsMapping) -> Generator[tuple[str, ResolvedVariants]]:
+    for word, details in words.items():
+        if details.definitions and (resolved := resolve_variants(word, words, variants)):
+            yield word, resolved
+
+
+def make_variant_index(words: WordsMapping, variants: VariantsMapping) -> VariantIndex:
+    """Resolve variants of all words having definitions (the other ones are not part of dictionaries)."""
+    return dict(iter_variant_index(words, variants))
+
+
+def decode_resolved_variants(value: str) -> ResolvedVariants:
+    return ResolvedVariants(*json.loads(value))
+
+
+def save_variant_index(file: Path, words: WordsMapping, variants: VariantsMapping) -> None:
+    """Like `make_variant_index()`, but the index is written into a store file."""
+    log.info("Resolving variants ...")
+    with StoreWriter(file) as writer:
+        writer.update(
+            (word, json.dumps(resolved, ensure_ascii=False)) for word, resolved in iter_variant_index(words, variants)
+        )
+        count = len(writer)
+    log.info("Resolved variants of %s words", f"{count:,}")
+
+
+def render_definitions(definitions: list[Definition]) -> str:
+    """Render definitions of a part of speech as HTML lists, sub-definitions being nested lists.
+
+    >>> render_definitions(["def 1", ("sdef 1", ("ssdef 1",))])
+    '<ol><li>def 1</li><ol style="list-style-type:lower-alpha"><li>sdef 1</li><ol style="list-style-type:lower-roman"><li>ssdef 1</li></ol></ol></ol>'
+    """
+    html = ["<ol>"]
+    for definition in definitions:
+        if isinstance(definition, str):
+            html.append(f"<li>{definition}</li>")
+            continue
+        html.append('<ol style="list-style-type:lower-alpha">')
+        for sub_def in definition:
+            if isinstance(sub_def, str):
+                html.append(f"<li>{sub_def}</li>")
+            else:
+                html.append('<ol style="list-style-type:lower-roman">')
+                html.extend(f"<li>{sub_sub_def}</li>" for sub_sub_def in sub_def)
+                html.append("</ol>")
+        html.append("</ol>")
+    html.append("</ol>")
+    return "".join(html)
+
+
+def render_etymologies(etymologies: list[Definition]) -> str:
+    """Render etymologies as HTML paragraphs, sub-etymologies being lists.
+
+    >>> render_etymologies(["etyl 1", ("setyl 1",)])
+    '<p>etyl 1</p><ol><li>setyl 1</li></ol><br/>'
+    """
+    html = []
+    for etymology in etymologies:
+        if isinstance(etymology, str):
+            html.append(f"<p>{etymology}</p>")
+        else:
+            html.append("<ol>")
+            html.extend(f"<li>{sub_etymology}</li>" for sub_etymology in etymology)
+            html.append("</ol>")
+    html.append("<br/>")
+    return "".join(html)
+
+
+def render_fragments(details: Word) -> Fragments:
+    """Render the HTML of *details* that is common to all formatters, and to both etymology modes."""
+    return Fragments(
+        utils.convert_pronunciation(details.pronunciations) if details.pronunciations else "",
+        utils.convert_gender(details.genders) if details.genders else "",
+        [(pos, render_definitions(definitions)) for pos, definitions in details.definitions.items()],
+        render_etymologies(details.etymology) if details.etymology else "",
+    )
+
+
+def decode_fragments(value: str) -> Fragments:
+    return Fragments(*json.loads(value))
+
+
+def save_fragments(file: Path, words: WordsMapping) -> None:
+    """Render fragments of all words having definitions (the other ones are not part of dictionaries)."""
+    log.info("Rendering fragments ...")
+    with StoreWriter(file) as writer:
+        writer.update(
+            (word, json.dumps(render_fragments(details), ensure_ascii=False))
+            for word, details in words.items()
+            if details.definitions
+        )
+        count = len(writer)
+    log.info("Rendered fragments of %s words", f"{count:,}")
+
+
 def distribute_workload(
     formatters: list[type[BaseFormat]],
     output_dir: Path,
     file: Path,
     locale: str,
-    words: Words,
-    variants: Variants,
+    words: WordsMapping,
+    variants: VariantsMapping,
+    fragments: FragmentsMapping,
     *,
     include_etymology: bool = True,
+    variant_index: VariantIndexMapping | None = None,
 ) -> None:
     """Run formatters in parallel."""
     with multiprocessing.Pool(len(formatters)) as pool:
@@ -795,14 +919,16 @@ def distribute_workload(
                 variants=variants,
                 snapshot=file.stem.split("-")[-1],
                 include_etymology=include_etymology,
+                fragments=fragments,
+                variant_index=variant_index,
             ),
             formatters,
         )
 
 
-def get_latest_json_file(source_dir: Path) -> Path | None:
-    """Get the name of the last data-*.json file."""
-    files = list(source_dir.glob(f"data-{'[0-9]' * 8}.json"))
+def get_latest_render_file(source_dir: Path) -> Path | None:
+    """Get the name of the last data-*.bin file."""
+    files = list(source_dir.glob(f"data-{'[0-9]' * 8}.bin"))
     return sorted(files)[-1] if files else None
 
 
@@ -812,27 +938,54 @@ def main(locale: str) -> int:
     lang_src, lang_dst = utils.guess_locales(locale)
 
     source_dir = render.get_source_dir(lang_src, lang_dst)
-    if not (input_file := get_latest_json_file(source_dir)):
+    if not (input_file := get_latest_render_file(source_dir)):
         log.error("No dump found. Run with --render first ... ")
         return 1
 
-    # Get all words from the database
-    words: Words = load(input_file)
-    variants: Variants = make_variants(words)
-
-    # And run formatters, distributing the workload
     output_dir = source_dir / "output"
     output_dir.mkdir(exist_ok=True, parents=True)
-    args = (output_dir, input_file, locale, words, variants)
 
     # Force not using `fork()` on GNU/Linux to prevent deadlocks on "slow" machines (see issue #2333)
     multiprocessing.set_start_method("spawn", force=True)
 
+    # Words, variants, and fragments, are read from memory-mapped store files: formatters running in other
+    # processes only receive paths of those files, instead of a copy of all words
     start = monotonic()
-    for include_etymology in [False, True]:
-        distribute_workload(get_primary_formatters(), *args, include_etymology=include_etymology)
-        distribute_workload(get_secondary_formatters(), *args, include_etymology=include_etymology)
-        run_mobi_formatter(*args, include_etymology=include_etymology)
+    variants_file = output_dir / "variants.bin"
+    variant_index_file = output_dir / "variant-index.bin"
+    fragments_file = output_dir / "fragments.bin"
+    try:
+        with Store(input_file) as store:
+            words = DecodedStore(store, decode_word)
+            all_variants = make_variants(words)
+            save_variants(variants_file, all_variants)
+            # Variants, and fragments, are resolved, and rendered, once for all formatters (and etymology modes)
+            save_variant_index(variant_index_file, words, all_variants)
+            save_fragments(fragments_file, words)
+            # Formatters read variants from the store file
+            del all_variants
+
+            with (
+                Store(variants_file) as variants_store,
+                Store(variant_index_file) as variant_index_store,
+                Store(fragments_file) as fragments_store,
+            ):
+                variants = DecodedStore(variants_store, json.loads)
+                variant_index = DecodedStore(variant_index_store, decode_resolved_variants)
+                fragments = DecodedStore(fragments_store, decode_fragments)
+
+                # And run formatters, distributing the workload
+                args = (output_dir, input_file, locale, words, variants, fragments)
+                for include_etymology in [False, True]:
+                    for formatters in [get_primary_formatters(), get_secondary_formatters()]:
+                        distribute_workload(
+                            formatters, *args, include_etymology=include_etymology, variant_index=variant_index
+                        )
+                    run_mobi_formatter(*args, include_etymology=include_etymology, variant_index=variant_index)
+    finally:
+        # Also on errors, intermediate files are useless
+        for file in (variants_file, variant_index_file, fragments_file):
+            file.unlink(missing_ok=True)
 
     log.info("Convert done in %s!", timedelta(seconds=monotonic() - start))
     return 0
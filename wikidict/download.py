@@ -4,9 +4,13 @@
 
 import bz2
 import logging
+import mmap
+import multiprocessing
 import os
 import re
+from collections import deque
 from datetime import timedelta
+from itertools import islice
 from pathlib import Path
 from time import monotonic
 from typing import TYPE_CHECKING
@@ -16,7 +20,14 @@
 from . import constants, utils
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Generator
+    from multiprocessing.pool import AsyncResult
+
+# bzip2 48-bit markers, they are not aligned on bytes in the compressed data.
+# Source: https://github.com/dsnet/compress/blob/39efe44/doc/bzip2-format.pdf
+BZ2_BLOCK_MAGIC = 0x314159265359
+BZ2_EOS_MAGIC = 0x177245385090
+BZ2_MARKER_MASK = (1 << 48) - 1
 
 log = logging.getLogger(__name__)
 
@@ -27,7 +38,127 @@ def callback_progress(text: str, done: int, last: bool) -> None:
     log.debug("%s: %s", text, size)
 
 
-def decompress(file_in: Path, file_out: Path, callback: Callable[[str, int, bool], None]) -> None:
+def throughput(size: int, start: float) -> str:
+    """Format the throughput of *size* bytes processed since *start*."""
+    return f"{size / 1024**2 / max(monotonic() - start, 1e-6):,.2f} MiB/s"
+
+
+def find_bz2_markers(data: bytes | mmap.mmap, marker: int) -> list[int]:
+    """Find the bit offsets of all occurrences of the 48-bit *marker*.
+
+    >>> find_bz2_markers(bz2.compress(b"a") * 2, BZ2_BLOCK_MAGIC)
+    [32, 328]
+    >>> find_bz2_markers(bz2.compress(b"a") * 2, BZ2_EOS_MAGIC)
+    [211, 507]
+    """
+    offsets: list[int] = []
+    for shift in range(8):
+        # When the marker starts at the bit *shift* of a byte, the 5 next bytes are entirely part of the marker
+        pattern = (marker << (8 - shift)).to_bytes(7)[1:6]
+        idx = data.find(pattern, 1)
+        while idx != -1:
+            window = int.from_bytes(data[idx - 1 : idx + 6].ljust(7, b"\0"))
+            if (window >> (8 - shift)) & BZ2_MARKER_MASK == marker:
+                offsets.append((idx - 1) * 8 + shift)
+            idx = data.find(pattern, idx + 1)
+    return sorted(offsets)
+
+
+def find_bz2_blocks(file: Path) -> list[tuple[int, int]]:
+    """Find all blocks of a BZ2 file, be it a multistream one or not.
+    Return a list of (start, end) bit offsets; or an empty list when the file is not a valid BZ2 file.
+    """
+    if not file.stat().st_size:
+        return []
+
+    with file.open("rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        markers = sorted(
+            [(offset, True) for offset in find_bz2_markers(mm, BZ2_BLOCK_MAGIC)]
+            + [(offset, False) for offset in find_bz2_markers(mm, BZ2_EOS_MAGIC)]
+        )
+
+    # A block ends where the next one starts, or at the end-of-stream marker
+    if not markers or markers[-1][1]:
+        return []
+    return [(start, end) for (start, is_block), (end, _) in zip(markers, markers[1:]) if is_block]
+
+
+def decompress_block(file: Path, start: int, end: int) -> bytes:
+    """Decompress one block of a BZ2 file, located between the *start* and *end* bit offsets.
+
+    The block is wrapped into a standalone single-block BZ2 stream: a header, the block bits, the
+    end-of-stream marker, and the stream checksum (which is the block checksum for such a stream).
+    """
+    first = start // 8
+    with file.open("rb") as fh:
+        fh.seek(first)
+        raw = fh.read((end + 7) // 8 - first)
+
+    size = end - start
+    bits = (int.from_bytes(raw) >> (len(raw) * 8 - (end - first * 8))) & ((1 << size) - 1)
+    checksum = (bits >> (size - 80)) & 0xFFFFFFFF  # The 32 bits following the block marker
+    bits = (bits << 80) | (BZ2_EOS_MAGIC << 32) | checksum
+    size += 80
+    padding = -size % 8
+    return bz2.decompress(b"BZh9" + (bits << padding).to_bytes((size + padding) // 8))
+
+
+def iter_decompress_parallel(file: Path, blocks: list[tuple[int, int]], workers: int) -> Generator[bytes]:
+    """Decompress *blocks* using a pool of *workers*, and yield uncompressed data in order."""
+    todo = iter(blocks)
+    with multiprocessing.Pool(processes=workers) as pool:
+        # Keep a bounded amount of blocks in-flight to not exhaust the memory when writing is slower than decompressing
+        pending: deque[AsyncResult[bytes]] = deque(
+            pool.apply_async(decompress_block, (file, start, end)) for start, end in islice(todo, workers * 4)
+        )
+        while pending:
+            data = pending.popleft().get()
+            if block := next(todo, None):
+                pending.append(pool.apply_async(decompress_block, (file, *block)))
+            yield data
+
+
+def iter_decompress(file: Path, *, workers: int = 1) -> Generator[bytes]:
+    """Decompress a BZ2 file, be it a multistream one or not, and yield uncompressed data in order.
+    When *workers* is greater than 1, blocks are decompressed in parallel.
+    """
+    done = 0
+    if workers > 1 and len(blocks := find_bz2_blocks(file)) > 1:
+        try:
+            for data in iter_decompress_parallel(file, blocks, workers):
+                done += len(data)
+                yield data
+            return
+        except (EOFError, OSError, ValueError):
+            # A block marker can legitimately appear inside compressed data (the probability is really low, though)
+            log.warning("Parallel decompression of %s failed, falling back to the sequential one", file)
+
+    comp = bz2.BZ2Decompressor()
+    with file.open("rb") as fi:
+        while data := fi.read(1024**2):
+            while data:
+                if comp.eof:
+                    # Multistream file: a new decompressor is needed for each stream
+                    comp = bz2.BZ2Decompressor()
+                uncompressed = comp.decompress(data)
+                data = comp.unused_data if comp.eof else b""
+
+                # Skip data already yielded by the parallel decompression
+                if done:
+                    skip = min(done, len(uncompressed))
+                    uncompressed = uncompressed[skip:]
+                    done -= skip
+                if uncompressed:
+                    yield uncompressed
+
+
+def decompress(
+    file_in: Path,
+    file_out: Path,
+    callback: Callable[[str, int, bool], None],
+    *,
+    workers: int = 1,
+) -> None:
     """Decompress a BZ2 file."""
     msg = f"Uncompressing into {file_out}"
     log.info(msg)
@@ -35,15 +166,14 @@ def decompress(file_in: Path, file_out: Path, callback: Callable[[str, int, bool
     if file_out.is_file():
         return
 
-    comp = bz2.BZ2Decompressor()
-    with file_in.open("rb") as fi, file_out.open("wb") as fo:
+    start = monotonic()
+    with file_out.open("wb") as fo:
         done = 0
-        while data := fi.read(1024**2):
-            uncompressed = comp.decompress(data)
+        for uncompressed in iter_decompress(file_in, workers=workers):
             done += fo.write(uncompressed)
-            callback(msg, done, False)
+            callback(f"{msg} ({throughput(done, start)})", done, False)
 
-    callback(msg, file_out.stat().st_size, True)
+    callback(f"{msg} ({throughput(done, start)})", file_out.stat().st_size, True)
 
 
 def fetch_snapshots(locale: str) -> list[str]:
@@ -92,8 +222,10 @@ def get_output_file_uncompressed(file: Path) -> Path:
     return file.with_suffix(file.suffix.replace(".bz2", ""))
 
 
-def main(locale: str) -> int:
-    """Entry point."""
+def main(locale: str, *, stream: bool = False, workers: int = 1) -> int:
+    """Entry point.
+    When *stream* is True, the dump is kept compressed: it will be decompressed on-the-fly by `parse.main()`.
+    """
 
     start = monotonic()
     locale = utils.guess_lang_origin(locale)
@@ -107,7 +239,8 @@ def main(locale: str) -> int:
         file_uncompressed = get_output_file_uncompressed(file_compressed)
         try:
             fetch_pages(snapshot, locale, file_compressed, callback=callback_progress)
-            decompress(file_compressed, file_uncompressed, callback_progress)
+            if not stream:
+                decompress(file_compressed, file_uncompressed, callback_progress, workers=workers)
             break
         except HTTPError as exc:
             file_compressed.unlink(missing_ok=True)
@@ -38,7 +38,7 @@ def main(locale: str, words: str, output: str, *, format: str = "kobo") -> int:
             run_formatter(DictFileFormat, *args)
             run_formatter(DictOrgFormat, *args)
         case "mobi":
-            run_mobi_formatter(output_dir, Path(f"data-{args[-1]}.json"), locale, all_words, variants)
+            run_mobi_formatter(output_dir, Path(f"data-{args[-1]}.bin"), locale, all_words, variants, {})
         case "stardict":
             run_formatter(DictFileFormat, *args)
             run_formatter(StarDictFormat, *args)
@@ -1,16 +1,74 @@
 """Internationalization stuff."""
 
+from __future__ import annotations
+
 from importlib import import_module
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from . import defaults
 
-_ALL_LOCALES = {
-    locale.name: import_module(f"wikidict.lang.{locale.name}")
+if TYPE_CHECKING:
+    from _collections_abc import dict_items, dict_keys, dict_values
+    from collections.abc import Iterator
+
+# Locales are imported on demand only, some of them hold a lot of data
+_ALL_LOCALES = tuple(
+    locale.name
     for locale in sorted(Path(__file__).parent.glob("*"))
     if locale.is_dir() and bool(list(locale.glob("*.py", case_sensitive=True)))
-}
+)
+
+
+class _Populated(dict[str, Any]):
+    """
+    A dict for all locales pointing to the appropriate attribute.
+    Fallback to `defaults`.
+    The locale module is imported on the first access to one of its values.
+
+    >>> lazy = _Populated("section_level")
+    >>> "fr" in lazy, "xx" in lazy, len(lazy) == len(_ALL_LOCALES)
+    (True, False, True)
+    >>> lazy["pt"], lazy.get("fr"), lazy.get("xx")
+    (1, 2, None)
+    """
+
+    def __init__(self, attr: str) -> None:
+        super().__init__()
+        self.attr = attr
+
+    def __missing__(self, locale: str) -> Any:
+        if locale not in _ALL_LOCALES:
+            raise KeyError(locale)
+        module = import_module(f"{__name__}.{locale}")
+        value = getattr(module, self.attr) if hasattr(module, self.attr) else getattr(defaults, self.attr)
+        self[locale] = value
+        return value
+
+    def __contains__(self, locale: object) -> bool:
+        return locale in _ALL_LOCALES
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_ALL_LOCALES)
+
+    def __len__(self) -> int:
+        return len(_ALL_LOCALES)
+
+    def get(self, locale: str, default: Any = None) -> Any:
+        return self[locale] if locale in _ALL_LOCALES else default
+
+    def all(self) -> dict[str, Any]:
+        """Return values of all locales, importing them all."""
+        return {locale: self[locale] for locale in _ALL_LOCALES}
+
+    def keys(self) -> dict_keys[str, Any]:
+        return self.all().keys()
+
+    def values(self) -> dict_values[str, Any]:
+        return self.all().values()
+
+    def items(self) -> dict_items[str, Any]:
+        return self.all().items()
 
 
 def _populate(attr: str) -> dict[str, Any]:
@@ -18,10 +76,7 @@ def _populate(attr: str) -> dict[str, Any]:
     Create a dict for all locales pointing to the appropriate attribute.
     Fallback to `defaults`.
     """
-    return {
-        locale.__name__.split(".")[-1]: getattr(locale, attr) if hasattr(locale, attr) else getattr(defaults, attr)
-        for locale in _ALL_LOCALES.values()
-    }
+    return _Populated(attr)
 
 
 # Float number separator
@@ -78,6 +133,11 @@ def _populate(attr: str) -> dict[str, Any]:
 # Templates that will be completed/replaced using custom style.
 templates_other: dict[str, dict[str, str]] = _populate("templates_other")
 
+# Templates handled by `last_template_handler()` whose rendering does not depend on the word being rendered.
+# Their rendering is cached, see `utils.transform()`.
+# Note: *templates_multi* not using the *word* variable are pure too, there is no need to declare them here.
+templates_pure: dict[str, tuple[str, ...]] = _populate("templates_pure")
+
 # The full release description on GitHub:
 # https://github.com/BoboTiG/ebook-reader-dict/releases/tag/$LOCALE
 release_description: dict[str, str] = _populate("release_description")
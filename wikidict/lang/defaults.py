@@ -38,6 +38,10 @@
 # Templates that will be completed/replaced using custom style.
 templates_other: dict[str, str] = {}
 
+# Templates handled by `last_template_handler()` whose rendering does not depend on the word being rendered.
+# Their rendering is cached, see `utils.transform()`.
+templates_pure: tuple[str, ...] = ()
+
 
 def find_genders(code: str, locale: str) -> list[str]:
     """Function used to find genders within `code`."""
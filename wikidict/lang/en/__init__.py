@@ -445,6 +445,15 @@
 templates_other["en dash"] = templates_other["ndash"]
 templates_other["Genericized trademark"] = templates_other["genericized trademark"]
 
+# Templates handled by `last_template_handler()` whose rendering does not depend on the word being rendered.
+# Their rendering is cached, see `utils.transform()`.
+templates_pure = (
+    "label",
+    "lb",
+    "lbl",
+    "vern",
+)
+
 
 # Release content on GitHub
 # https://github.com/BoboTiG/ebook-reader-dict/releases/tag/en
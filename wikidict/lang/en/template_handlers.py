@@ -3278,9 +3278,10 @@ def render_transclude(tpl: str, parts: list[str], data: defaultdict[str, str], *
     {{tcl}} arg with @: https://en.wiktionary.org/wiki/'Sconset
     """
     from ... import render, utils
+    from ...store import Store
 
     source_dir = render.get_source_dir("en", "en")
-    file = render.get_latest_json_file(source_dir)
+    file = render.get_latest_wikicode_file(source_dir)
     assert file
 
     source_origin = parts[1]
@@ -3291,14 +3292,16 @@ def render_transclude(tpl: str, parts: list[str], data: defaultdict[str, str], *
     if ":" in source:
         source = source.split(":")[-1]
 
+    with Store(file) as words:
+        output = words[source]
+
     for sid in sense_id.split(","):
-        output = utils.grep(file, f'"{source}": "')
         pattern = re.compile(
             rf"#+\s*\{{\{{(?:senseid|sid)\|\w+\|{sid}\}}\}}\s*(.+)"
             if "{{senseid|" in output or "{{sid|" in output
             else r"#+\s*(\{\{place\|.+)"
         )
-        definition = next(line.strip() for line in output.split("\\n") if pattern.search(line))
+        definition = next(line.strip() for line in output.splitlines() if pattern.search(line))
         definition = pattern.sub(r"\1", definition)
 
         # At this point, the definition is something like `{{place|...}}`, and if the `tcl=` arg is used, we need to alter template arguments
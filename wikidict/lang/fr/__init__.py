@@ -543,6 +543,21 @@
     "vlatypas-pivot": "v’là-t-i’ pas",
 }
 
+# Modèles gérés par `last_template_handler()` dont le rendu ne dépend pas du mot en cours.
+# Leur rendu est mis en cache, voir `utils.transform()`.
+templates_pure = (
+    "cf",
+    "date",
+    "l",
+    "lang",
+    "lien",
+    "polytonique",
+    "siècle",
+    "siècle2",
+    "term",
+    "étyl",
+)
+
 
 # Contenu de la release sur GitHub :
 # https://github.com/BoboTiG/ebook-reader-dict/releases/tag/fr
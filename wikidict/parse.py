@@ -2,49 +2,115 @@
 
 from __future__ import annotations
 
-import json
+import bz2
+import hashlib
 import logging
+import multiprocessing
 import os
 import re
-from collections import defaultdict
+from collections import Counter, defaultdict
 from datetime import timedelta
+from functools import partial
+from itertools import batched
 from pathlib import Path
 from time import monotonic
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, NamedTuple
 from xml.sax.saxutils import unescape
 
 from . import lang, utils
+from .store import Store, StoreWriter
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Generator, Iterator
+    from collections.abc import Callable, Generator, Iterable, Iterator
+    from io import BufferedIOBase
 
 
 log = logging.getLogger(__name__)
 
 RE_TEXT = re.compile(r"<text[^>]*>(.*)</text>", flags=re.DOTALL).finditer
 RE_TITLE = re.compile(r"<title>([^:]*)</title>").finditer
+RE_REVISION = re.compile(r"<revision>\s*<id>(\d+)</id>").search
 
 # To list all words not taken into account with current head sections:
 #    DEBUG_PARSE=1 python -m wikidict LOCALE --parse >out.log
 DEBUG_PARSE = "DEBUG_PARSE" in os.environ
 
 
+def open_xml_file(file: Path) -> BufferedIOBase:
+    """Open the XML dump, decompressing it on-the-fly when it is the BZ2 file."""
+    if file.suffix == ".bz2":
+        return bz2.open(file)
+    return file.open(mode="rb")
+
+
+def xml_iter_pages(fh: BufferedIOBase, *, size: int = -1, chunk_size: int = 4 * 1024**2) -> Generator[str]:
+    """Yield the content of all <page> elements, reading *fh* by big blocks.
+    When *size* is set, only that number of bytes will be read.
+
+    The content starts at the line following the <page> tag, and stops at the line holding the </page> tag:
+
+    >>> from io import BytesIO
+    >>> xml = b"<mediawiki>\\n  <page>\\n    <title>a</title>\\n  </page>\\n  <page>\\n  </page>\\n</mediawiki>"
+    >>> list(xml_iter_pages(BytesIO(xml), chunk_size=8))
+    ['    <title>a</title>\\n', '']
+    >>> list(xml_iter_pages(BytesIO(xml), size=52))
+    ['    <title>a</title>\\n']
+    """
+    buffer = b""
+    find = bytes.find
+
+    while size and (chunk := fh.read(chunk_size if size < 0 else min(chunk_size, size))):
+        if size > 0:
+            size -= len(chunk)
+        buffer = buffer + chunk if buffer else chunk
+
+        pos = 0
+        while (
+            (start := find(buffer, b"<page", pos)) != -1
+            and (start := find(buffer, b"\n", start) + 1)
+            and (stop := find(buffer, b"</page>", start)) != -1
+        ):
+            yield buffer[start : buffer.rfind(b"\n", start - 1, stop) + 1].decode("utf-8")
+            pos = stop + 7
+
+        # Keep the unfinished page for the next round
+        buffer = buffer[pos:]
+
+
 def xml_iter_parse(file: Path) -> Generator[str]:
-    """Efficient XML parsing for big files."""
-    element: list[str] = []
-    is_element = False
-
-    with file.open(encoding="utf-8") as fh:
-        for line in fh:
-            if is_element:
-                if "/page>" in line:
-                    yield "".join(element)
-                    element = []
-                    is_element = False
-                else:
-                    element.append(line)
-            elif "<page" in line:
-                is_element = True
+    """Efficient XML parsing for big files.
+    The BZ2 dump can be passed directly: it will be decompressed chunk by chunk, and never written to the disk.
+    """
+    with open_xml_file(file) as fh:
+        yield from xml_iter_pages(fh)
+
+
+def xml_iter_parse_range(file: Path, start: int, end: int) -> Generator[str]:
+    """XML parsing of the [*start*, *end*[ byte range of the uncompressed dump, see `get_page_ranges()`."""
+    with file.open(mode="rb") as fh:
+        fh.seek(start)
+        yield from xml_iter_pages(fh, size=end - start)
+
+
+def get_page_ranges(file: Path, count: int) -> list[tuple[int, int]]:
+    """Split the uncompressed dump into, at most, *count* byte ranges.
+    Each range starts at the beginning of a line holding a <page> element, so that no page is split between ranges.
+    """
+    size = file.stat().st_size
+    bounds = [0]
+    with file.open(mode="rb") as fh:
+        for idx in range(1, count):
+            fh.seek(max(size * idx // count, bounds[-1]))
+            fh.readline()  # Skip the line, it is likely truncated because of the seek()
+            pos = fh.tell()
+            while (line := fh.readline()) and b"<page" not in line:
+                pos += len(line)
+            if not line:
+                break
+            if pos > bounds[-1]:
+                bounds.append(pos)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
 
 
 def xml_parse_element(element: str, head_sections_matcher: Callable[[str], Iterator[str]]) -> tuple[str, str]:
@@ -64,31 +130,116 @@ def xml_parse_element(element: str, head_sections_matcher: Callable[[str], Itera
     return "", ""
 
 
-def process(file: Path, locale: str) -> dict[str, str]:
-    """Process the big XML file and retain only information we are interested in."""
-    words: dict[str, str] = defaultdict(str)
-    lang_src, lang_dst = utils.guess_locales(locale, use_log=False)
-
-    log.info("Processing %s for destination lang %r ...", file, lang_dst)
-
+def get_head_sections_matcher(lang_src: str, lang_dst: str) -> Callable[[str], Iterator[str]]:
+    """Get the function checking whether a Wikicode contains an interesting head section."""
     if lang_src == "de":
         # It is not possible to use a regexp matcher
         def head_sections_matcher(wikicode: str) -> Iterator[str]:
             return (s for s in lang.head_sections[lang_dst] if s in wikicode.lower())
-    else:
-        head_sections_matcher = re.compile(
-            rf"^=*\s*(?:{'|'.join(hs.replace('{', r'\{').replace('|', r'\|') for hs in lang.head_sections[lang_dst])})",
-            flags=re.IGNORECASE | re.MULTILINE,
-        ).finditer  # type: ignore[assignment]
 
-    for element in xml_iter_parse(file):
+        return head_sections_matcher
+
+    return re.compile(
+        rf"^=*\s*(?:{'|'.join(hs.replace('{', r'\{').replace('|', r'\|') for hs in lang.head_sections[lang_dst])})",
+        flags=re.IGNORECASE | re.MULTILINE,
+    ).finditer  # type: ignore[return-value]
+
+
+class Previous(NamedTuple):
+    """Outcome of the previous snapshot parsing, for the incremental mode."""
+
+    words: Store
+    revisions: Store
+
+    def close(self) -> None:
+        self.words.close()
+        self.revisions.close()
+
+
+class Pages(NamedTuple):
+    """Outcome of the parsing."""
+
+    words: dict[str, str]
+    revisions: dict[str, str]
+    changes: Counter[str]
+
+
+def parse_elements(elements: Iterable[str], locale: str, *, previous: Previous | None = None) -> Pages:
+    """Parse XML <page> elements, and retain only information we are interested in.
+    When *previous* is set, pages with the same revision as the previous snapshot are not parsed again.
+    """
+    pages = Pages({}, {}, Counter())
+    lang_src, lang_dst = utils.guess_locales(locale, use_log=False)
+    head_sections_matcher = get_head_sections_matcher(lang_src, lang_dst)
+    previous_revisions = previous.revisions if previous else {}
+
+    for element in elements:
+        if (revision_match := RE_REVISION(element)) and (title_match := next(RE_TITLE(element), None)):
+            title, revision = title_match[1], revision_match[1]
+            pages.revisions[title] = revision
+
+            if (previous_revision := previous_revisions.get(title)) == revision:
+                pages.changes["unchanged"] += 1
+                if previous and (code := previous.words.get(word := unescape(title))) is not None:
+                    pages.words[word] = code
+                continue
+            pages.changes["changed" if previous_revision else "added"] += 1
+
         word, code = xml_parse_element(element, head_sections_matcher)
         if word and code:
             if lang_dst == "en" and word[:19] == "Unsupported titles/":
                 continue
-            words[unescape(word)] = unescape(code)
+            pages.words[unescape(word)] = unescape(code)
+
+    return pages
+
+
+def parse_range(bounds: tuple[int, int], file: Path, locale: str, *, previous: Previous | None = None) -> Pages:
+    """Parse a byte range of the uncompressed dump (multiprocessing worker)."""
+    return parse_elements(xml_iter_parse_range(file, *bounds), locale, previous=previous)
 
-    return words
+
+def process(file: Path, locale: str, *, workers: int = 1, previous: Previous | None = None) -> Pages:
+    """Process the big XML file and retain only information we are interested in.
+    When *workers* is greater than 1, the file is parsed in parallel: byte ranges for the uncompressed dump,
+    and batches of pages for the BZ2 dump (the decompression itself being sequential).
+    """
+    pages = Pages(defaultdict(str), {}, Counter())
+    _, lang_dst = utils.guess_locales(locale, use_log=False)
+
+    log.info("Processing %s for destination lang %r ...", file, lang_dst)
+
+    def merge(shards: Iterable[Pages]) -> None:
+        for shard in shards:
+            pages.words.update(shard.words)
+            pages.revisions.update(shard.revisions)
+            pages.changes.update(shard.changes)
+
+    if workers < 2:
+        merge([parse_elements(xml_iter_parse(file), locale, previous=previous)])
+    else:
+        with multiprocessing.Pool(processes=workers) as pool:
+            # Results are merged in the dump order to keep the same outcome as a sequential parsing
+            if file.suffix == ".bz2":
+                merge(
+                    pool.imap(
+                        partial(parse_elements, locale=locale, previous=previous),
+                        batched(xml_iter_parse(file), 1_000),
+                    )
+                )
+            else:
+                # More ranges than workers to balance the load, pages sizes being really different
+                ranges = get_page_ranges(file, workers * 4)
+                merge(pool.imap(partial(parse_range, file=file, locale=locale, previous=previous), ranges))
+
+    if previous:
+        pages.changes["removed"] = sum(1 for title in previous.revisions if title and title not in pages.revisions)
+        log.info(
+            "Pages: %s unchanged, %s changed, %s added, %s removed",
+            *(f"{pages.changes[kind]:,}" for kind in ("unchanged", "changed", "added", "removed")),
+        )
+
+    return pages
 
 
 def save(output: Path, words: dict[str, str]) -> None:
@@ -98,43 +249,103 @@ def save(output: Path, words: dict[str, str]) -> None:
         return
 
     output.parent.mkdir(exist_ok=True, parents=True)
-    with output.open(mode="w", encoding="utf-8") as fh:
-        json.dump(words, fh, ensure_ascii=False, indent=4, sort_keys=True)
+    with StoreWriter(output) as writer:
+        writer.update(words.items())
 
     log.info("Saved %s words into %s", f"{len(words):,}", output)
 
 
-def get_latest_xml_file(source_dir: Path) -> Path | None:
-    """Get the name of the last pages-*.xml file."""
-    files = list(source_dir.glob(f"pages-{'[0-9]' * 8}.xml"))
+def save_revisions(output: Path, revisions: dict[str, str], digest: str) -> None:
+    """Persist revisions of all pages, the *digest* of the parser settings being stored with the empty title."""
+    output.parent.mkdir(exist_ok=True, parents=True)
+    with StoreWriter(output) as writer:
+        writer.add("", digest)
+        writer.update(revisions.items())
+
+    log.info("Saved %s revisions into %s", f"{len(revisions):,}", output)
+
+
+def get_parser_digest(lang_src: str, lang_dst: str) -> str:
+    """Get the digest of the parser code, and settings: the previous snapshot cannot be reused when they changed."""
+    digest = hashlib.sha1(Path(__file__).read_bytes())
+    digest.update(repr((lang_src, lang_dst, lang.head_sections[lang_dst])).encode())
+    return digest.hexdigest()
+
+
+def get_previous(output: Path, digest: str) -> Previous | None:
+    """Get the outcome of the most recent snapshot parsed before the *output* one, if any."""
+    for file in sorted(output.parent.glob(f"data_wikicode-{'[0-9]' * 8}.bin"), reverse=True):
+        if file.name >= output.name or not (revisions_file := get_revisions_file(file)).is_file():
+            continue
+
+        revisions = Store(revisions_file)
+        if revisions.get("") != digest:
+            revisions.close()
+            log.warning("Parser, or its settings, changed since %s, all pages will be parsed", file)
+            return None
+
+        log.info("Reusing pages from %s", file)
+        return Previous(Store(file), revisions)
+
+    log.warning("No previous snapshot found, all pages will be parsed")
+    return None
+
+
+def get_latest_xml_file(source_dir: Path, *, compressed: bool = False) -> Path | None:
+    """Get the name of the last pages-*.xml file (or pages-*.xml.bz2 file when *compressed* is True)."""
+    files = list(source_dir.glob(f"pages-{'[0-9]' * 8}.xml{'.bz2' if compressed else ''}"))
     return sorted(files)[-1] if files else None
 
 
+def get_snapshot(file: Path) -> str:
+    """Get the snapshot date from a pages-*.xml, or pages-*.xml.bz2, file."""
+    return file.name.split(".", 1)[0].split("-")[-1]
+
+
 def get_source_dir(lang_src: str) -> Path:
     return Path(os.getenv("CWD", "")) / "data" / lang_src
 
 
 def get_output_file(source_dir: Path, lang_src: str, lang_dst: str, snapshot: str) -> Path:
-    return source_dir.parent / lang_dst / lang_src / f"data_wikicode-{snapshot}.json"
+    return source_dir.parent / lang_dst / lang_src / f"data_wikicode-{snapshot}.bin"
+
+
+def get_revisions_file(output: Path) -> Path:
+    return output.with_name(output.name.replace("data_wikicode-", "data_revisions-"))
 
 
-def main(locale: str) -> int:
-    """Entry point."""
+def main(
+    locale: str,
+    *,
+    stream: bool = False,
+    workers: int = 1,
+    incremental: bool = False,
+) -> int:
+    """Entry point.
+    When *incremental* is True, pages with the same revision as in the previous snapshot are not parsed again.
+    """
 
     start = monotonic()
     lang_src, lang_dst = utils.guess_locales(locale)
 
     source_dir = get_source_dir(lang_src)
-    if not (input_file := get_latest_xml_file(source_dir)):
+    if not (input_file := get_latest_xml_file(source_dir, compressed=stream)):
         log.error("No dump found. Run with --download first ... ")
         return 1
 
-    output = get_output_file(source_dir, lang_src, lang_dst, input_file.stem.split("-")[-1])
+    output = get_output_file(source_dir, lang_src, lang_dst, get_snapshot(input_file))
     if output.is_file():
         log.info("Already parsed into %s", output)
     else:
-        words = process(input_file, locale)
-        save(output, words)
+        digest = get_parser_digest(lang_src, lang_dst)
+        previous = get_previous(output, digest) if incremental else None
+        try:
+            pages = process(input_file, locale, workers=workers, previous=previous)
+        finally:
+            if previous:
+                previous.close()
+        save(output, pages.words)
+        save_revisions(get_revisions_file(output), pages.revisions, digest)
 
     log.info("Parse done in %s!", timedelta(seconds=monotonic() - start))
     return 0
@@ -0,0 +1,124 @@
+"""Wall time spent rendering words, templates, and template handlers. See `wikidict LOCALE --render --profile`."""
+
+from __future__ import annotations
+
+import heapq
+import json
+import logging
+from collections import Counter, defaultdict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+# Number of entries, per kind, in reports (only the slowest words are kept while rendering)
+TOP_COUNT = 100
+
+# Kinds of timings
+LOCALES = "locales"
+TEMPLATES = "templates"
+HANDLERS = "handlers"
+WORDS = "words"
+
+Report = dict[str, list[dict[str, str | int | float]]]
+
+log = logging.getLogger(__name__)
+
+
+class Profile:
+    """Calls count, and cumulated wall time in seconds, per (kind, locale, name).
+    Timings are inclusive: a template rendering other templates also counts their time.
+
+    >>> profile = Profile()
+    >>> profile.add_word("fr", "chat", 0.5)
+    >>> profile.add(TEMPLATES, "fr", "lien", 0.125)
+    >>> profile.add(TEMPLATES, "fr", "lien", 0.125)
+    >>> print(format_report(profile.report()), end="")
+    Slowest locales:
+          0.500 s       1 calls  fr
+    Slowest templates:
+          0.250 s       2 calls  fr:lien
+    Slowest handlers:
+    Slowest words:
+          0.500 s       1 calls  fr:chat
+    """
+
+    def __init__(self) -> None:
+        self.calls: Counter[tuple[str, str, str]] = Counter()
+        self.seconds: defaultdict[tuple[str, str, str], float] = defaultdict(float)
+        self.words: list[tuple[float, str, str]] = []
+
+    def add(self, kind: str, locale: str, name: str, seconds: float) -> None:
+        key = (kind, locale, name)
+        self.calls[key] += 1
+        self.seconds[key] += seconds
+
+    def add_word(self, locale: str, word: str, seconds: float) -> None:
+        self.add(LOCALES, locale, "", seconds)
+        if len(self.words) < TOP_COUNT:
+            heapq.heappush(self.words, (seconds, locale, word))
+        else:
+            heapq.heappushpop(self.words, (seconds, locale, word))
+
+    def update(self, other: Profile) -> None:
+        """Merge timings of *other* profile (from a render worker)."""
+        self.calls.update(other.calls)
+        for key, seconds in other.seconds.items():
+            self.seconds[key] += seconds
+        self.words = heapq.nlargest(TOP_COUNT, self.words + other.words)
+        heapq.heapify(self.words)
+
+    def report(self) -> Report:
+        """Return the slowest entries of each kind, sorted by cumulated time."""
+        report: Report = {}
+        for kind in (LOCALES, TEMPLATES, HANDLERS):
+            keys = heapq.nlargest(
+                TOP_COUNT, (key for key in self.seconds if key[0] == kind), key=self.seconds.__getitem__
+            )
+            report[kind] = [
+                {"locale": key[1], "name": key[2], "calls": self.calls[key], "seconds": round(self.seconds[key], 6)}
+                for key in keys
+            ]
+        report[WORDS] = [
+            {"locale": locale, "name": word, "calls": 1, "seconds": round(seconds, 6)}
+            for seconds, locale, word in sorted(self.words, reverse=True)
+        ]
+        return report
+
+
+def format_report(report: Report) -> str:
+    """Format a report as text, one section per kind."""
+    lines = []
+    for kind, entries in report.items():
+        lines.append(f"Slowest {kind}:")
+        lines.extend(
+            f"{entry['seconds']:>11.3f} s {entry['calls']:>7,} calls  "
+            + (f"{entry['locale']}:{entry['name']}" if entry["name"] else str(entry["locale"]))
+            for entry in entries
+        )
+    return "\n".join(lines) + "\n"
+
+
+def save(profile: Profile, output: Path) -> None:
+    """Write the report of *profile* into *output* JSON file, and into the text file next to it."""
+    report = profile.report()
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    text_file = output.with_suffix(".txt")
+    text_file.write_text(format_report(report), encoding="utf-8")
+    log.info("Render profile saved into %s, and %s", output, text_file)
+
+
+# Set in render workers only while profiling
+PROFILE: Profile | None = None
+
+
+def start() -> None:
+    global PROFILE
+    PROFILE = Profile()
+
+
+def stop() -> Profile | None:
+    """Stop profiling, and return timings recorded since `start()`."""
+    global PROFILE
+    profile, PROFILE = PROFILE, None
+    return profile
@@ -2,31 +2,34 @@
 
 from __future__ import annotations
 
+import hashlib
+import heapq
 import json
 import logging
 import multiprocessing
 import os
 import re
-from collections import defaultdict
+from collections import Counter, defaultdict
 from contextlib import suppress
 from datetime import timedelta
-from functools import partial
+from functools import cache, partial
 from pathlib import Path
-from time import monotonic
-from typing import TYPE_CHECKING, cast
+from time import monotonic, perf_counter
+from typing import TYPE_CHECKING, NamedTuple
 
 import wikitextparser as wtp
 import wikitextparser._spans
 
-from . import lang, utils
+from . import lang, profiler, utils
 from .namespaces import namespaces
+from .store import Store, StoreWriter
 from .stubs import Definition, Definitions, Word
 from .user_functions import unique
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Generator, Iterable, Mapping, Sequence
 
-    from .stubs import Definitions, SubDefinition, Words
+    from .stubs import Definitions, SubDefinition, TemplatesCacheStats, TemplatesStats, Words
 
 
 # As stated in wikitextparser._spans.parse_pm_pf_tl():
@@ -54,6 +57,27 @@
 #    DEBUG_EMPTY_WORDS=1 python -m wikidict LOCALE --render >out.log 2>&1
 DEBUG_EMPTY_WORDS = "DEBUG_EMPTY_WORDS" in os.environ
 
+# Maximum number of words, and of Wikicode bytes, sent at once to a render worker
+RENDER_BATCH_SIZE = 256
+RENDER_BATCH_BYTES = 512 * 1024
+
+# Seconds between two progress reports, and the number of slowest words to report at the end
+PROGRESS_INTERVAL = 30.0
+SLOWEST_WORDS_COUNT = 10
+
+# Headings, as matched by wikitextparser: the level is the lowest count of equal signs on both sides
+SECTION_HEADING = re.compile(r"(={1,6})([^\n]+?)\1[ \t]*").fullmatch
+LINES_STARTING_WITH_EQUALS = re.compile(r"^=[^\n]*", flags=re.MULTILINE)
+# Extension tags whose contents are not parsed, they may contain fake headings
+UNPARSED_TAGS = re.compile(
+    r"<(?:chem|gallery|hiero|math|nowiki|poem|pre|score|source|syntaxhighlight|timeline)\b", flags=re.IGNORECASE
+)
+# Templates whose rendering depends on other pages (transclusion), or on the network (Wikidata): see `is_cacheable()`
+UNCACHEABLE_TEMPLATES = re.compile(
+    r"\{\{\s*(?:coin|coinage|coined|person|tcl|transclude|transclude sense|wikidata entity link)\s*[|}]",
+    flags=re.IGNORECASE,
+).search
+
 log = logging.getLogger(__name__)
 
 
@@ -63,6 +87,67 @@ def get_ignored_terms(lang_src: str, lang_dst: str) -> set[str]:
     return {term.lower() for term in ignored_terms}
 
 
+def get_namespaces_regex(locale: str) -> re.Pattern[str]:
+    """Compile the regex matching links to namespaces (files, categories, ...), used by `adjust_wikicode()`."""
+    all_namespaces = set()
+    for namespace in namespaces[locale] + namespaces["en"]:
+        all_namespaces.add(namespace)
+        all_namespaces.add(namespace.lower())
+    pattern = "|".join(sorted(all_namespaces))
+    return re.compile(
+        # Courtesy of Casimir et Hippolyte & Wiktor Stribiżew from https://stackoverflow.com/q/79006887/1117028
+        rf"""
+        # Match [[
+        \[\[
+
+        # Namespace followed by :
+        (?:{pattern}):
+
+        # Match any chars other than [ and ], or any ] that is not immediately followed with another ], or a [
+        # that is not immediately followed with [ or one or more digits + ]
+        [^][]*(?:](?!])[^][]*|\[(?!\[|\d+\])[^][]*)*
+
+        # Match zero or more occurrences of either [+digit(s)+], or strings between [[ and ]] and then any chars
+        # other than [ and ], or any ] that is not immediately followed with another ], or a [ that is not immediately
+        # followed with [ or one or more digits + ]
+        (?:(?:\[\d+\]|\[\[[^][]*(?:](?!])[^][]*|\[(?!\[)[^][]*)*\]\])[^][]*(?:](?!])[^][]*|\[(?!\[|\d+\])[^][]*)*)*
+
+        # Match ]]
+        ]]
+        """,
+        flags=re.VERBOSE,
+    )
+
+
+class RenderContext(NamedTuple):
+    """Locale data used for every rendered word, see `get_render_context()`."""
+
+    lang_src: str
+    lang_dst: str
+    namespaces_regex: re.Pattern[str]
+    ignored_terms: tuple[str, ...]
+    head_sections: tuple[str, ...]
+
+
+@cache
+def get_render_context(lang_src: str, lang_dst: str) -> RenderContext:
+    """Compute the render context only once per process.
+
+    >>> ctx = get_render_context("fr", "fr")
+    >>> ctx is get_render_context("fr", "fr")
+    True
+    >>> ctx.head_sections
+    ('{{langue|fr}}', '{{langue|conv}}', '{{caractère}}')
+    """
+    return RenderContext(
+        lang_src,
+        lang_dst,
+        get_namespaces_regex(lang_dst),
+        tuple(sorted(get_ignored_terms(lang_src, lang_dst))),
+        tuple(hs.replace(" ", "") for hs in lang.head_sections[lang_dst]),
+    )
+
+
 def find_definitions(
     word: str,
     parsed_sections: Sections,
@@ -70,13 +155,16 @@ def find_definitions(
     lang_dst: str,
     *,
     all_templates: list[tuple[str, str, str]] | None = None,
+    ctx: RenderContext | None = None,
 ) -> Definitions:
     """Find all definitions, without eventual subtext."""
     definitions: Definitions = defaultdict(list)
 
     for pos, sections in parsed_sections.items():
         for section in sections:
-            if pos_defs := find_section_definitions(word, section, lang_src, lang_dst, all_templates=all_templates):
+            if pos_defs := find_section_definitions(
+                word, section, lang_src, lang_dst, all_templates=all_templates, ctx=ctx
+            ):
                 if lang_src == "en" and pos.startswith("etymology"):
                     # Most of the time, definitions are symbols outside a subsection, like in the "wa" word
                     pos = "symbol"
@@ -115,6 +203,17 @@ def es_replace_defs_list_with_numbered_lists(
     return regex_subitem.sub(r"\1## ", res)
 
 
+def with_contents(section: wtp.Section, contents: str) -> wtp.Section:
+    """Return a copy of *section* with other *contents*.
+    Sections share the parse tree of the whole Wikicode: altering one of them would shift, or kill, the others.
+
+    >>> with_contents(wtp.Section("== Title ==\\nold"), "new").string
+    '== Title ==\\nnew'
+    """
+    title_line = section.string[: len(section.string) - len(section.contents)]
+    return wtp.Section(f"{title_line}{contents}")
+
+
 def find_section_definitions(
     word: str,
     section: wtp.Section,
@@ -122,6 +221,7 @@ def find_section_definitions(
     lang_dst: str,
     *,
     all_templates: list[tuple[str, str, str]] | None = None,
+    ctx: RenderContext | None = None,
 ) -> list[Definition]:
     """Find definitions from the given *section*, with eventual sub-definitions."""
     definitions: list[Definition] = []
@@ -130,9 +230,9 @@ def find_section_definitions(
         if section.title.strip().lower().startswith(("forma adjetiva", "forma verbal")):
             return []
         if lists := section.get_lists(pattern="[:;]"):
-            section.contents = "".join(es_replace_defs_list_with_numbered_lists(lst) for lst in lists)
+            section = with_contents(section, "".join(es_replace_defs_list_with_numbered_lists(lst) for lst in lists))
 
-    ignored_terms = get_ignored_terms(lang_src, lang_dst)
+    ignored_terms = (ctx or get_render_context(lang_src, lang_dst)).ignored_terms
 
     if lists := section.get_lists(pattern=lang.section_patterns[lang_dst]):
         for a_list in lists:
@@ -189,6 +289,7 @@ def find_etymology(
     parsed_section: wtp.Section,
     *,
     all_templates: list[tuple[str, str, str]] | None = None,
+    ctx: RenderContext | None = None,
 ) -> list[Definition]:
     """Find the etymology.
 
@@ -224,7 +325,7 @@ def get_items(patterns: tuple[str, ...], *, skip: tuple[str, ...] | None = None)
             definitions: list[Definition] = []
             tables = parsed_section.tables
             tableindex = 0
-            ignored_terms = get_ignored_terms(lang_src, lang_dst)
+            ignored_terms = (ctx or get_render_context(lang_src, lang_dst)).ignored_terms
             for section in parsed_section.get_lists():
                 for idx, section_item in enumerate(section.items):
                     if any(ignore_me in section_item.lower() for ignore_me in ignored_terms):
@@ -306,20 +407,78 @@ def _find_pronunciations(top_sections: list[wtp.Section], lang_src: str, lang_ds
     return sorted(unique(results))
 
 
-def section_title(locale: str, section: wtp.Section) -> str:
-    title = section.title
-    if locale == "de":
+def section_title(locale: str, title: str | None) -> str:
+    if locale == "de" and title:
         title = title.split("(")[-1].strip(" )")
     return title.replace(" ", "").lower().strip() if title else ""
 
 
+def is_outside_markup(code: str, pos: int) -> bool:
+    """Check that *pos* is not inside a template, nor a link, of *code*.
+
+    >>> is_outside_markup("{{a}}\\n== b ==", 6)
+    True
+    >>> is_outside_markup("{{a|\\n== b ==\\n}}", 5)
+    False
+    """
+    return code.count("{{", 0, pos) == code.count("}}", 0, pos) and code.count("[[", 0, pos) == code.count("]]", 0, pos)
+
+
+def slice_top_sections(code: str, locale: str, level: int, head_sections: tuple[str, ...]) -> str | None:
+    """Cut out of *code* the top sections whose title starts with one of *head_sections*, without a full parse.
+    Return None when headings are ambiguous: the whole Wikicode has then to be parsed.
+
+    >>> code = "{{a}}\\n== {{langue|en}} ==\\nen\\n== {{langue|fr}} ==\\nfr\\n=== {{S|nom}} ===\\nnom\\n== {{langue|de}} ==\\nde\\n"
+    >>> slice_top_sections(code, "fr", 2, ("{{langue|fr}}",))
+    '== {{langue|fr}} ==\\nfr\\n=== {{S|nom}} ===\\nnom\\n'
+    >>> slice_top_sections(code, "fr", 2, ("{{langue|it}}",))
+    ''
+    >>> slice_top_sections("{{a|\\n== {{langue|fr}} ==\\n}}", "fr", 2, ("{{langue|fr}}",)) is None
+    True
+    >>> slice_top_sections("== {{langue\\n|fr}} ==\\nfr\\n", "fr", 2, ("{{langue|fr}}",)) is None
+    True
+    >>> slice_top_sections("<nowiki>\\n== {{langue|fr}} ==\\n</nowiki>", "fr", 2, ("{{langue|fr}}",)) is None
+    True
+    """
+    if UNPARSED_TAGS.search(code):
+        return None
+
+    spans: list[tuple[int, int]] = []
+    start = -1
+    for line in LINES_STARTING_WITH_EQUALS.finditer(code):
+        # A heading spanning several lines, because of a template or a link, or with odd equal signs
+        if not (heading := SECTION_HEADING(line[0])):
+            return None
+        if (current_level := len(heading[1])) > level:
+            continue
+        if start != -1:
+            spans.append((start, line.start()))
+            start = -1
+        if current_level == level and section_title(locale, heading[2]).startswith(head_sections):
+            start = line.start()
+    if start != -1:
+        spans.append((start, len(code)))
+
+    # A heading inside a template is not a heading
+    if not all(is_outside_markup(code, pos) for span in spans for pos in span):
+        return None
+
+    return "".join(code[start:end] for start, end in spans)
+
+
 def find_all_sections(
-    code: str, lang_src: str, lang_dst: str
+    code: str, lang_src: str, lang_dst: str, *, ctx: RenderContext | None = None
 ) -> tuple[list[wtp.Section], list[tuple[str, wtp.Section]]]:
     """Find all sections holding definitions."""
-    parsed = wtp.parse(code)
-    all_sections = []
     level = lang.section_level[lang_dst]
+    head_sections = (ctx or get_render_context(lang_src, lang_dst)).head_sections
+
+    # Parsing only the interesting top sections is way faster than parsing the whole multilingual page
+    # (the CA leading part, before any top section, is needed though)
+    if lang_src == "ca" or (text := slice_top_sections(code, lang_dst, level, head_sections)) is None:
+        text = code
+    parsed = wtp.parse(text)
+    all_sections = []
 
     # Add fake section for etymology if in the leading part
     if lang_src == "ca":
@@ -346,11 +505,10 @@ def find_all_sections(
             )
 
     # Get interesting top sections
-    head_sections = tuple(hs.replace(" ", "") for hs in lang.head_sections[lang_dst])
     top_sections = [
         section
         for section in parsed.get_sections(level=level)
-        if section_title(lang_dst, section).startswith(head_sections)
+        if section_title(lang_dst, section.title).startswith(head_sections)
     ]
 
     # Get all sections without any filtering
@@ -364,11 +522,13 @@ def find_all_sections(
     return top_sections, all_sections
 
 
-def find_sections(word: str, code: str, lang_src: str, lang_dst: str) -> tuple[list[wtp.Section], Sections]:
+def find_sections(
+    word: str, code: str, lang_src: str, lang_dst: str, *, ctx: RenderContext | None = None
+) -> tuple[list[wtp.Section], Sections]:
     """Find the correct section(s) holding the current locale definition(s)."""
     ret = defaultdict(list)
     wanted = lang.sections[lang_dst]
-    top_sections, all_sections = find_all_sections(code, lang_src, lang_dst)
+    top_sections, all_sections = find_all_sections(code, lang_src, lang_dst, ctx=ctx)
     for title, section in all_sections:
         title = title.lower()
         # Filter on interesting sections
@@ -430,7 +590,7 @@ def add_potential_variant(
         variants.append(variant_cleaned)
 
 
-def adjust_wikicode(code: str, locale: str) -> str:
+def adjust_wikicode(code: str, locale: str, *, ctx: RenderContext | None = None) -> str:
     r"""Sometimes we need to adapt the Wikicode.
 
     >>> adjust_wikicode("[[Fichier:Blason ville fr Petit-Bersac 24.svg|vignette|120px|'''Base''' d’or ''(sens héraldique)'']][[something|else]]", "fr")
@@ -495,36 +655,7 @@ def adjust_wikicode(code: str, locale: str) -> str:
 
     # Namespaces (moved from `utils.clean()` to be able to filter on multiple lines)
     # [[File:...|...]] → ''
-    all_namespaces = set()
-    for namespace in namespaces[locale] + namespaces["en"]:
-        all_namespaces.add(namespace)
-        all_namespaces.add(namespace.lower())
-    pattern = "|".join(iter(all_namespaces))
-    code = re.sub(
-        # Courtesy of Casimir et Hippolyte & Wiktor Stribiżew from https://stackoverflow.com/q/79006887/1117028
-        rf"""
-        # Match [[
-        \[\[
-
-        # Namespace followed by :
-        (?:{pattern}):
-
-        # Match any chars other than [ and ], or any ] that is not immediately followed with another ], or a [
-        # that is not immediately followed with [ or one or more digits + ]
-        [^][]*(?:](?!])[^][]*|\[(?!\[|\d+\])[^][]*)*
-
-        # Match zero or more occurrences of either [+digit(s)+], or strings between [[ and ]] and then any chars
-        # other than [ and ], or any ] that is not immediately followed with another ], or a [ that is not immediately
-        # followed with [ or one or more digits + ]
-        (?:(?:\[\d+\]|\[\[[^][]*(?:](?!])[^][]*|\[(?!\[)[^][]*)*\]\])[^][]*(?:](?!])[^][]*|\[(?!\[|\d+\])[^][]*)*)*
-
-        # Match ]]
-        ]]
-        """,
-        "",
-        code,
-        flags=re.VERBOSE,
-    )
+    code = (ctx or get_render_context(locale, locale)).namespaces_regex.sub("", code)
 
     # HTML comments (multiline supported)
     # <!-- foo --> → ''
@@ -562,9 +693,10 @@ def parse_word(
     called from `get_word.get_and_parse_word()`.
     """
     lang_src, lang_dst = utils.guess_locales(locale, use_log=False)
+    ctx = get_render_context(lang_src, lang_dst)
 
-    code = adjust_wikicode(code, lang_dst)
-    top_sections, parsed_sections = find_sections(word, code, lang_src, lang_dst)
+    code = adjust_wikicode(code, lang_dst, ctx=ctx)
+    top_sections, parsed_sections = find_sections(word, code, lang_src, lang_dst, ctx=ctx)
     prons = []
     genders = []
     etymology = []
@@ -574,19 +706,15 @@ def parse_word(
     # Etymology (pre-select sections)
     if lang_src != "sv" and parsed_sections:
         for section in lang.etyl_section[lang_dst]:
-            etymology_sections.extend(
-                wtp.Section(etyl_data.__str__()) for etyl_data in parsed_sections.pop(section, [])
-            )
+            etymology_sections.extend(parsed_sections.pop(section, []))
 
     # Definitions
     if parsed_sections:
-        definitions = find_definitions(word, parsed_sections, lang_src, lang_dst, all_templates=all_templates)
+        definitions = find_definitions(word, parsed_sections, lang_src, lang_dst, all_templates=all_templates, ctx=ctx)
     elif marker := {"no": "===", "pt": "=="}.get(lang_src):
         # Some words have no head sections but only a list of definitions at the root of the "top" section
-        for top in top_sections:
-            contents = top.contents
-            top.contents = contents[: contents.find(marker)]
-        definitions = find_definitions(word, {"top": top_sections}, lang_src, lang_dst)
+        top_sections = [with_contents(top, top.contents[: top.contents.find(marker)]) for top in top_sections]
+        definitions = find_definitions(word, {"top": top_sections}, lang_src, lang_dst, ctx=ctx)
     else:
         definitions = {}
 
@@ -598,10 +726,12 @@ def parse_word(
     if definitions:
         if lang_src == "sv":
             for top in top_sections:
-                etymology.extend(find_etymology(word, lang_src, lang_dst, top, all_templates=all_templates))
+                etymology.extend(find_etymology(word, lang_src, lang_dst, top, all_templates=all_templates, ctx=ctx))
         elif etymology_sections:
             for etyl_data in etymology_sections:
-                etymology.extend(find_etymology(word, lang_src, lang_dst, etyl_data, all_templates=all_templates))
+                etymology.extend(
+                    find_etymology(word, lang_src, lang_dst, etyl_data, all_templates=all_templates, ctx=ctx)
+                )
 
         if etymology:
             # Remove duplicates
@@ -625,28 +755,33 @@ def parse_word(
     return Word(prons, genders, etymology, definitions, variants)
 
 
-def load(file: Path) -> dict[str, str]:
-    """Load the JSON file containing all words and their details."""
-    with file.open(encoding="utf-8") as fh:
-        words: dict[str, str] = json.load(fh)
+def load(file: Path) -> Store:
+    """Load the store file containing all words and their Wikicode.
+    Nothing is read upfront: words are retrieved from the memory-mapped file on access.
+    """
+    words = Store(file)
     log.info("Loaded %s words from %s", f"{len(words):,}", file)
     return words
 
 
 def render_word(
-    w: list[str],
+    w: Sequence[str],
     words: Words,
     locale: str,
     *,
     all_templates: list[tuple[str, str, str]] | None = None,
+    failed: list[str] | None = None,
 ) -> Word | None:
     word, code = w
     try:
         details = parse_word(word, code, locale, all_templates=all_templates)
     except KeyboardInterrupt:
-        pass
+        if failed is not None:
+            failed.append(word)
     except Exception:
         log.exception("ERROR with %r", word)
+        if failed is not None:
+            failed.append(word)
     else:
         if details.definitions or details.variants:
             words[word] = details
@@ -658,32 +793,259 @@ def render_word(
     return None
 
 
-def render(in_words: dict[str, str], locale: str, workers: int) -> Words:
-    manager = multiprocessing.Manager()
-    results: Words = cast(dict[str, Word], manager.dict())
-    all_templates: list[tuple[str, str, str]] = cast(list[tuple[str, str, str]], manager.list())
+def render(
+    in_words: Mapping[str, str],
+    locale: str,
+    workers: int,
+    *,
+    cache_file: Path | None = None,
+    profile: profiler.Profile | None = None,
+) -> Words:
+    """Render all words, and keep them in memory. See `iter_render()` to not keep all of them."""
+    return {
+        word: details
+        for words in iter_render(in_words, locale, workers, cache_file=cache_file, profile=profile)
+        for word, details in words.items()
+    }
+
+
+def iter_render(
+    in_words: Mapping[str, str],
+    locale: str,
+    workers: int,
+    *,
+    cache_file: Path | None = None,
+    profile: profiler.Profile | None = None,
+) -> Generator[Words]:
+    """Render all words, and yield them by batches as soon as workers are done with them.
+    When *cache_file* is set, words whose Wikicode did not change since the previous run are taken from the cache,
+    and the cache is then rewritten with words of the current run.
+    When *profile* is set, timings of words, templates, and template handlers, are recorded into it.
+    """
+    if cache_file:
+        yield from iter_render_incremental(in_words, locale, workers, cache_file, profile=profile)
+        return
 
-    with suppress(KeyboardInterrupt), multiprocessing.Pool(processes=workers) as pool:
-        pool.map(
-            partial(render_word, words=results, locale=locale, all_templates=all_templates),
-            in_words.items(),
-        )
+    with suppress(KeyboardInterrupt):
+        for words, _ in iter_render_batches(in_words, locale, workers, profile=profile):
+            yield words
 
-    utils.check_for_missing_templates(list(all_templates))
 
-    return results.copy()
+def iter_render_batches(
+    in_words: Mapping[str, str],
+    locale: str,
+    workers: int,
+    *,
+    profile: profiler.Profile | None = None,
+) -> Generator[tuple[Words, list[str]]]:
+    """Render all words, and yield them by batches, along with names of words rendered without error.
+    A KeyboardInterrupt is not suppressed, so that callers know the rendering is incomplete.
+    """
+    all_templates: TemplatesStats = Counter()
+    cache_stats: TemplatesCacheStats = Counter()
+    slowest: list[tuple[float, str]] = []
+    total = len(in_words)
+    done = 0
+    start = last_report = monotonic()
+
+    # Locales are imported on demand: import it before forking, to not have every worker importing it again
+    get_render_context(*utils.guess_locales(locale, use_log=False))
+
+    try:
+        with multiprocessing.Pool(processes=workers) as pool:
+            for count, words, rendered, templates, templates_cache, timings, timings_profile in pool.imap_unordered(
+                partial(render_batch, locale=locale, profile=profile is not None),
+                get_batches(in_words),
+            ):
+                yield words, rendered
+                all_templates.update(templates)
+                cache_stats.update(templates_cache)
+                slowest = heapq.nlargest(SLOWEST_WORDS_COUNT, slowest + timings)
+                if profile is not None and timings_profile is not None:
+                    profile.update(timings_profile)
+
+                done += count
+                if (now := monotonic()) - last_report >= PROGRESS_INTERVAL:
+                    last_report = now
+                    speed = done / (now - start)
+                    log.info(
+                        "Rendered %s/%s words (%s words/s, ETA %s)",
+                        f"{done:,}",
+                        f"{total:,}",
+                        f"{speed:,.1f}",
+                        timedelta(seconds=round((total - done) / speed)),
+                    )
+    finally:
+        utils.check_for_missing_templates(all_templates)
+        utils.log_templates_cache_stats(cache_stats)
+
+        if slowest:
+            log.info("Slowest words: %s", ", ".join(f"{word!r} ({duration:.2f} s)" for duration, word in slowest))
+
+
+def get_batches(in_words: Mapping[str, str]) -> Generator[list[tuple[str, str]]]:
+    """Yield batches of words to render, the biggest Wikicode first so that long pages do not stall the last batches.
+    A batch holds up to RENDER_BATCH_SIZE words, or RENDER_BATCH_BYTES of Wikicode (a big page is rendered alone).
+    """
+    # Store files give the size of values without having to read them
+    sizes = in_words.iter_sizes() if isinstance(in_words, Store) else ((w, len(c)) for w, c in in_words.items())
+
+    batch: list[tuple[str, str]] = []
+    batch_size = 0
+    for size, word in sorted(((size, word) for word, size in sizes), reverse=True):
+        if batch and (batch_size + size > RENDER_BATCH_BYTES or len(batch) == RENDER_BATCH_SIZE):
+            yield batch
+            batch = []
+            batch_size = 0
+        batch.append((word, in_words[word]))
+        batch_size += size
+
+    if batch:
+        yield batch
+
+
+def render_batch(
+    batch: Iterable[Sequence[str]],
+    locale: str,
+    *,
+    profile: bool = False,
+) -> tuple[
+    int, Words, list[str], TemplatesStats, TemplatesCacheStats, list[tuple[float, str]], profiler.Profile | None
+]:
+    """Render a batch of words (multiprocessing worker).
+    Rendered words, names of words rendered without error (with, or without, definitions), deduplicated templates
+    statistics, templates cache statistics, the slowest words, and timings when *profile* is True, are sent back
+    to the parent process at once.
+    """
+    words: Words = {}
+    failed: list[str] = []
+    all_templates: list[tuple[str, str, str]] = []
+    timings: list[tuple[float, str]] = []
+    if profile:
+        profiler.start()
+    for w in batch:
+        start = perf_counter()
+        render_word(w, words, locale, all_templates=all_templates, failed=failed)
+        timings.append((duration := perf_counter() - start, w[0]))
+        if profiler.PROFILE is not None:
+            profiler.PROFILE.add_word(locale, w[0], duration)
+    return (
+        len(timings),
+        words,
+        [word for _, word in timings if word not in failed],
+        Counter(all_templates),
+        utils.TEMPLATES_CACHE.pop_stats(),
+        heapq.nlargest(SLOWEST_WORDS_COUNT, timings),
+        profiler.stop(),
+    )
+
+
+def iter_render_incremental(
+    in_words: Mapping[str, str],
+    locale: str,
+    workers: int,
+    cache_file: Path,
+    *,
+    profile: profiler.Profile | None = None,
+) -> Generator[Words]:
+    """Render words not found in the render cache, keyed on the word and its Wikicode.
+    The cache is rewritten with words of the current run only, so that it does not grow indefinitely.
+    Words whose rendering failed are not cached, and the cache is left untouched when the rendering is interrupted.
+    """
+    version = f"{locale}:{get_code_version()}"
+    cached: Words = {}
+    to_render: dict[str, str] = {}
+
+    # On KeyboardInterrupt, the writer is aborted before the exception is suppressed
+    with suppress(KeyboardInterrupt), StoreWriter(cache_file) as writer:
+        writer.add("", version)
+
+        previous = Store(cache_file) if cache_file.is_file() else None
+        if previous is not None and previous.get("") != version:
+            log.info("Code changed since the render cache was written, all words will be rendered")
+            previous.close()
+            previous = None
+
+        for word, code in in_words.items():
+            if (
+                previous is None
+                or not is_cacheable(code)
+                or (value := previous.get(key := get_cache_key(word, code))) is None
+            ):
+                to_render[word] = code
+                continue
+            writer.add(key, value)
+            # Words without definitions are cached too, to not render them again
+            if value != "null":
+                cached[word] = Word(*json.loads(value))
+                if len(cached) == RENDER_BATCH_SIZE:
+                    yield cached
+                    cached = {}
+
+        if previous is not None:
+            previous.close()
+        if cached:
+            yield cached
+
+        log.info("Render cache: %s hits, %s misses", f"{len(in_words) - len(to_render):,}", f"{len(to_render):,}")
+
+        for words, rendered in iter_render_batches(to_render, locale, workers, profile=profile):
+            for word in rendered:
+                if is_cacheable(code := to_render[word]):
+                    # Words without definitions are cached too, to not render them again
+                    details = words.get(word)
+                    writer.add(
+                        get_cache_key(word, code),
+                        "null" if details is None else json.dumps(details, ensure_ascii=False),
+                    )
+            yield words
+
+
+@cache
+def get_code_version() -> str:
+    """Get the digest of the source code involved in the rendering: any change invalidates the render cache."""
+    digest = hashlib.blake2b(wtp.__version__.encode())
+    root = Path(__file__).parent
+    for file in sorted(root.rglob("*.py")):
+        digest.update(file.relative_to(root).as_posix().encode())
+        digest.update(file.read_bytes())
+    return digest.hexdigest()
+
+
+def get_cache_key(word: str, code: str) -> str:
+    return hashlib.blake2b(f"{word}\0{code}".encode(), digest_size=16).hexdigest()
+
+
+def is_cacheable(code: str) -> bool:
+    """Check that the rendering of *code* only depends on it: words using templates reading other pages
+    (transclusion), or fetching data over the network (Wikidata), are never cached.
+
+    >>> is_cacheable("# {{lien|chat|fr}}")
+    True
+    >>> is_cacheable("# {{tcl|en|Macau|id=Q14773}}")
+    False
+    >>> is_cacheable("{{coined|en|Q42}}")
+    False
+    """
+    return not UNCACHEABLE_TEMPLATES(code)
 
 
-def save(output: Path, words: Words) -> None:
-    """Persist data."""
-    with output.open(mode="w", encoding="utf-8") as fh:
-        json.dump(words, fh, ensure_ascii=False, indent=4, sort_keys=True)
-    log.info("Saved %s words into %s", f"{len(words):,}", output)
+def save(output: Path, all_words: Iterable[Words]) -> int:
+    """Persist data, batch by batch, as soon as words are rendered. Return the number of saved words."""
+    with StoreWriter(output) as writer:
+        for words in all_words:
+            for word, details in words.items():
+                writer.add(word, json.dumps(details, ensure_ascii=False))
+        # Checked before closing the writer, so that the output file is not created when the check fails
+        hook_after(count := len(writer))
 
+    log.info("Saved %s words into %s", f"{count:,}", output)
+    return count
 
-def get_latest_json_file(source_dir: Path) -> Path | None:
-    """Get the name of the last data_wikicode-*.json file."""
-    if not (files := list(source_dir.glob(f"data_wikicode-{'[0-9]' * 8}.json"))):
+
+def get_latest_wikicode_file(source_dir: Path) -> Path | None:
+    """Get the name of the last data_wikicode-*.bin file."""
+    if not (files := list(source_dir.glob(f"data_wikicode-{'[0-9]' * 8}.bin"))):
         return None
     return sorted(files)[-1]
 
@@ -693,34 +1055,58 @@ def get_source_dir(lang_src: str, lang_dst: str) -> Path:
 
 
 def get_output_file(source_dir: Path, snapshot: str) -> Path:
-    return source_dir / f"data-{snapshot}.json"
+    return source_dir / f"data-{snapshot}.bin"
+
 
+def get_cache_file(source_dir: Path) -> Path:
+    return source_dir / "render-cache.bin"
 
-def hook_after(words: Words) -> None:
-    if not words:
+
+def get_profile_file(source_dir: Path, snapshot: str) -> Path:
+    return source_dir / f"render-profile-{snapshot}.json"
+
+
+def hook_after(count: int) -> None:
+    if not count:
         raise ValueError("Empty dictionary?!")
 
 
-def main(locale: str, *, workers: int = multiprocessing.cpu_count()) -> int:
-    """Entry point."""
+def main(
+    locale: str,
+    *,
+    workers: int = multiprocessing.cpu_count(),
+    incremental: bool = False,
+    profile: bool = False,
+) -> int:
+    """Entry point.
+    When *incremental* is True, only words whose Wikicode changed since the previous run are rendered.
+    When *profile* is True, the slowest words, templates, and template handlers, are reported.
+    """
 
     start = monotonic()
     lang_src, lang_dst = utils.guess_locales(locale)
 
     source_dir = get_source_dir(lang_src, lang_dst)
-    if not (input_file := get_latest_json_file(source_dir)):
+    if not (input_file := get_latest_wikicode_file(source_dir)):
         log.error("No dump found. Run with --parse first ... ")
         return 1
 
     log.info("Loading %s ...", input_file)
-    in_words: dict[str, str] = load(input_file)
+    with load(input_file) as in_words:
+        log.info("Rendering ...")
+        workers = workers or multiprocessing.cpu_count()
+        timings = profiler.Profile() if profile else None
+        if incremental:
+            words = iter_render(in_words, locale, workers, cache_file=get_cache_file(source_dir), profile=timings)
+        else:
+            words = iter_render(in_words, locale, workers, profile=timings)
 
-    log.info("Rendering ...")
-    workers = workers or multiprocessing.cpu_count()
-    hook_after(words := render(in_words, locale, workers))
+        snapshot = input_file.stem.split("-")[-1]
+        output = get_output_file(source_dir, snapshot)
+        save(output, words)
 
-    output = get_output_file(source_dir, input_file.stem.split("-")[-1])
-    save(output, words)
+    if timings is not None:
+        profiler.save(timings, get_profile_file(source_dir, snapshot))
 
     log.info("Render done in %s!", timedelta(seconds=monotonic() - start))
 
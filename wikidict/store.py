@@ -0,0 +1,233 @@
+"""Memory-mappable key/value store, used for intermediate data between stages.
+
+File layout (all integers are little-endian):
+
+    - Header: magic, entries count, and offset of the index.
+    - Data: concatenated UTF-8 keys and values, in insertion order.
+    - Index: one record per entry (offset of the key, key length, value length), sorted by key.
+
+Keys are sorted on their UTF-8 encoding, which is the same order as Python `str` comparisons.
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+from collections.abc import ItemsView, Mapping
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from types import TracebackType
+    from typing import Self
+
+MAGIC = b"WDSTORE1"
+HEADER = struct.Struct("<8sQQ")
+RECORD = struct.Struct("<QII")
+
+
+class Store(Mapping[str, str]):
+    """Read-only, lazy, mapping backed by a memory-mapped store file.
+
+    >>> from tempfile import TemporaryDirectory
+    >>> with TemporaryDirectory() as tmp:
+    ...     file = Path(tmp) / "data.bin"
+    ...     with StoreWriter(file) as writer:
+    ...         writer.add("é", "1")
+    ...         writer.add("a", "2")
+    ...         writer.add("é", "3")
+    ...     with Store(file) as store:
+    ...         len(store), list(store.items()), store["é"], store.get("b")
+    (2, [('a', '2'), ('é', '3')], '3', None)
+    """
+
+    def __init__(self, file: Path) -> None:
+        self.file = file
+        with file.open(mode="rb") as fh:
+            try:
+                self._data = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # An empty file cannot be mapped
+                raise ValueError(f"{file} is not a store file.") from None
+
+        size = len(self._data)
+        if size < HEADER.size or (header := HEADER.unpack_from(self._data))[0] != MAGIC:
+            self.close()
+            raise ValueError(f"{file} is not a store file.")
+
+        _, self._count, self._index = header
+        # The index is written last, right after the data
+        if not HEADER.size <= self._index <= size or self._index + self._count * RECORD.size != size:
+            self.close()
+            raise ValueError(f"{file} is a truncated, or corrupted, store file.")
+
+    def __reduce__(self) -> tuple[type[Store], tuple[Path]]:
+        # Only the path is transferred to another process, the file will be mapped there again
+        return (type(self), (self.file,))
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._data.close()
+
+    def _record(self, idx: int) -> tuple[int, int, int]:
+        offset, key_size, value_size = RECORD.unpack_from(self._data, self._index + idx * RECORD.size)
+        return offset, key_size, value_size
+
+    def __getitem__(self, key: str) -> str:
+        needle = key.encode()
+        data = self._data
+        low, high = 0, self._count
+        while low < high:
+            mid = (low + high) // 2
+            offset, key_size, value_size = self._record(mid)
+            current = data[offset : offset + key_size]
+            if current < needle:
+                low = mid + 1
+            elif current > needle:
+                high = mid
+            else:
+                offset += key_size
+                return data[offset : offset + value_size].decode()
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        data = self._data
+        for offset, key_size, _ in RECORD.iter_unpack(data[self._index : self._index + self._count * RECORD.size]):
+            yield data[offset : offset + key_size].decode()
+
+    def __len__(self) -> int:
+        return int(self._count)
+
+    def iter_sizes(self) -> Iterator[tuple[str, int]]:
+        """Iterate over all (key, value size in bytes) pairs, sorted by key, without reading values."""
+        data = self._data
+        for offset, key_size, value_size in RECORD.iter_unpack(
+            data[self._index : self._index + self._count * RECORD.size]
+        ):
+            yield data[offset : offset + key_size].decode(), value_size
+
+    def items(self) -> StoreItemsView:
+        return StoreItemsView(self)
+
+    def iter_items(self) -> Iterator[tuple[str, str]]:
+        """Iterate over all (key, value) pairs, sorted by key, without binary searches."""
+        data = self._data
+        for offset, key_size, value_size in RECORD.iter_unpack(
+            data[self._index : self._index + self._count * RECORD.size]
+        ):
+            value_offset = offset + key_size
+            yield data[offset:value_offset].decode(), data[value_offset : value_offset + value_size].decode()
+
+
+class StoreItemsView(ItemsView[str, str]):
+    _mapping: Store
+
+    def __iter__(self) -> Iterator[tuple[str, str]]:
+        return self._mapping.iter_items()
+
+
+class DecodedStore[V](Mapping[str, V]):
+    """Read-only mapping of a store file whose values are decoded on access, e.g. from JSON.
+    Only the file path, and the decoder, are pickled: another process maps the file again instead of receiving
+    a copy of all values. The *decode* function must then be picklable (a module-level function).
+
+    >>> import json
+    >>> from tempfile import TemporaryDirectory
+    >>> with TemporaryDirectory() as tmp:
+    ...     file = Path(tmp) / "data.bin"
+    ...     with StoreWriter(file) as writer:
+    ...         writer.add("a", "[1, 2]")
+    ...     with Store(file) as store:
+    ...         decoded = DecodedStore(store, json.loads)
+    ...         decoded["a"], dict(decoded.items()), "b" in decoded
+    ([1, 2], {'a': [1, 2]}, False)
+    """
+
+    def __init__(self, store: Store, decode: Callable[[str], V]) -> None:
+        self.store = store
+        self.decode = decode
+
+    def __getitem__(self, key: str) -> V:
+        return self.decode(self.store[key])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.store)
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def items(self) -> DecodedStoreItemsView[V]:
+        return DecodedStoreItemsView(self)
+
+
+class DecodedStoreItemsView[V](ItemsView[str, V]):
+    _mapping: DecodedStore[V]
+
+    def __iter__(self) -> Iterator[tuple[str, V]]:
+        decode = self._mapping.decode
+        for key, value in self._mapping.store.iter_items():
+            yield key, decode(value)
+
+
+class StoreWriter:
+    """Write a store file entry by entry, values being written as soon as they are added.
+    When a key is added several times, the last value wins.
+    The file is only visible once completely written.
+    """
+
+    def __init__(self, file: Path) -> None:
+        self.file = file
+        self._tmp_file = file.with_name(f"{file.name}.tmp")
+        self._fh = self._tmp_file.open(mode="wb")
+        self._fh.write(HEADER.pack(MAGIC, 0, 0))
+        self._offset = HEADER.size
+        self._entries: dict[bytes, tuple[int, int]] = {}
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._fh.close()
+            self._tmp_file.unlink(missing_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, key: str, value: str) -> None:
+        raw_key = key.encode()
+        raw_value = value.encode()
+        self._entries[raw_key] = (self._offset, len(raw_value))
+        self._offset += self._fh.write(raw_key) + self._fh.write(raw_value)
+
+    def update(self, items: Iterable[tuple[str, str]]) -> None:
+        for key, value in items:
+            self.add(key, value)
+
+    def close(self) -> None:
+        fh = self._fh
+        fh.writelines(
+            RECORD.pack(offset, len(key), value_size) for key, (offset, value_size) in sorted(self._entries.items())
+        )
+        fh.seek(0)
+        fh.write(HEADER.pack(MAGIC, len(self._entries), self._offset))
+        fh.close()
+        self._tmp_file.replace(self.file)
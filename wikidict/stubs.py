@@ -1,5 +1,7 @@
 """Type annotations."""
 
+from collections import Counter
+from collections.abc import Mapping
 from typing import NamedTuple
 
 SubDefinition = str | tuple[str, ...]
@@ -7,6 +9,10 @@
 Definitions = dict[str, list[Definition]]
 Parts = tuple[str, ...]
 Variants = dict[str, list[str]]
+# (template, word, status) -> occurrences
+TemplatesStats = Counter[tuple[str, str, str]]
+# (locale, "hits" or "misses") -> occurrences
+TemplatesCacheStats = Counter[tuple[str, str]]
 
 
 class Word(NamedTuple):
@@ -18,4 +24,31 @@ class Word(NamedTuple):
 
 
 Words = dict[str, Word]
-Groups = dict[str, Words]
+# prefix -> words
+Groups = dict[str, list[str]]
+
+
+# HTML of a word shared by all formatters, see `convert.render_fragments()`
+class Fragments(NamedTuple):
+    pronunciation: str
+    gender: str
+    # (part of speech, HTML list of definitions)
+    definitions: list[tuple[str, str]]
+    etymology: str
+
+
+# Variants of a word shared by all formatters, see `convert.resolve_variants()`
+class ResolvedVariants(NamedTuple):
+    variants: list[str]
+    # Lowercased, and trimmed, variants (Kobo)
+    normalized: list[str]
+
+
+# word -> resolved variants
+VariantIndex = dict[str, ResolvedVariants]
+
+# Read-only words, variants, and fragments, given to formatters (dicts, or store files decoded on access)
+WordsMapping = Mapping[str, Word]
+VariantsMapping = Mapping[str, list[str]]
+VariantIndexMapping = Mapping[str, ResolvedVariants]
+FragmentsMapping = Mapping[str, Fragments]
@@ -2,20 +2,22 @@
 
 from __future__ import annotations
 
+import ast
 import logging
 import os
 import re
-import subprocess
-from collections import defaultdict, namedtuple
+from collections import Counter, OrderedDict, defaultdict, namedtuple
 from datetime import UTC, datetime
 from functools import cache, partial
-from pathlib import Path
+from itertools import chain
+from operator import attrgetter
+from time import perf_counter
 from typing import TYPE_CHECKING
 
 import regex
 import wikitextparser
 
-from . import constants, part_of_speech, svg
+from . import constants, part_of_speech, profiler, svg
 from .hiero_utils import render_hiero
 from .lang import (
     last_template_handler,
@@ -25,12 +27,16 @@
     templates_italic,
     templates_multi,
     templates_other,
+    templates_pure,
     thousands_separator,
 )
 from .user_functions import *  # noqa: F403
 
 if TYPE_CHECKING:
     from collections.abc import Callable
+    from types import CodeType
+
+    from .stubs import TemplatesCacheStats, TemplatesStats
 
 
 # Magic words (small part, only data/time related)
@@ -66,18 +72,25 @@
 
 KEEP_UNFINISHED = os.getenv("KEEP_UNFINISHED", "0") == "1"
 
+# Minimum count of templates in a text to expand them using a tree of templates, see `expand_templates()`
+TEMPLATES_TREE_MIN_COUNT = 512
+
+# Maximum number of rendered pure templates kept in memory (0 to disable the cache), see `get_pure_templates()`
+TEMPLATES_CACHE_SIZE = int(os.getenv("TEMPLATES_CACHE_SIZE", "50000"))
+
 log = logging.getLogger(__name__)
 
 
-def check_for_missing_templates(all_templates: list[tuple[str, str, str]]) -> bool:
+def check_for_missing_templates(all_templates: list[tuple[str, str, str]] | TemplatesStats) -> bool:
     missings_counts: dict[str, int] = defaultdict(int)
     missings: dict[str, set[str]] = defaultdict(set)
     skipped: set[str] = set()
     unique_templates: set[str] = set()
-    for tpl, word, status in all_templates:
+    stats = all_templates if isinstance(all_templates, Counter) else Counter(all_templates)
+    for (tpl, word, status), count in stats.items():
         unique_templates.add(tpl)
         if status == "missed":
-            missings_counts[tpl] += 1
+            missings_counts[tpl] += count
             missings[tpl].add(word)
         elif status == "skipped" and word not in skipped:
             log.warning("Skipped: %r", word)
@@ -318,12 +331,6 @@ def format_pos(locale: str, value: str) -> str:
     return value.strip().title()
 
 
-def grep(file: Path, pattern: str) -> str:
-    """Find the given text `pattern` line in `file`."""
-    command = ["/bin/fgrep", pattern, str(file)]
-    return subprocess.check_output(command, env={"LC_ALL": "C"}).strip().decode("utf-8")
-
-
 @cache
 def is_cyrillic(char: str) -> bool:
     """Check if a character is Cyrillic."""
@@ -596,6 +603,80 @@ def guess_prefix(word: str) -> str:
     return prefix if prefix.isalpha() else "11"
 
 
+def clean_substitution(
+    pattern: str | regex.Pattern[str], repl: str | Callable[[re.Match[str]], str]
+) -> Callable[[str], str]:
+    """Compile a substitution used by `clean()`."""
+    compiled = pattern if isinstance(pattern, regex.Pattern) else re.compile(pattern)
+    return partial(compiled.sub, repl)
+
+
+CLEAN_MATH_ATTRIBUTES = clean_substitution(r"<math\s+[^>]+>(.+?)</math>", r"<math>\1</math>")
+CLEAN_MATH_FORMULAS = re.compile(r"(<math>.+?</math>)").findall
+
+# Substitutions done by `clean()`, in order, as (string needed for the substitution to change the text, substitution)
+CLEAN_SUBSTITUTIONS: tuple[tuple[str, Callable[[str], str]], ...] = (
+    # HTML
+    # Source: https://github.com/5j9/wikitextparser/blob/b24033b/wikitextparser/_wikitext.py#L83
+    ("'''", clean_substitution(regex.compile(r"'''(\0*+[^'\n]++.*?)(?:''')"), "<b>\\1</b>")),
+    # ''foo'' → <i>foo></i>
+    ("''", clean_substitution(regex.compile(r"''(\0*+[^'\n]++.*?)(?:'')"), "<i>\\1</i>")),
+    # (outside of {{code|...}}) <br> / <br /> → ''
+    ("<br", clean_substitution(r"(?<!code\|html\|)<br[^>]*/?>", "")),
+    # <nowiki/> → ''
+    ("<nowiki/>", clean_substitution(r"<nowiki/>", "")),
+    # <nowiki>»</nowiki> → '»'
+    ("<nowiki>", clean_substitution(r"<nowiki>([^<]+)</nowiki>", r"\1")),
+    # <gallery>
+    ("<gallery>", clean_substitution(r"<gallery>[\s\S]*?</gallery>", "")),
+    # Local links
+    ("[[", clean_substitution(r"\[\[([^||:\]]+)\]\]", "\\1")),  # [[a]] → a
+    # Links
+    # Internal: [[{{a|b}}]] → {{a|b}}
+    ("[[{{", clean_substitution(r"\[\[({{[^}]+}})\]\]", "\\1")),
+    # Internal: [[a|b]] → b
+    ("[[", clean_substitution(r"\[\[[^|]+\|(.+?(?=\]\]))\]\]", "\\1")),
+    # External: [[http://example.com Some text]] → ''
+    ("[[http", clean_substitution(r"\[\[https?://[^\s]+\s[^\]]+\]\]", "")),
+    # External: [http://example.com] → ''
+    ("[http", clean_substitution(r"\[https?://[^\s\]]+\]", "")),
+    # External: [http://example.com Some text] → 'Some text'
+    ("[http", clean_substitution(r"\[https?://[^\s]+\s([^\]]+)\]", r"\1")),
+    # External: [//example.com Some text] → 'Some text'
+    ("[//", clean_substitution(r"\[//[^\s]+\s([^\]]+)\]", r"\1")),
+    ("[[", clean_substitution(r"\[\[", "")),
+    ("]]", clean_substitution(r"\]\]", "")),
+    # Tables
+    # {|foo..|}
+    ("{|", clean_substitution(r"{\|[^}]+\|}", "")),
+    # Headings
+    # == a == → a
+    ("=", clean_substitution(r"^=+\s?([^=]+)\s?=+", lambda matches: matches.group(1).strip())),
+    # Lists
+    ("*", clean_substitution(r"^\*+\s?", "")),
+    # Magic words
+    ("__", clean_substitution(r"__[A-Z]+__", "")),  # __TOC__
+    # Remove extra quotes left
+    ("''", clean_substitution(r"''", "")),
+    # Remove extra brackets left
+    (" []", clean_substitution(r" \[\]", "")),
+    (" ]", clean_substitution(r" \]", "")),
+    # Remove empty HTML tags
+    # <sup></sup> → ''
+    ("></", clean_substitution(r"<([^>]+)></\1>", "")),
+    # Remove extra spaces
+    ("", clean_substitution(r"\s{2,}", " ")),
+    (".", clean_substitution(r"\s{1,}\.", ".")),
+    # <<bar>> → foo
+    ("<<", clean_substitution(r"<<([^/>]+)>>", "\\1")),
+    # <<foo/bar>> → bar
+    # ("<<", clean_substitution(r"<<(?:[^/>]+)/([^>]+)>>", "\\1")),
+    # Convert single "< ", and " >" to HTML quotes
+    ("< ", clean_substitution(r"< ", "&lt; ")),
+    (" >", clean_substitution(r" >", " &gt;")),
+)
+
+
 def clean(text: str) -> str:
     r"""Cleans up the provided Wikicode.
     Removes templates, tables, parser hooks, magic words, HTML tags and file embeds.
@@ -699,97 +780,216 @@ def clean(text: str) -> str:
         '&gt;'
     """
 
-    # Speed-up lookup
-    sub = re.sub
-    sub2 = regex.sub
-
     # <math style="bla" foo=bar>formula</math> → <math>formula</math>
-    text = re.sub(r"<math\s+[^>]+>(.+?)</math>", r"<math>\1</math>", text)
+    if "<math" in text:
+        text = CLEAN_MATH_ATTRIBUTES(text)
 
     # Save <math> formulas to prevent altering them
-    if formulas := re.findall(r"(<math>.+?</math>)", text):
-        for idx, formula in enumerate(formulas):
-            text = text.replace(formula, f"##math{idx}##")
+    formulas = CLEAN_MATH_FORMULAS(text) if "<math>" in text else []
+    for idx, formula in enumerate(formulas):
+        text = text.replace(formula, f"##math{idx}##")
 
     # Remove line breaks
     text = text.replace("\n", "")
 
-    # HTML
-    # Source: https://github.com/5j9/wikitextparser/blob/b24033b/wikitextparser/_wikitext.py#L83
-    text = sub2(r"'''(\0*+[^'\n]++.*?)(?:''')", "<b>\\1</b>", text)
-    # ''foo'' → <i>foo></i>
-    text = sub2(r"''(\0*+[^'\n]++.*?)(?:'')", "<i>\\1</i>", text)
-    # (outside of {{code|...}}) <br> / <br /> → ''
-    text = sub(r"(?<!code\|html\|)<br[^>]*/?>", "", text)
+    # Substitutions are only applied when the text contains what they are looking for
+    for needle, substitute in CLEAN_SUBSTITUTIONS:
+        if needle in text:
+            text = substitute(text)
 
-    # <nowiki/> → ''
-    text = text.replace("<nowiki/>", "")
-    # <nowiki>»</nowiki> → '»'
-    text = sub("<nowiki>([^<]+)</nowiki>", r"\1", text)
+    # Restore math formulas
+    for idx, formula in enumerate(formulas):
+        text = text.replace(f"##math{idx}##", formula)
 
-    # <gallery>
-    text = sub(r"<gallery>[\s\S]*?</gallery>", "", text)
+    return text.strip()
 
-    # Local links
-    text = sub(r"\[\[([^||:\]]+)\]\]", "\\1", text)  # [[a]] → a
 
-    # Links
-    # Internal: [[{{a|b}}]] → {{a|b}}
-    text = sub(r"\[\[({{[^}]+}})\]\]", "\\1", text)
-    # Internal: [[a|b]] → b
-    text = sub(r"\[\[[^|]+\|(.+?(?=\]\]))\]\]", "\\1", text)
-    # External: [[http://example.com Some text]] → ''
-    text = sub(r"\[\[https?://[^\s]+\s[^\]]+\]\]", "", text)
-    # External: [http://example.com] → ''
-    text = sub(r"\[https?://[^\s\]]+\]", "", text)
-    # External: [http://example.com Some text] → 'Some text'
-    text = sub(r"\[https?://[^\s]+\s([^\]]+)\]", r"\1", text)
-    # External: [//example.com Some text] → 'Some text'
-    text = sub(r"\[//[^\s]+\s([^\]]+)\]", r"\1", text)
-    text = text.replace("[[", "").replace("]]", "")
+class TemplateNode:
+    """A template of the templates tree, see `parse_templates_tree()`."""
 
-    # Tables
-    # {|foo..|}
-    text = sub(r"{\|[^}]+\|}", "", text)
+    __slots__ = ("items", "parent", "pending", "position", "text")
 
-    # Headings
-    # == a == → a
-    text = sub(r"^=+\s?([^=]+)\s?=+", lambda matches: matches.group(1).strip(), text)
+    def __init__(self, parent: TemplateNode | None, position: int) -> None:
+        # Literal text, and nested templates
+        self.items: list[str | TemplateNode] = []
+        self.parent = parent
+        # Count of nested templates not expanded yet
+        self.pending = 0
+        # Index of the template in the text, templates being sorted by their opening braces
+        self.position = position
+        # The template, once nested templates are expanded, and then the template expansion
+        self.text = ""
 
-    # Lists
-    text = sub(r"^\*+\s?", "", text)
+    def flatten(self) -> str:
+        return "".join(item if isinstance(item, str) else item.text for item in self.items)
 
-    # Magic words
-    text = sub(r"__[A-Z]+__", "", text)  # __TOC__
 
-    # Remove extra quotes left
-    text = text.replace("''", "")
+def parse_templates_tree(
+    text: str,
+    *,
+    braces: re.Pattern[str] = re.compile(r"{{|}}|[{}]"),
+) -> tuple[list[str | TemplateNode], list[TemplateNode]] | None:
+    """Tokenize *text* once into a tree of templates.
+    Return the root items, and all templates sorted by position.
+    Return None when braces are not well balanced (a single brace, an unclosed template, ...).
+
+        >>> root, nodes = parse_templates_tree("a {{b|{{c}}|{{d}}}} e {{f}}")
+        >>> [node.flatten() for node in nodes if not node.pending]
+        ['c', 'd', 'f']
+        >>> root[1].items[0], root[1].pending
+        ('b|', 2)
+        >>> parse_templates_tree("{{a|{b}}}") is None
+        True
+    """
+    root: list[str | TemplateNode] = []
+    nodes: list[TemplateNode] = []
+    current: TemplateNode | None = None
+    position = 0
+
+    for brace in braces.finditer(text):
+        if (start := brace.start()) > position:
+            (current.items if current else root).append(text[position:start])
+        position = brace.end()
+
+        match brace[0]:
+            case "{{":
+                node = TemplateNode(current, len(nodes))
+                if current:
+                    current.items.append(node)
+                    current.pending += 1
+                else:
+                    root.append(node)
+                nodes.append(node)
+                current = node
+            case "}}" if current:
+                current = current.parent
+            case _:
+                return None
+
+    if current:
+        return None
+    if position < len(text):
+        root.append(text[position:])
+    return root, nodes
+
+
+def expand_templates(
+    word: str,
+    text: str,
+    locale: str,
+    *,
+    all_templates: list[tuple[str, str, str]] | None = None,
+    variant_only: bool = False,
+) -> str:
+    """Expand all templates of *text*, the innermost ones first.
 
-    # Remove extra brackets left
-    text = text.replace(" []", "")
-    text = text.replace(" ]", "")
+    The text is tokenized once into a tree, and each template is built once from its expanded nested templates.
+    Templates are expanded in the same order, and with the same output, as `expand_templates_iteratively()`.
+    That implementation is used when the tree cannot be built, or when a template expands to something containing
+    a brace.
 
-    # Remove empty HTML tags
-    # <sup></sup> → ''
-    text = sub(r"<([^>]+)></\1>", "", text)
+        >>> expand_templates("foo", "{{fchim|OH|2|{{!}}OH|2}} {{e}}", "fr")
+        'OH<sub>2</sub>##pipe##!##pipe##OH<sub>2</sub> <sup>e</sup>'
+    """
+    if (tree := parse_templates_tree(text)) is None:
+        return expand_templates_iteratively(word, text, locale, all_templates=all_templates, variant_only=variant_only)
 
-    # Remove extra spaces
-    text = sub(r"\s{2,}", " ", text)
-    text = sub(r"\s{1,}\.", ".", text)
+    root, nodes = tree
+    last_template_idx = len(nodes)
+    current_template_idx = 0
+    checkpoint = len(all_templates) if all_templates is not None else 0
 
-    # <<bar>> → foo
-    text = sub(r"<<([^/>]+)>>", "\\1", text)
-    # <<foo/bar>> → bar
-    # text = sub(r"<<(?:[^/>]+)/([^>]+)>>", "\\1", text)
+    # Templates without nested templates, by text
+    ready: dict[str, list[TemplateNode]] = {}
+    for node in nodes:
+        if not node.pending:
+            node.text = f"{{{{{node.flatten()}}}}}"
+            ready.setdefault(node.text, []).append(node)
+    templates = [node.text for node in nodes if not node.pending]
 
-    # Convert single "< ", and " >" to HTML quotes
-    text = text.replace("< ", "&lt; ").replace(" >", " &gt;")
+    while templates:
+        for tpl in templates:
+            if tpl in SPECIAL_TEMPLATES:
+                result = SPECIAL_TEMPLATES[tpl].placeholder
+            else:
+                result = transform(
+                    word,
+                    tpl[2:-2],
+                    locale,
+                    all_templates=all_templates,
+                    variant_only=variant_only and current_template_idx == last_template_idx - 1,
+                )
+                if "{" in result or "}" in result:
+                    # Braces would change the structure of the tree, start over with the iterative implementation
+                    if all_templates is not None:
+                        del all_templates[checkpoint:]
+                    return expand_templates_iteratively(
+                        word, text, locale, all_templates=all_templates, variant_only=variant_only
+                    )
+
+            # Expand all identical templates, including ones that became identical during this round
+            for node in ready.pop(tpl, []):
+                node.text = result
+                if (parent := node.parent) is not None:
+                    parent.pending -= 1
+                    if not parent.pending:
+                        parent.text = f"{{{{{parent.flatten()}}}}}"
+                        ready.setdefault(parent.text, []).append(parent)
 
-    # Restore math formulas
-    for idx, formula in enumerate(formulas):
-        text = text.replace(f"##math{idx}##", formula)
+        current_template_idx += len(templates)
+        # Like `re.findall()` would find them: sorted by position, with duplicates
+        templates = [node.text for node in sorted(chain(*ready.values()), key=attrgetter("position"))]
 
-    return text.strip()
+    return "".join(item if isinstance(item, str) else item.text for item in root)
+
+
+def expand_templates_iteratively(
+    word: str,
+    text: str,
+    locale: str,
+    *,
+    all_templates: list[tuple[str, str, str]] | None = None,
+    variant_only: bool = False,
+) -> str:
+    """Expand all templates of *text*, the innermost ones first, by replacing them in the whole text repeatedly.
+
+    >>> expand_templates_iteratively("foo", "{{fchim|OH|2|{{!}}OH|2}} {{e}}", "fr")
+    'OH<sub>2</sub>##pipe##!##pipe##OH<sub>2</sub> <sup>e</sup>'
+    """
+
+    # {{foo}}
+    # {{foo|bar}}
+    # {{foo|{{bar}}|123}}
+    # {{foo|{{bar|baz}}|123}}
+    # {{foo|{{bar|lang|{{baz|args}}}}|123}}
+
+    last_template_idx = text.count("{{")
+    current_template_idx = 0
+    while templates := re.findall(r"({{[^{}]*}})", text):
+        for tpl in templates:
+            if tpl in SPECIAL_TEMPLATES:
+                text = text.replace(tpl, SPECIAL_TEMPLATES[tpl].placeholder)
+            else:
+                # Transform the template
+                text = text.replace(
+                    tpl,
+                    transform(
+                        word,
+                        tpl[2:-2],
+                        locale,
+                        all_templates=all_templates,
+                        # `variant_only` is True only when:
+                        #   1. It is predefined;
+                        #   2. And it is the last template in nested templates.
+                        # Ex: [FR] `{{flexion|{{lien|foo}}}}` where:
+                        #   - `lien` should be handled normaly;
+                        #   - while `flexion` should be handled as variant-specific.
+                        variant_only=variant_only and current_template_idx == last_template_idx - 1,
+                    ),
+                )
+        current_template_idx += len(templates)
+
+    return text
 
 
 def process_templates(
@@ -841,38 +1041,10 @@ def process_templates(
     if not (text := callback(wikicode)):
         return ""
 
-    # {{foo}}
-    # {{foo|bar}}
-    # {{foo|{{bar}}|123}}
-    # {{foo|{{bar|baz}}|123}}
-    # {{foo|{{bar|lang|{{baz|args}}}}|123}}
-
     # Handle all templates
-    last_template_idx = text.count("{{")
-    current_template_idx = 0
-    while templates := re.findall(r"({{[^{}]*}})", text):
-        for tpl in templates:
-            if tpl in SPECIAL_TEMPLATES:
-                text = text.replace(tpl, SPECIAL_TEMPLATES[tpl].placeholder)
-            else:
-                # Transform the template
-                text = text.replace(
-                    tpl,
-                    transform(
-                        word,
-                        tpl[2:-2],
-                        locale,
-                        all_templates=all_templates,
-                        # `variant_only` is True only when:
-                        #   1. It is predefined;
-                        #   2. And it is the last template in nested templates.
-                        # Ex: [FR] `{{flexion|{{lien|foo}}}}` where:
-                        #   - `lien` should be handled normaly;
-                        #   - while `flexion` should be handled as variant-specific.
-                        variant_only=variant_only and current_template_idx == last_template_idx - 1,
-                    ),
-                )
-        current_template_idx += len(templates)
+    # Replacing templates one by one in the whole text is quadratic, but it is faster for common (small) texts
+    expand = expand_templates if text.count("{{") >= TEMPLATES_TREE_MIN_COUNT else expand_templates_iteratively
+    text = expand(word, text, locale, all_templates=all_templates, variant_only=variant_only)
 
     for tpl in SPECIAL_TEMPLATES.values():
         text = text.replace(tpl.placeholder, tpl.value)
@@ -995,6 +1167,84 @@ def table2html(word: str, locale: str, table: wikitextparser.Table) -> str:
     return phrase
 
 
+@cache
+def get_templates_multi(locale: str) -> dict[str, CodeType]:
+    """Compile *templates_multi* expressions of the given *locale*, only once per process.
+
+    >>> code = get_templates_multi("fr")["1er"]
+    >>> code.co_filename
+    '<templates_multi[fr][1er]>'
+    >>> code is get_templates_multi("fr")["1er"]
+    True
+    """
+    return {
+        tpl: compile(expr, f"<templates_multi[{locale}][{tpl}]>", "eval")
+        for tpl, expr in templates_multi[locale].items()
+    }
+
+
+@cache
+def get_pure_templates(locale: str) -> frozenset[str]:
+    """Templates whose rendering does not depend on the word being rendered: *templates_multi* not using the *word*
+    variable, and *templates_pure* explicitly declared by the locale.
+
+        >>> "1er" in get_pure_templates("fr"), "lien" in get_pure_templates("fr")
+        (True, True)
+        >>> "R:TLFi" in get_pure_templates("fr")
+        False
+    """
+    pure = {
+        tpl
+        for tpl, expr in templates_multi[locale].items()
+        if not any(isinstance(node, ast.Name) and node.id == "word" for node in ast.walk(ast.parse(expr, mode="eval")))
+    }
+    pure.update(templates_pure[locale])
+    return frozenset(pure)
+
+
+class TemplatesCache:
+    """Bounded LRU cache of rendered pure templates, keyed on the locale and the template text."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.data: OrderedDict[tuple[str, str], str] = OrderedDict()
+        self.stats: TemplatesCacheStats = Counter()
+
+    def get(self, locale: str, template: str) -> str | None:
+        if (value := self.data.get((locale, template))) is None:
+            self.stats[(locale, "misses")] += 1
+            return None
+        self.data.move_to_end((locale, template))
+        self.stats[(locale, "hits")] += 1
+        return value
+
+    def set(self, locale: str, template: str, value: str) -> None:
+        self.data[(locale, template)] = value
+        if len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+    def pop_stats(self) -> TemplatesCacheStats:
+        """Return statistics since the previous call."""
+        stats, self.stats = self.stats, Counter()
+        return stats
+
+
+TEMPLATES_CACHE = TemplatesCache(TEMPLATES_CACHE_SIZE)
+
+
+def log_templates_cache_stats(stats: TemplatesCacheStats) -> None:
+    for locale in sorted({locale for locale, _ in stats}):
+        hits = stats[(locale, "hits")]
+        total = hits + stats[(locale, "misses")]
+        log.info(
+            "[%s] Templates cache: %s hits, %s misses (%.1f%% hit rate)",
+            locale,
+            f"{hits:,}",
+            f"{total - hits:,}",
+            hits / total * 100,
+        )
+
+
 def transform(
     word: str,
     template: str,
@@ -1065,11 +1315,40 @@ def transform(
     elif tpl == "PAGENAME" or (tpl == "w" and len(parts) == 1):
         return word.replace("_", " ")
 
+    profile = profiler.PROFILE
+    start = perf_counter() if profile is not None else 0.0
+    try:
+        # Pure templates are rendered once, and then shared between words
+        if TEMPLATES_CACHE.maxsize and not variant_only and tpl in get_pure_templates(locale):
+            if (text := TEMPLATES_CACHE.get(locale, template)) is None:
+                recorded = [] if all_templates is None else all_templates
+                count = len(recorded)
+                text = _transform(word, tpl, parts, locale, all_templates=recorded)
+                # Missing templates must be reported for all words, do not cache them
+                if len(recorded) == count:
+                    TEMPLATES_CACHE.set(locale, template, text)
+            return text
+
+        return _transform(word, tpl, parts, locale, all_templates=all_templates, variant_only=variant_only)
+    finally:
+        if profile is not None:
+            profile.add(profiler.TEMPLATES, locale, tpl, perf_counter() - start)
+
+
+def _transform(
+    word: str,
+    tpl: str,
+    parts: list[str],
+    locale: str,
+    *,
+    all_templates: list[tuple[str, str, str]] | None = None,
+    variant_only: bool = False,
+) -> str:
     # Apply transformations
     # Note: using `is not None` below to allow templates returning an empty string.
 
-    if (transformer := templates_multi[locale].get(tpl)) is not None:
-        return str(eval(transformer))
+    if (compiled := get_templates_multi(locale).get(tpl)) is not None:
+        return str(eval(compiled))
 
     if (transformer := templates_other[locale].get(tpl)) is not None:
         return transformer
@@ -1077,12 +1356,18 @@ def transform(
     if len(parts) == 1 and (transformer := templates_italic[locale].get(tpl)) is not None:
         return term(transformer)  # noqa: F405
 
-    return str(
-        last_template_handler[locale](
-            parts,
-            locale,
-            word=word,
-            all_templates=all_templates,
-            variant_only=variant_only,
+    profile = profiler.PROFILE
+    start = perf_counter() if profile is not None else 0.0
+    try:
+        return str(
+            last_template_handler[locale](
+                parts,
+                locale,
+                word=word,
+                all_templates=all_templates,
+                variant_only=variant_only,
+            )
         )
-    )
+    finally:
+        if profile is not None:
+            profile.add(profiler.HANDLERS, locale, tpl, perf_counter() - start)